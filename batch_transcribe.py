@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Batch audio transcription and translation for Language Buddy
+Feeds recorded WAV/AIFF/FLAC clips through the speech recognizer and the
+translation engine. Silence is trimmed locally before recognition, decoding
+and recognition run on a process pool, and results are written as JSON lines
+in input order
+
+Usage:
+    python batch_transcribe.py recordings/ --target Spanish > results.jsonl
+    python batch_transcribe.py a.wav b.flac --target fr --backend sphinx --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_utils import bounded_map
+
+AUDIO_EXTENSIONS = (".wav", ".aif", ".aiff", ".flac")
+
+def find_audio_files(paths):
+    """Expand files and folders into a sorted list of audio clips"""
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in sorted(os.walk(path)):
+                for name in sorted(names):
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield os.path.join(folder, name)
+        else:
+            yield path
+
+def resolve_language(value):
+    """Accept a language name ('Spanish') or code ('es') and return the name"""
+    from language_buddy import LANGUAGES, language_name
+    name = language_name(value)
+    if name:
+        return name
+    raise argparse.ArgumentTypeError(f"Unknown language '{value}'. Choose from: {', '.join(LANGUAGES)}")
+
+# Each worker process builds its own recognizer once
+_backend = None
+
+def _init_worker(backend_spec):
+    global _backend
+    sys.stdout = sys.stderr  # keep diagnostic prints out of the JSONL stream
+    from speech_backends import create_backend
+    _backend = create_backend(backend_spec)
+
+def process_file(job):
+    """Transcribe and translate one clip (runs in a worker process)"""
+    path, target_language, translate, vad = job
+    import speech_recognition as sr
+    from speech_backends import UnknownValueError, RequestError
+    from voice_activity import split_utterances
+    
+    result = {"file": path, "text": None, "translation": None, "error": None}
+    start = time.perf_counter()
+    try:
+        with sr.AudioFile(path) as source:
+            audio = _backend.recognizer.record(source)
+        result["duration"] = round(len(audio.frame_data) / (audio.sample_rate * audio.sample_width), 3)
+        
+        if vad:
+            utterances, stats = split_utterances(audio)
+            result["bytes_saved"] = stats.bytes_saved
+            result["seconds_saved"] = round(stats.seconds_saved, 3)
+            parts = []
+            for utterance in utterances:
+                try:
+                    parts.append(_backend.recognize(utterance))
+                except UnknownValueError:
+                    continue
+            if not parts:
+                raise UnknownValueError()
+            result["text"] = " ".join(parts)
+        else:
+            result["text"] = _backend.recognize(audio)
+        if translate:
+            from language_buddy import translate_to_language
+            result["translation"] = translate_to_language(result["text"], target_language)
+            result["target"] = target_language
+    except UnknownValueError:
+        result["error"] = "could not understand audio"
+    except RequestError as e:
+        result["error"] = f"recognition service error: {e}"
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_batch(paths, target_language="Spanish", backend_spec=None, workers=None,
+              translate=True, output=sys.stdout, max_in_flight=None, vad=True):
+    """Process every clip and stream one JSON line per clip, in input order"""
+    workers = workers or os.cpu_count() or 2
+    jobs = ((path, target_language, translate, vad) for path in find_audio_files(paths))
+    summary = {"files": 0, "errors": 0, "bytes_saved": 0}
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend_spec,)) as executor:
+        for result in bounded_map(executor, process_file, jobs, max_in_flight or workers * 2):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+            summary["files"] += 1
+            summary["bytes_saved"] += result.get("bytes_saved", 0)
+            if result["error"]:
+                summary["errors"] += 1
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe and translate recorded audio clips")
+    parser.add_argument("paths", nargs="+", help="audio files or folders of WAV/AIFF/FLAC clips")
+    parser.add_argument("--target", default="Spanish", type=resolve_language,
+                        help="target language name or code (default: Spanish)")
+    parser.add_argument("--backend", default=None,
+                        help="speech recognition backend, e.g. google, sphinx or google,sphinx "
+                             "(default: $LANGUAGE_BUDDY_ASR or google)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-translate", action="store_true", help="only transcribe")
+    parser.add_argument("--no-vad", action="store_true",
+                        help="send whole clips to the recognizer instead of trimming silence first")
+    parser.add_argument("--output", default="-", help="JSONL output file (default: stdout)")
+    args = parser.parse_args(argv)
+    
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        summary = run_batch(args.paths, args.target, args.backend, args.workers,
+                            translate=not args.no_translate, output=output, vad=not args.no_vad)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    print(f"Processed {summary['files']} clips ({summary['errors']} errors) "
+          f"in {time.perf_counter() - start:.1f}s, trimmed {summary['bytes_saved'] / 1024:.0f} KB of silence",
+          file=sys.stderr)
+    return 0 if summary["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Helpers for Language Buddy batch tools
+Runs jobs on an executor with a cap on how many are in flight, so memory use
+stays flat no matter how many jobs the input holds
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+def bounded_map(executor, fn, items, max_in_flight=8, ordered=True):
+    """Yield fn(item) for every item, with at most max_in_flight jobs submitted at once.
+    ordered=True yields results in input order; otherwise as soon as each one finishes"""
+    max_in_flight = max(1, max_in_flight)
+    items = iter(items)
+    in_flight = deque()
+    
+    def submit_next():
+        for item in items:
+            in_flight.append(executor.submit(fn, item))
+            return True
+        return False
+    
+    while len(in_flight) < max_in_flight and submit_next():
+        pass
+    
+    while in_flight:
+        if ordered:
+            future = in_flight.popleft()
+            result = future.result()
+        else:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            future = next(iter(done))
+            in_flight.remove(future)
+            result = future.result()
+        submit_next()
+        yield result
@@ -0,0 +1,163 @@
+"""
+Background translation cache warming for Language Buddy
+When the target language changes, the phrases the user is most likely to
+need next are translated ahead of time at low priority. The prefetcher
+steps aside while the user is waiting on a translation of their own and
+spaces its requests with a token bucket so free providers aren't
+rate-limited because of it
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+PREFETCH_RATE = 1.0     # requests per second, on average
+PREFETCH_BURST = 3      # requests allowed back to back after a quiet spell
+PREFETCH_LIMIT = 60     # phrases warmed per language change
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def try_take(self):
+        """Take a token if one is available right now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+    
+    def wait_time(self):
+        """Seconds until the next token is available"""
+        with self.lock:
+            self._refill()
+            return max(0.0, (1 - self.tokens) / self.rate)
+    
+    def take(self, stop=None):
+        """Block until a token is taken; returns False if stop (an Event) is set first"""
+        while not self.try_take():
+            delay = self.wait_time()
+            if stop is not None:
+                if stop.wait(delay):
+                    return False
+            else:
+                time.sleep(delay)
+        return True
+
+def rank_phrases(*sources, limit=PREFETCH_LIMIT):
+    """Merge phrase lists in priority order, without duplicates, up to limit"""
+    phrases = []
+    seen = set()
+    for source in sources:
+        for phrase in source:
+            key = phrase.strip().lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            phrases.append(phrase.strip())
+            if len(phrases) == limit:
+                return phrases
+    return phrases
+
+class CachePrefetcher:
+    def __init__(self, translate, is_cached, rate=PREFETCH_RATE, burst=PREFETCH_BURST):
+        self.translate = translate      # callable(phrase, target), fills the cache as a side effect
+        self.is_cached = is_cached      # callable(phrase, target) -> bool
+        self.bucket = TokenBucket(rate, burst)
+        self.condition = threading.Condition()
+        self.foreground_requests = 0
+        self.job = None                 # (target, phrases) waiting to be warmed
+        self.cancelled = threading.Event()
+        self.worker = None
+        self.remaining = 0              # phrases of the running job not yet handled
+        self.stats = {"queued": 0, "fetched": 0, "already_cached": 0, "paused": 0}
+    
+    @contextmanager
+    def foreground(self):
+        """Wrap a user-facing translation; prefetching waits until it finishes"""
+        with self.condition:
+            self.foreground_requests += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.foreground_requests -= 1
+                self.condition.notify_all()
+    
+    def prefetch(self, target, phrases):
+        """Warm the cache for target, replacing whatever was being warmed before"""
+        with self.condition:
+            self.cancelled.set()  # the current phrase finishes, the rest of the old job is skipped
+            self.cancelled = threading.Event()
+            self.job = (target, list(phrases))
+            self.stats["queued"] += len(self.job[1])
+            self.condition.notify_all()
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, name="cache-prefetch", daemon=True)
+                self.worker.start()
+    
+    def cancel(self):
+        """Drop the pending phrases"""
+        with self.condition:
+            self.cancelled.set()
+            self.job = None
+            self.condition.notify_all()
+    
+    def _wait_for_idle(self, cancelled):
+        """Block while foreground translations are running"""
+        with self.condition:
+            if self.foreground_requests:
+                self.stats["paused"] += 1
+            while self.foreground_requests and not cancelled.is_set():
+                self.condition.wait()
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                if self.job is None:
+                    self.worker = None
+                    self.remaining = 0
+                    return
+                target, phrases = self.job
+                self.job = None
+                cancelled = self.cancelled
+                self.remaining = len(phrases)
+            for phrase in phrases:
+                if cancelled.is_set():
+                    break
+                self.remaining -= 1
+                if self.is_cached(phrase, target):
+                    self.stats["already_cached"] += 1
+                    continue
+                self._wait_for_idle(cancelled)
+                if not self.bucket.take(cancelled):
+                    break
+                self._wait_for_idle(cancelled)
+                if cancelled.is_set():
+                    break
+                try:
+                    self.translate(phrase, target)
+                    self.stats["fetched"] += 1
+                except Exception as e:
+                    print(f"Prefetch error for '{phrase}': {e}")
+    
+    def pending(self):
+        """Phrases waiting to be warmed, for diagnostics"""
+        with self.condition:
+            waiting = len(self.job[1]) if self.job else 0
+            return waiting + (0 if self.cancelled.is_set() else self.remaining)
+    
+    def is_idle(self):
+        with self.condition:
+            return self.worker is None and self.job is None
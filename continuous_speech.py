@@ -0,0 +1,100 @@
+"""
+Continuous speech translation for Language Buddy
+The microphone listens in the background and every captured phrase goes into
+a queue. Worker threads recognize and translate phrases concurrently, and
+results are handed back in the order the phrases were spoken
+"""
+
+import queue
+import threading
+
+class OrderedResults:
+    """Reorder buffer: accepts results in any order and releases them in sequence"""
+    
+    def __init__(self, deliver, first_sequence=0):
+        self.deliver = deliver
+        self.next_sequence = first_sequence
+        self.waiting = {}
+        self.lock = threading.Lock()
+    
+    def add(self, sequence, result):
+        with self.lock:
+            self.waiting[sequence] = result
+            while self.next_sequence in self.waiting:
+                self.deliver(self.waiting.pop(self.next_sequence))
+                self.next_sequence += 1
+    
+    def backlog(self):
+        """Results finished early and waiting for an older phrase"""
+        return len(self.waiting)
+
+class PhraseResult:
+    def __init__(self, sequence, text=None, translation=None, error=None):
+        self.sequence = sequence
+        self.text = text
+        self.translation = translation
+        self.error = error
+
+class ContinuousTranslator:
+    def __init__(self, recognizer, microphone, recognize, translate, on_result,
+                 workers=3, phrase_time_limit=8):
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.recognize = recognize          # callable(audio) -> text
+        self.translate = translate          # callable(text) -> translation
+        self.phrase_time_limit = phrase_time_limit
+        self.phrases = queue.Queue()
+        self.results = OrderedResults(on_result)
+        self.worker_count = workers
+        self.workers = []
+        self.sequence = 0
+        self.stop_listening = None
+        self.running = False
+    
+    def start(self):
+        """Start listening and the recognition/translation workers"""
+        self.running = True
+        for index in range(self.worker_count):
+            worker = threading.Thread(target=self._work, name=f"speech-worker-{index}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        self.stop_listening = self.recognizer.listen_in_background(
+            self.microphone, self._on_phrase, phrase_time_limit=self.phrase_time_limit
+        )
+    
+    def stop(self):
+        """Stop capturing; phrases already captured still finish"""
+        if not self.running:
+            return
+        self.running = False
+        if self.stop_listening:
+            self.stop_listening(wait_for_stop=False)
+        for _ in self.workers:
+            self.phrases.put(None)
+    
+    def pending(self):
+        """Phrases captured but not picked up by a worker yet"""
+        return self.phrases.qsize()
+    
+    def busy(self):
+        """True while workers are still finishing captured phrases"""
+        return any(worker.is_alive() for worker in self.workers)
+    
+    def _on_phrase(self, recognizer, audio):
+        """Runs on the listener thread - must return quickly so capture never stalls"""
+        self.phrases.put((self.sequence, audio))
+        self.sequence += 1
+    
+    def _work(self):
+        while True:
+            item = self.phrases.get()
+            if item is None:
+                break
+            sequence, audio = item
+            result = PhraseResult(sequence)
+            try:
+                result.text = self.recognize(audio)
+                result.translation = self.translate(result.text)
+            except Exception as e:
+                result.error = e
+            self.results.add(sequence, result)
@@ -0,0 +1,149 @@
+"""
+Diagnostics for Language Buddy
+Gathers what explains a slow or growing session in one place: translation
+cache hit rate, each provider's latency and circuit state, the threads that
+are alive, how much work is queued and, while memory tracing is on, the lines
+of code holding the most memory. Everything except the memory snapshot is a
+few counters, so the report is cheap enough to refresh every second
+"""
+
+import re
+import threading
+import time
+import tracemalloc
+
+MEMORY_SNAPSHOT_INTERVAL = 5.0  # seconds between tracemalloc snapshots; taking one walks every traced block
+THREAD_NUMBER = re.compile(r"[-_]\d+")  # "service-translate_3" and "Thread-7 (run)" group by what's left
+
+def thread_summary():
+    """Live threads grouped by name, busiest group first"""
+    threads = threading.enumerate()
+    groups = {}
+    for thread in threads:
+        name = THREAD_NUMBER.sub("", thread.name)
+        groups[name] = groups.get(name, 0) + 1
+    return {
+        "total": len(threads),
+        "daemon": sum(1 for thread in threads if thread.daemon),
+        "groups": dict(sorted(groups.items(), key=lambda item: (-item[1], item[0]))),
+    }
+
+def _short_path(filename):
+    """Last two parts of a path - enough to tell tkinter/__init__.py from our own modules"""
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+class MemoryTracker:
+    """Top allocations by source line from tracemalloc, snapshotted at most every interval seconds.
+    Shared by the diagnostics screen and concurrent /diagnostics requests; a snapshot can take
+    a while, so report() belongs on a worker thread"""
+    
+    def __init__(self, limit=10, interval=MEMORY_SNAPSHOT_INTERVAL, frames=1, clock=time.monotonic):
+        self.limit = limit
+        self.interval = interval
+        self.frames = frames
+        self.clock = clock
+        self.started_here = False   # only stop tracing that we started
+        self.lock = threading.Lock()
+        self.top = None
+        self.taken_at = None
+    
+    def start(self):
+        """Turn tracing on; allocations made before this aren't seen"""
+        with self.lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self.started_here = True
+    
+    def stop(self):
+        """Turn tracing off again, which also frees tracemalloc's own bookkeeping"""
+        with self.lock:
+            if self.started_here and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.started_here = False
+            self.top = None
+            self.taken_at = None
+    
+    def report(self, force=False):
+        # One snapshot at a time; callers arriving meanwhile wait and then reuse it
+        with self.lock:
+            return self._report(force)
+    
+    def _report(self, force):
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+        current, peak = tracemalloc.get_traced_memory()
+        now = self.clock()
+        if force or self.top is None or now - self.taken_at >= self.interval:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+                tracemalloc.Filter(False, "<unknown>"),
+            ))
+            self.top = [
+                {"location": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                 "size_kb": round(stat.size / 1024, 1), "blocks": stat.count}
+                for stat in snapshot.statistics("lineno")[:self.limit]
+            ]
+            self.taken_at = now
+        return {
+            "tracing": True,
+            "current_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "snapshot_age": round(now - self.taken_at, 1),
+            "top": self.top,
+        }
+
+def collect(cache=None, providers=None, queues=None, memory=None):
+    """Diagnostics as a JSON-ready dict. queues maps a name to a callable returning its depth"""
+    report = {"time": round(time.time(), 1), "threads": thread_summary(), "queues": {}}
+    if cache is not None:
+        report["cache"] = cache.stats()
+    if providers is not None:
+        report["providers"] = providers.stats()
+    for name, depth in (queues or {}).items():
+        try:
+            report["queues"][name] = depth()
+        except Exception as e:
+            print(f"Diagnostics could not read the {name} queue: {e}")
+            report["queues"][name] = None
+    report["memory"] = memory.report() if memory else {"tracing": tracemalloc.is_tracing()}
+    return report
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+def format_report(report):
+    """{section: text} for showing a report on screen; sections missing from the report are left out"""
+    sections = {}
+    
+    cache = report.get("cache")
+    if cache:
+        sections["cache"] = (f"Hit rate {cache['hit_rate']:.0%} ({cache['hits']} memory + {cache['shared_hits']} shared hits, "
+                             f"{cache['misses']} misses)\nEntries {cache['entries']} of {cache['capacity']}")
+    
+    providers = report.get("providers")
+    if providers is not None:
+        lines = []
+        for row in providers:
+            state = row["state"] + (f" (retry in {row['retry_in']:.0f}s)" if row["state"] == "open" else "")
+            lines.append(f"{row['name']}: {state} | p50 {_ms(row['p50'])} p95 {_ms(row['p95'])} | "
+                         f"{row['successes']}/{row['calls']} ok, {row['failures']} failed, {row['skipped']} skipped")
+        sections["providers"] = "\n".join(lines) or "No translation services available"
+    
+    threads = report["threads"]
+    sections["threads"] = f"{threads['total']} running ({threads['daemon']} background)\n" + "\n".join(
+        f"{name} × {count}" if count > 1 else name for name, count in threads["groups"].items())
+    
+    sections["queues"] = "\n".join(f"{name}: {'?' if depth is None else depth}"
+                                   for name, depth in report["queues"].items()) or "No queues"
+    
+    memory = report["memory"]
+    if memory.get("tracing") and "top" in memory:
+        sections["memory"] = (f"Traced {memory['current_kb'] / 1024:.1f} MB now, peak {memory['peak_kb'] / 1024:.1f} MB "
+                              f"(snapshot {memory['snapshot_age']:.0f}s old)\n" + "\n".join(
+                                  f"{row['size_kb']:>9.1f} KB  {row['blocks']:>6} blocks  {row['location']}"
+                                  for row in memory["top"]))
+    else:
+        sections["memory"] = "Memory tracing is off"
+    return sections
@@ -0,0 +1,223 @@
+"""
+Glossary enforcement for Language Buddy
+Brand names and product terms listed in a glossary are found with an
+Aho-Corasick automaton - one pass over the text however many terms there
+are - and swapped for placeholders before the text goes to a translation
+provider. Afterwards each placeholder is replaced by the term itself or by
+the glossary's fixed translation for the target language
+
+glossary.json (or the file named by LANGUAGE_BUDDY_GLOSSARY):
+
+    {"case_sensitive": false,
+     "terms": ["Language Buddy",
+               {"term": "cloud sync", "translations": {"es": "sincronización en la nube"}}]}
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import deque
+
+GLOSSARY_ENV_VAR = "LANGUAGE_BUDDY_GLOSSARY"
+GLOSSARY_FILE = "glossary.json"
+
+# Providers leave bracketed tags like this alone, though some add spaces inside them
+PLACEHOLDER = "[[G{}]]"
+PLACEHOLDER_PATTERN = re.compile(r"\[\[\s*G\s*(\d+)\s*\]\]", re.IGNORECASE)
+
+class GlossaryEntry:
+    __slots__ = ("term", "translations")
+    
+    def __init__(self, term, translations=None):
+        self.term = term
+        self.translations = translations or {}  # target code -> fixed translation; missing = keep the term
+    
+    def replacement(self, target, matched_text):
+        return self.translations.get(target, matched_text)
+    
+    def __repr__(self):
+        return f"GlossaryEntry({self.term!r})"
+
+class GlossaryMatch:
+    __slots__ = ("start", "end", "entry")
+    
+    def __init__(self, start, end, entry):
+        self.start = start
+        self.end = end      # exclusive
+        self.entry = entry
+    
+    def __repr__(self):
+        return f"GlossaryMatch({self.start}, {self.end}, {self.entry.term!r})"
+
+class Glossary:
+    def __init__(self, entries=(), case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self.entries = []
+        self.goto = None    # automaton, built on first use after terms change
+        for entry in entries:
+            if isinstance(entry, GlossaryEntry):
+                self.add(entry.term, entry.translations)
+            else:
+                self.add(*entry)
+    
+    def add(self, term, translations=None):
+        term = term.strip()
+        if term:
+            self.entries.append(GlossaryEntry(term, translations))
+            self.goto = None
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def fingerprint(self):
+        """Short hash of the terms and their translations; changes whenever the glossary does"""
+        data = [self.case_sensitive, [(entry.term, entry.translations) for entry in self.entries]]
+        return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+    
+    def _fold(self, text):
+        if self.case_sensitive:
+            return text
+        folded = text.lower()
+        if len(folded) != len(text):
+            # A few characters (like 'İ') lowercase to two; keep positions lined up with the original
+            folded = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        return folded
+    
+    def _build(self):
+        """Build the trie, failure links and output links.
+        Transitions live in one dict keyed by state and character, which takes far
+        less memory than a dict per state when the glossary is large"""
+        goto = {}
+        children = [[]]
+        term_at = [-1]      # entry index of the longest term ending at each state
+        depth = [0]
+        for index, entry in enumerate(self.entries):
+            state = 0
+            for char in self._fold(entry.term):
+                key = state << 21 | ord(char)
+                next_state = goto.get(key)
+                if next_state is None:
+                    next_state = len(term_at)
+                    goto[key] = next_state
+                    children[state].append((char, next_state))
+                    children.append([])
+                    term_at.append(-1)
+                    depth.append(depth[state] + 1)
+                state = next_state
+            if term_at[state] == -1:
+                term_at[state] = index  # the first listing of a duplicate term wins
+        
+        fail = [0] * len(term_at)
+        output = [-1] * len(term_at)   # nearest proper suffix state that ends a term
+        queue = deque(next_state for _, next_state in children[0])
+        while queue:
+            state = queue.popleft()
+            for char, next_state in children[state]:
+                queue.append(next_state)
+                code = ord(char)
+                fallback = fail[state]
+                while fallback and (fallback << 21 | code) not in goto:
+                    fallback = fail[fallback]
+                target = goto.get(fallback << 21 | code, 0)
+                fail[next_state] = target if target != next_state else 0
+                output[next_state] = target if term_at[target] != -1 else output[target]
+        
+        self.goto, self.fail, self.output, self.term_at, self.depth = goto, fail, output, term_at, depth
+    
+    def find(self, text):
+        """Leftmost-longest glossary terms in text that stand as whole words, without overlaps"""
+        if not self.entries or not text:
+            return []
+        if self.goto is None:
+            self._build()
+        goto, fail, output, term_at, depth = self.goto, self.fail, self.output, self.term_at, self.depth
+        
+        # best[start] = longest term starting there; every match is reported by one scan
+        best = {}
+        state = 0
+        for position, char in enumerate(self._fold(text)):
+            code = ord(char)
+            while state and (state << 21 | code) not in goto:
+                state = fail[state]
+            state = goto.get(state << 21 | code, 0)
+            found = state if term_at[state] != -1 else output[state]
+            while found > 0:
+                start = position + 1 - depth[found]
+                if best.get(start, (0, 0))[0] < depth[found] and _whole_word(text, start, position + 1):
+                    best[start] = (depth[found], term_at[found])
+                found = output[found]
+        
+        matches = []
+        covered_to = 0
+        for start in sorted(best):
+            if start < covered_to:
+                continue
+            length, index = best[start]
+            matches.append(GlossaryMatch(start, start + length, self.entries[index]))
+            covered_to = start + length
+        return matches
+    
+    def mask(self, text, target):
+        """(text with glossary terms replaced by placeholders, replacement for each placeholder)"""
+        matches = self.find(text)
+        if not matches:
+            return text, []
+        # Text that already looks like a placeholder is masked too, so it comes back exactly as written
+        literals = [(found.start(), found.end(), found.group(0)) for found in PLACEHOLDER_PATTERN.finditer(text)]
+        spans = literals + [
+            (match.start, match.end, match.entry.replacement(target, text[match.start:match.end]))
+            for match in matches
+            if not any(start < match.end and match.start < end for start, end, _ in literals)
+        ]
+        parts = []
+        replacements = []
+        position = 0
+        for start, end, replacement in sorted(spans):
+            parts.append(text[position:start])
+            parts.append(PLACEHOLDER.format(len(replacements)))
+            replacements.append(replacement)
+            position = end
+        parts.append(text[position:])
+        return "".join(parts), replacements
+    
+    def restore(self, translated_text, replacements):
+        """Put the glossary terms back in place of their placeholders"""
+        def substitute(match):
+            index = int(match.group(1))
+            return replacements[index] if index < len(replacements) else match.group(0)
+        restored, count = PLACEHOLDER_PATTERN.subn(substitute, translated_text)
+        if count < len(replacements):
+            print(f"Glossary: {len(replacements) - count} protected terms were dropped by the translator")
+        return restored
+    
+    def translate(self, text, target, translate):
+        """Run translate(text) with glossary terms protected; target is a language code"""
+        masked, replacements = self.mask(text, target)
+        if not replacements:
+            return translate(text)
+        if not PLACEHOLDER_PATTERN.sub("", masked).strip():
+            return self.restore(masked, replacements)  # nothing left for a provider to translate
+        return self.restore(translate(masked), replacements)
+
+def _whole_word(text, start, end):
+    """True unless the match is glued to letters or digits on either side"""
+    return ((start == 0 or not text[start - 1].isalnum() or not text[start].isalnum())
+            and (end == len(text) or not text[end].isalnum() or not text[end - 1].isalnum()))
+
+def load_glossary(path=None):
+    """Glossary from path, $LANGUAGE_BUDDY_GLOSSARY or ./glossary.json; None when there is no file"""
+    path = path or os.environ.get(GLOSSARY_ENV_VAR)
+    if not path and os.path.exists(GLOSSARY_FILE):
+        path = GLOSSARY_FILE
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    glossary = Glossary(case_sensitive=data.get("case_sensitive", False))
+    for item in data.get("terms", []):
+        if isinstance(item, str):
+            glossary.add(item)
+        else:
+            glossary.add(item["term"], item.get("translations"))
+    return glossary
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+JSONL batch translation for Language Buddy
+Reads translation jobs as JSON lines - {"id": ..., "text": ..., "target": ...} -
+from stdin or a file and writes one JSON line per job with its translation.
+Jobs run on a thread pool with a cap on how many are in flight, and input is
+read only as fast as results are written, so memory stays flat for inputs of
+any size
+
+Usage:
+    python jsonl_batch.py jobs.jsonl --output results.jsonl
+    cat jobs.jsonl | python jsonl_batch.py --target fr --max-in-flight 16 --as-completed
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from batch_utils import bounded_map
+
+def translate_job(job, translate, resolve_language, default_target=None):
+    """Turn one (line number, JSON line) into a result dict; bad lines become errors, not exceptions"""
+    line_number, line = job
+    result = {"id": line_number, "target": None, "translation": None, "error": None}
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        result["error"] = f"Line {line_number} is not valid JSON: {e}"
+        return result
+    if not isinstance(request, dict):
+        result["error"] = f"Line {line_number} is not a JSON object"
+        return result
+    
+    result["id"] = request.get("id", line_number)
+    text = request.get("text")
+    target = resolve_language(str(request.get("target") or default_target or ""))
+    if not isinstance(text, str) or not text.strip():
+        result["error"] = "Missing 'text'"
+    elif not target:
+        result["error"] = f"Unknown target language {request.get('target')!r}"
+    else:
+        result["target"] = target
+        try:
+            translation = translate(text, target)
+            if translation.startswith("⚠️"):
+                result["error"] = translation
+            else:
+                result["translation"] = translation
+        except Exception as e:
+            result["error"] = f"Translation failed: {e}"
+    return result
+
+def read_jobs(lines):
+    """(line number, line) for every non-blank input line, read lazily"""
+    for line_number, line in enumerate(lines, 1):
+        if line.strip():
+            yield line_number, line
+
+def run_jobs(lines, translate, resolve_language, output, default_target=None,
+             max_in_flight=8, ordered=True):
+    """Translate every job in lines and write one JSON line per job to output"""
+    summary = {"jobs": 0, "errors": 0}
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="jsonl-translate") as executor:
+        results = bounded_map(
+            executor,
+            lambda job: translate_job(job, translate, resolve_language, default_target),
+            read_jobs(lines),
+            max_in_flight,
+            ordered
+        )
+        for result in results:
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+            summary["jobs"] += 1
+            if result["error"]:
+                summary["errors"] += 1
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translate JSONL jobs from a file or stdin")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of jobs (default: stdin)")
+    parser.add_argument("--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--target", default=None, help="target language for jobs that don't name one")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="jobs translated at the same time (default: 8)")
+    parser.add_argument("--as-completed", action="store_true",
+                        help="write each result as soon as it's ready instead of in input order")
+    args = parser.parse_args(argv)
+    
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    real_stdout = sys.stdout
+    output = real_stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    # Keep the translator's diagnostic prints out of the JSONL stream, including the ones
+    # language_buddy makes while it's imported
+    sys.stdout = sys.stderr
+    try:
+        from language_buddy import translate_to_language, language_name
+        if args.target and not language_name(args.target):
+            parser.error(f"Unknown language '{args.target}'")
+        start = time.perf_counter()
+        summary = run_jobs(source, translate_to_language, language_name, output, args.target,
+                           args.max_in_flight, ordered=not args.as_completed)
+    finally:
+        sys.stdout = real_stdout
+        if source is not sys.stdin:
+            source.close()
+        if output is not real_stdout:
+            output.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"Translated {summary['jobs']} jobs ({summary['errors']} errors) in {elapsed:.1f}s", file=sys.stderr)
+    return 0 if summary["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,12 +6,39 @@ A user-friendly language learning and translation app
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
+import queue
 import json
+import hashlib
 import os
 import sys
 import subprocess
+import time
 from datetime import datetime
 import webbrowser
+from translation_history import TranslationHistory
+from virtual_list import VirtualList
+from tts_cache import AudioCache
+from tts_worker import TTSWorker, Utterance
+from voice_catalog import VoiceCatalog
+from mic_calibration import MicCalibration
+from perf_timing import StageTimer, LatencyStats
+from continuous_speech import ContinuousTranslator
+from speech_backends import create_backend, UnknownValueError
+from voice_activity import split_utterances, SessionVADStats
+from speech_pipeline import VoicePipeline
+from language_detect import detect_language
+from vocabulary_store import VocabularyStore
+from spaced_repetition import SpacedRepetition, DEFAULT_PROFILE
+from quiz_generator import QuizGenerator
+from translation_cache import TranslationCache, SharedTranslationCache, SHARED_CACHE_DB_FILE
+from live_translate import LiveTranslator, translate_segments
+from cache_prefetch import CachePrefetcher, rank_phrases
+from translation_providers import load_providers, build_chain
+from glossary import load_glossary
+from markup_translate import translate_markup
+from diagnostics import collect, format_report, MemoryTracker
+import random
+from concurrent.futures import ThreadPoolExecutor
 try:
     import pyttsx3
     speech_available = True
@@ -24,25 +51,6 @@ try:
 except ImportError:
     speech_recognition_available = False
 
-try:
-    import requests
-    requests_available = True
-except ImportError:
-    requests_available = False
-
-try:
-    from deep_translator import GoogleTranslator
-    deep_translator_available = True
-except ImportError:
-    deep_translator_available = False
-
-try:
-    from googletrans import Translator
-    translator_available = True
-    google_translator = Translator()
-except ImportError:
-    translator_available = False
-    google_translator = None
 
 def install_package(package_name):
     """Automatically install a Python package using pip"""
@@ -76,6 +84,9 @@ def ensure_speech_dependencies():
                 return False
     return speech_available
 
+# Slower speech rate used for pronunciation practice
+PRACTICE_SPEECH_RATE = 120
+
 # Language data - In a real app, this would connect to translation APIs
 LANGUAGES = {
     "English": "en",
@@ -93,6 +104,34 @@ LANGUAGES = {
     "Urdu": "ur"
 }
 
+def language_name(value):
+    """The LANGUAGES name for a language name ('spanish') or code ('es'), or None"""
+    value = (value or "").strip().lower()
+    for name, code in LANGUAGES.items():
+        if value in (name.lower(), code):
+            return name
+    return None
+
+# Minimum local detection confidence before the detected source language is trusted
+DETECTION_CONFIDENCE = 0.8
+
+# Ways translate_with_providers can answer without an online provider. These answers are
+# cheap to produce again and often only a guess, so they are never cached
+LOCAL_METHODS = {"unchanged", "glossary", "dictionary", "substitution", "word-by-word", "failed"}
+
+# Quiet time after the target language changes before warming the cache; any key press
+# or click restarts the wait, so prefetching never competes with someone using the app
+PREFETCH_IDLE_MS = 5000
+
+# Pause in typing before live mode translates, so each keystroke doesn't start a request
+LIVE_TRANSLATE_DELAY_MS = 400
+
+# Text screen input formats; HTML and Markdown send only their text, never tags or code
+TEXT_FORMATS = {"Plain text": None, "HTML": "html", "Markdown": "markdown"}
+
+# How often the diagnostics screen updates while it is open
+DIAGNOSTICS_REFRESH_MS = 1000
+
 # Comprehensive translations for demo purposes - covers most common phrases
 SAMPLE_TRANSLATIONS = {
     # Hello translations
@@ -341,6 +380,150 @@ SAMPLE_TRANSLATIONS = {
     ("Book", "ur"): "کتاب",
 }
 
+def open_provider_chain():
+    """Online translation providers from providers.json ($LANGUAGE_BUDDY_PROVIDERS), or the built-in ones"""
+    try:
+        return load_providers()
+    except (OSError, ValueError) as e:
+        print(f"Translation provider config error: {e} - using the built-in providers")
+        return build_chain()
+
+translation_providers = open_provider_chain()
+
+def open_glossary():
+    """Protected terms from glossary.json ($LANGUAGE_BUDDY_GLOSSARY), or None without one"""
+    try:
+        return load_glossary()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Glossary could not be loaded: {e}")
+        return None
+
+glossary = open_glossary()
+
+def open_shared_cache():
+    """On-disk translation cache shared with other windows and batch workers ($LANGUAGE_BUDDY_CACHE_DB)"""
+    try:
+        return SharedTranslationCache(os.environ.get("LANGUAGE_BUDDY_CACHE_DB") or SHARED_CACHE_DB_FILE)
+    except Exception as e:
+        print(f"Shared translation cache unavailable: {e}")
+        return None
+
+def translation_setup_version():
+    """Fingerprint of the glossary and provider chain. It is part of every cache key, so editing
+    glossary.json or providers.json stops old translations from being served"""
+    setup = {"glossary": glossary.fingerprint() if glossary else None,
+             "providers": [provider.name for provider in translation_providers.providers]}
+    return hashlib.sha1(json.dumps(setup).encode("utf-8")).hexdigest()[:12]
+
+# Translations in memory for this process, backed by the cache every process on the computer shares
+translation_cache = TranslationCache(open_shared=open_shared_cache, version=translation_setup_version())
+memory_tracker = MemoryTracker()
+
+def diagnostics_report(queues=None):
+    """Cache, provider, thread, queue and memory diagnostics, for the diagnostics screen and the service.
+    queues maps a name to a callable returning how many items are waiting"""
+    return collect(translation_cache, translation_providers, queues, memory_tracker)
+
+def translate_to_language(input_text, target_lang_name, prefetching=False):
+    """Robust translation that tries multiple APIs and ensures real translation.
+    Works without the GUI, so batch tools and services can share it.
+    Cache warming passes prefetching=True so its lookups stay out of the hit rate"""
+    target_lang = LANGUAGES.get(target_lang_name, "es")
+    cached = translation_cache.get(input_text, target_lang, count=not prefetching)
+    if cached is not None:
+        print(f"Cached translation for '{input_text}' ({target_lang_name}): {cached}")
+        return cached
+    
+    if glossary:
+        # Glossary terms are masked so providers never see (or change) them
+        methods = []
+        def translate_masked(masked):
+            text, method = translate_with_providers(masked, target_lang_name)
+            methods.append(method)
+            return text
+        translated_text = glossary.translate(input_text, target_lang, translate_masked)
+        method = methods[0] if methods else "glossary"
+    else:
+        translated_text, method = translate_with_providers(input_text, target_lang_name)
+    if method not in LOCAL_METHODS:
+        translation_cache.put(input_text, target_lang, translated_text)
+    return translated_text
+
+def translate_with_providers(input_text, target_lang_name):
+    """Ask each translation service in turn, falling back to the built-in dictionary.
+    Returns (text, method): the provider's name, or one of LOCAL_METHODS"""
+    target_lang = LANGUAGES.get(target_lang_name, "es")
+    
+    # Detect the source language locally before any network call
+    source_lang, confidence = detect_language(input_text)
+    if confidence < DETECTION_CONFIDENCE:
+        source_lang = None
+    print(f"Translating '{input_text}' from {source_lang or 'auto'} to {target_lang} ({target_lang_name})")
+    if source_lang == target_lang:
+        print(f"Text is already in {target_lang_name} ({confidence:.0%} sure) - no translation needed")
+        return input_text, "unchanged"
+    print(f"Available services: {translation_providers!r}")
+    
+    # Methods 1-4: online providers, in the order set by providers.json
+    translated_text, provider = translation_providers.translate(input_text, source_lang, target_lang)
+    if translated_text:
+        return translated_text, provider
+    
+    # Method 5: Fallback to dictionary
+    translated_text = SAMPLE_TRANSLATIONS.get((input_text, target_lang))
+    
+    # Try case-insensitive match
+    if not translated_text:
+        for (english_text, lang_code), trans in SAMPLE_TRANSLATIONS.items():
+            if english_text.lower() == input_text.lower() and lang_code == target_lang:
+                translated_text = trans
+                break
+    
+    if translated_text:
+        print(f"Dictionary match found: {translated_text}")
+        return translated_text, "dictionary"
+    
+    # Method 6: Simple word substitutions
+    simple_substitutions = {
+        "hello": {"es": "Hola", "fr": "Bonjour", "de": "Hallo", "ur": "السلام علیکم", "hi": "नमस्ते", "ar": "مرحبا"},
+        "hi": {"es": "Hola", "fr": "Salut", "de": "Hallo", "ur": "السلام علیکم", "hi": "नमस्ते", "ar": "مرحبا"},
+        "thanks": {"es": "Gracias", "fr": "Merci", "de": "Danke", "ur": "شکریہ", "hi": "धन्यवाद", "ar": "شكرا"},
+        "thank you": {"es": "Gracias", "fr": "Merci", "de": "Danke", "ur": "شکریہ", "hi": "धन्यवाद", "ar": "شكرا"},
+        "yes": {"es": "Sí", "fr": "Oui", "de": "Ja", "ur": "جی ہاں", "hi": "हाँ", "ar": "نعم"},
+        "no": {"es": "No", "fr": "Non", "de": "Nein", "ur": "نہیں", "hi": "नहीं", "ar": "لا"},
+        "goodbye": {"es": "Adiós", "fr": "Au revoir", "de": "Auf Wiedersehen", "ur": "الوداع", "hi": "अलविदा", "ar": "وداعا"},
+        "good morning": {"es": "Buenos días", "fr": "Bonjour", "de": "Guten Morgen", "ur": "صبح بخیر", "hi": "सुप्रभात", "ar": "صباح الخير"},
+        "good night": {"es": "Buenas noches", "fr": "Bonne nuit", "de": "Gute Nacht", "ur": "شب بخیر", "hi": "शुभ रात्रि", "ar": "تصبح على خير"},
+        "please": {"es": "Por favor", "fr": "S'il vous plaît", "de": "Bitte", "ur": "براہ کرم", "hi": "कृपया", "ar": "من فضلك"},
+        "excuse me": {"es": "Disculpe", "fr": "Excusez-moi", "de": "Entschuldigung", "ur": "معذرت", "hi": "माफ़ करें", "ar": "عذرا"}
+    }
+    
+    text_lower = input_text.lower().strip()
+    if text_lower in simple_substitutions and target_lang in simple_substitutions[text_lower]:
+        translated_text = simple_substitutions[text_lower][target_lang]
+        print(f"Simple substitution found: {translated_text}")
+        return translated_text, "substitution"
+    
+    # Method 7: Try word-by-word translation for simple phrases
+    words = input_text.lower().split()
+    if len(words) <= 3:  # Only for short phrases
+        translated_words = []
+        for word in words:
+            if word in simple_substitutions and target_lang in simple_substitutions[word]:
+                translated_words.append(simple_substitutions[word][target_lang])
+            else:
+                translated_words.append(word)  # Keep original if no translation
+        
+        if any(tw != w for tw, w in zip(translated_words, words)):  # At least one word was translated
+            result = ' '.join(translated_words)
+            print(f"Word-by-word translation: {result}")
+            return result, "word-by-word"
+    
+    # Final fallback - clear error message
+    error_msg = f"⚠️ Translation to {target_lang_name} failed. All translation services are currently unavailable. Please check your internet connection and try again."
+    print(f"All translation methods failed for: {input_text}")
+    return error_msg, "failed"
+
 class LanguageBuddy:
     def __init__(self):
         self.root = tk.Tk()
@@ -348,13 +531,29 @@ class LanguageBuddy:
         self.root.geometry("800x600")
         self.root.configure(bg="#f0f8ff")
         
+        # Synthesized speech is cached on disk so repeat playback skips synthesis
+        self.audio_cache = None
+        try:
+            self.audio_cache = AudioCache()
+        except Exception as e:
+            print(f"Audio cache unavailable: {e}")
+        
         # Initialize text-to-speech with better error handling
-        self.tts_engine = None
+        self.tts_worker = None
+        self.voice_catalog = None
+        self.learning_prefetch = None
         self.init_tts()
         
         # Initialize speech recognition
         self.recognizer = None
         self.microphone = None
+        self.mic_calibration = None
+        self.is_recording = False
+        self.continuous_translator = None
+        self.finishing_translator = None
+        self.continuous_results = None
+        self.vad_stats = SessionVADStats()
+        self.latency_stats = LatencyStats()
         if speech_recognition_available:
             try:
                 self.recognizer = sr.Recognizer()
@@ -362,12 +561,86 @@ class LanguageBuddy:
             except:
                 pass
         
+        # Recognition engine is chosen per deployment ($LANGUAGE_BUDDY_ASR, e.g. "google,sphinx")
+        self.asr_backend = None
+        if self.recognizer:
+            try:
+                self.asr_backend = create_backend(recognizer=self.recognizer)
+                print(f"Speech recognition backend: {self.asr_backend!r}")
+            except ValueError as e:
+                print(f"Speech recognition backend error: {e}")
+        
+        # Calibrate for ambient noise once, in the background, instead of on every recording
+        if self.recognizer and self.microphone:
+            try:
+                self.mic_calibration = MicCalibration(self.recognizer, self.microphone)
+                self.mic_calibration.apply()
+                if self.mic_calibration.is_stale():
+                    self.mic_calibration.calibrate_in_background()
+                self.mic_calibration.start_periodic(lambda: self.is_recording)
+            except Exception as e:
+                print(f"Microphone calibration unavailable: {e}")
+        
+        # Learning-mode words, loaded per language on first use
+        self.vocabulary = VocabularyStore()
+        
+        # Per-word review schedule ($LANGUAGE_BUDDY_PROFILE keeps learners on one computer apart)
+        self.srs = None
+        try:
+            self.srs = SpacedRepetition(profile=os.environ.get("LANGUAGE_BUDDY_PROFILE") or DEFAULT_PROFILE)
+        except Exception as e:
+            print(f"Learning progress store unavailable: {e}")
+        self.quiz_question = None
+        self.quiz_generators = {}  # language code -> QuizGenerator with its distractor indexes
+        
         # User progress data
         self.user_data = self.load_user_data()
         
+        # Translation history (paged from disk by the history screen)
+        self.history = None
+        try:
+            self.history = TranslationHistory()
+        except Exception as e:
+            print(f"Translation history unavailable: {e}")
+        
         # Current selected language
         self.target_language = tk.StringVar(value="Spanish")
         
+        # Speak speech translations aloud as soon as each sentence is ready
+        self.speak_back = tk.BooleanVar(value=False)
+        
+        # Common phrases are translated in the background once the user settles on a new target language
+        self.prefetcher = CachePrefetcher(
+            lambda phrase, target: translate_to_language(phrase, target, prefetching=True),
+            lambda phrase, target: translation_cache.contains(phrase, LANGUAGES.get(target, "es"))
+        )
+        self.prefetch_job = None
+        self.prefetch_generation = 0
+        self.target_language.trace_add("write", lambda *args: self.schedule_cache_prefetch())
+        self.root.bind_all("<Key>", self.postpone_cache_prefetch, add="+")
+        self.root.bind_all("<Button>", self.postpone_cache_prefetch, add="+")
+        
+        # Live translation while typing on the text screen
+        self.text_format = tk.StringVar(value="Plain text")
+        self.text_markup = None     # TEXT_FORMATS value of text_format, readable from worker threads
+        self.live_translate = tk.BooleanVar(value=False)
+        self.live_translate_job = None
+        self.live_translation_shown = None
+        self.live_translator = LiveTranslator(
+            self.translate_live_text,
+            lambda text, target, translation: self.root.after(0, self.show_live_translation, text, target, translation)
+        )
+        
+        # Screens are built on first visit and raised afterwards, keeping what the user typed
+        self.screens = {}
+        self.current_screen = None
+        self.navigation_stats = LatencyStats()
+        self.diagnostics_job = None
+        self.diagnostics_generation = 0     # bumped to drop reports still being collected
+        self.trace_memory = tk.BooleanVar(value=False)
+        self.root.grid_rowconfigure(0, weight=1)
+        self.root.grid_columnconfigure(0, weight=1)
+        
         self.create_main_interface()
     
     def init_tts(self):
@@ -384,61 +657,53 @@ class LanguageBuddy:
         
         if speech_available:
             try:
-                self.tts_engine = pyttsx3.init()
-                # Configure speech settings
-                self.tts_engine.setProperty('rate', 150)  # Speed of speech
-                self.tts_engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
+                # One worker thread owns the engine; everything else queues utterances
+                worker = TTSWorker(self.create_tts_engine, audio_cache=self.audio_cache)
+                worker.start()
+                worker.ready.wait(timeout=10)
+                if not worker.engine:
+                    worker.shutdown()
+                    raise RuntimeError("speech engine did not start")
                 
-                # Configure the best available voice
-                self.configure_voice()
+                if self.tts_worker:
+                    self.tts_worker.shutdown()
+                self.tts_worker = worker
                 
                 print("Text-to-speech initialized successfully")
                 return True
             except Exception as e:
                 print(f"TTS initialization error: {e}")
-                self.tts_engine = None
                 return False
         return False
     
-    def configure_voice(self):
+    def create_tts_engine(self):
+        """Create the pyttsx3 engine (called on the TTS worker thread)"""
+        engine = pyttsx3.init()
+        # Configure speech settings
+        engine.setProperty('rate', 150)  # Speed of speech
+        engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
+        
+        # Configure the best available voice
+        self.configure_voice(engine)
+        return engine
+    
+    def configure_voice(self, engine):
         """Configure and select the best available voice"""
-        if not self.tts_engine:
+        if not engine:
             return False
         
         try:
-            voices = self.tts_engine.getProperty('voices')
-            if not voices:
+            # Voices are only enumerated again when the installed set changes
+            self.voice_catalog = VoiceCatalog.load_or_scan(engine)
+            if not self.voice_catalog.voices:
                 print("No voices available")
                 return False
             
-            print(f"Available voices: {len(voices)}")
-            
-            # Try to find the best voice based on language and gender
-            best_voice = None
-            female_voice = None
-            male_voice = None
-            
-            for voice in voices:
-                voice_info = str(voice.id).lower()
-                print(f"Voice: {voice.id} - {voice.name}")
-                
-                # Look for female voices (often clearer for language learning)
-                if any(indicator in voice_info for indicator in ['female', 'woman', 'zira', 'eva', 'helena']):
-                    female_voice = voice
-                
-                # Look for male voices as backup
-                if any(indicator in voice_info for indicator in ['male', 'man', 'david', 'mark', 'ricardo']):
-                    male_voice = voice
-                
-                # Look for high-quality voices
-                if any(indicator in voice_info for indicator in ['enhanced', 'premium', 'neural']):
-                    best_voice = voice
-            
             # Select the best available voice
-            selected_voice = best_voice or female_voice or male_voice or voices[0]
-            
-            self.tts_engine.setProperty('voice', selected_voice.id)
-            print(f"Selected voice: {selected_voice.id} - {selected_voice.name}")
+            selected_voice = self.voice_catalog.default_voice
+            engine.setProperty('voice', selected_voice)
+            print(f"Selected voice: {selected_voice} - {self.voice_catalog.name_of(selected_voice)}")
+            print(f"Voices available for: {', '.join(sorted(self.voice_catalog.by_language)) or 'none'}")
             
             return True
             
@@ -446,22 +711,28 @@ class LanguageBuddy:
             print(f"Voice configuration error: {e}")
             return False
         
+    def voice_for_target(self):
+        """Installed voice for the current target language (None keeps the default voice)"""
+        if not self.voice_catalog:
+            return None
+        return self.voice_catalog.voice_for(LANGUAGES.get(self.target_language.get(), "es"))
+    
     def get_voice_info(self):
         """Get information about available voices"""
-        if not self.tts_engine:
+        if not self.tts_worker:
             return "TTS engine not initialized"
         
         try:
-            voices = self.tts_engine.getProperty('voices')
+            voices = self.voice_catalog.voices if self.voice_catalog else []
             if not voices:
                 return "No voices available"
             
             voice_info = []
-            current_voice = self.tts_engine.getProperty('voice')
+            current_voice = self.tts_worker.default_voice
             
             for i, voice in enumerate(voices):
-                is_current = "✓" if voice.id == current_voice else " "
-                voice_info.append(f"{is_current} {i+1}. {voice.name} ({voice.id})")
+                is_current = "✓" if voice["id"] == current_voice else " "
+                voice_info.append(f"{is_current} {i+1}. {voice['name']} ({voice['id']})")
             
             return "\n".join(voice_info)
             
@@ -486,14 +757,50 @@ class LanguageBuddy:
         except:
             pass
     
+    def leave_screen(self):
+        """Stop any background work tied to the screen being left"""
+        self.cancel_learning_prefetch()
+        self.stop_continuous()
+        if self.live_translate_job:
+            self.root.after_cancel(self.live_translate_job)
+            self.live_translate_job = None
+        self.live_translator.cancel()
+        self.diagnostics_generation += 1
+        if self.diagnostics_job:
+            self.root.after_cancel(self.diagnostics_job)
+            self.diagnostics_job = None
+    
+    def show_screen(self, name, build, on_show=None):
+        """Raise a screen, building its widgets on the first visit only.
+        on_show refreshes whatever changed while the screen was hidden"""
+        start = time.perf_counter()
+        self.leave_screen()
+        
+        screen = self.screens.get(name)
+        cold = screen is None
+        if cold:
+            screen = tk.Frame(self.root, bg="#f0f8ff")
+            screen.grid(row=0, column=0, sticky="nsew")
+            build(screen)
+            self.screens[name] = screen
+        if on_show:
+            on_show()
+        screen.tkraise()
+        self.current_screen = name
+        self.root.update_idletasks()
+        
+        elapsed = time.perf_counter() - start
+        self.navigation_stats.add(f"{name} ({'cold' if cold else 'warm'})", elapsed)
+        print(f"Navigation to {name} screen ({'built' if cold else 'cached'}): {elapsed * 1000:.1f}ms")
+    
     def create_main_interface(self):
+        """Show the main user interface"""
+        self.show_screen("main", self.build_main_screen, self.refresh_main_screen)
+    
+    def build_main_screen(self, screen):
         """Create the main user interface"""
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
         # Title
-        title_frame = tk.Frame(self.root, bg="#f0f8ff")
+        title_frame = tk.Frame(screen, bg="#f0f8ff")
         title_frame.pack(pady=20)
         
         title_label = tk.Label(
@@ -515,7 +822,7 @@ class LanguageBuddy:
         subtitle_label.pack(pady=5)
         
         # Language selection
-        lang_frame = tk.Frame(self.root, bg="#f0f8ff")
+        lang_frame = tk.Frame(screen, bg="#f0f8ff")
         lang_frame.pack(pady=20)
         
         tk.Label(
@@ -537,7 +844,7 @@ class LanguageBuddy:
         lang_dropdown.pack(pady=10)
         
         # Main buttons
-        button_frame = tk.Frame(self.root, bg="#f0f8ff")
+        button_frame = tk.Frame(screen, bg="#f0f8ff")
         button_frame.pack(pady=30)
         
         # Translate Text Button
@@ -583,7 +890,7 @@ class LanguageBuddy:
         learning_btn.pack(pady=10)
         
         # Progress section
-        progress_frame = tk.Frame(self.root, bg="#ecf0f1", relief="raised", bd=2)
+        progress_frame = tk.Frame(screen, bg="#ecf0f1", relief="raised", bd=2)
         progress_frame.pack(pady=20, padx=50, fill="x")
         
         tk.Label(
@@ -594,21 +901,43 @@ class LanguageBuddy:
             fg="#2c3e50"
         ).pack(pady=10)
         
-        progress_text = f"Words Learned: {self.user_data['daily_words_learned']} | " \
-                       f"Translations: {self.user_data['total_translations']} | " \
-                       f"Learning Streak: {self.user_data['learning_streak']} days"
-        
-        tk.Label(
+        self.progress_label = tk.Label(
             progress_frame,
-            text=progress_text,
+            text="",
             font=("Arial", 11),
             bg="#ecf0f1",
             fg="#34495e"
-        ).pack(pady=(0, 10))
+        )
+        self.progress_label.pack(pady=(0, 10))
+        
+        # Help and history buttons
+        footer_frame = tk.Frame(screen, bg="#f0f8ff")
+        footer_frame.pack(pady=10)
+        
+        history_btn = tk.Button(
+            footer_frame,
+            text="📜 Translation History",
+            font=("Arial", 10),
+            bg="#16a085",
+            fg="white",
+            command=self.open_history,
+            cursor="hand2"
+        )
+        history_btn.pack(side="left", padx=5)
+        
+        diagnostics_btn = tk.Button(
+            footer_frame,
+            text="🩺 Diagnostics",
+            font=("Arial", 10),
+            bg="#34495e",
+            fg="white",
+            command=self.open_diagnostics,
+            cursor="hand2"
+        )
+        diagnostics_btn.pack(side="left", padx=5)
         
-        # Help button
         help_btn = tk.Button(
-            self.root,
+            footer_frame,
             text="❓ Need Help?",
             font=("Arial", 10),
             bg="#9b59b6",
@@ -616,16 +945,23 @@ class LanguageBuddy:
             command=self.show_help,
             cursor="hand2"
         )
-        help_btn.pack(pady=10)
+        help_btn.pack(side="left", padx=5)
+    
+    def refresh_main_screen(self):
+        """Update today's progress, which changes while other screens are open"""
+        progress_text = f"Words Learned: {self.user_data['daily_words_learned']} | " \
+                       f"Translations: {self.user_data['total_translations']} | " \
+                       f"Learning Streak: {self.user_data['learning_streak']} days"
+        self.progress_label.config(text=progress_text)
     
     def open_text_translation(self):
         """Open the text translation interface"""
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
+        self.show_screen("text", self.build_text_screen, self.refresh_text_screen)
+    
+    def build_text_screen(self, screen):
+        """Create the text translation interface"""
         # Header
-        header_frame = tk.Frame(self.root, bg="#f0f8ff")
+        header_frame = tk.Frame(screen, bg="#f0f8ff")
         header_frame.pack(fill="x", pady=10)
         
         tk.Button(
@@ -647,19 +983,20 @@ class LanguageBuddy:
         ).pack()
         
         # Language selection
-        lang_frame = tk.Frame(self.root, bg="#f0f8ff")
+        lang_frame = tk.Frame(screen, bg="#f0f8ff")
         lang_frame.pack(pady=10)
         
-        tk.Label(
+        self.text_target_label = tk.Label(
             lang_frame,
-            text=f"Translating to: {self.target_language.get()}",
+            text="",
             font=("Arial", 12, "bold"),
             bg="#f0f8ff",
             fg="#e74c3c"
-        ).pack()
+        )
+        self.text_target_label.pack()
         
         # Input section
-        input_frame = tk.Frame(self.root, bg="#f0f8ff")
+        input_frame = tk.Frame(screen, bg="#f0f8ff")
         input_frame.pack(pady=20, padx=20, fill="both", expand=True)
         
         tk.Label(
@@ -677,10 +1014,14 @@ class LanguageBuddy:
             wrap=tk.WORD
         )
         self.text_input.pack(fill="both", expand=True, pady=5)
+        self.text_input.bind("<KeyRelease>", lambda event: self.schedule_live_translation())
         
         # Translate button
+        button_row = tk.Frame(input_frame, bg="#f0f8ff")
+        button_row.pack(pady=10)
+        
         translate_btn = tk.Button(
-            input_frame,
+            button_row,
             text="🔄 Translate Now",
             font=("Arial", 12, "bold"),
             bg="#3498db",
@@ -688,7 +1029,30 @@ class LanguageBuddy:
             command=self.translate_text,
             cursor="hand2"
         )
-        translate_btn.pack(pady=10)
+        translate_btn.pack(side="left", padx=5)
+        
+        tk.Checkbutton(
+            button_row,
+            text="⚡ Translate as I type",
+            variable=self.live_translate,
+            command=self.schedule_live_translation,
+            font=("Arial", 10),
+            bg="#f0f8ff",
+            fg="#2c3e50",
+            activebackground="#f0f8ff",
+            cursor="hand2"
+        ).pack(side="left", padx=5)
+        
+        format_dropdown = ttk.Combobox(
+            button_row,
+            textvariable=self.text_format,
+            values=list(TEXT_FORMATS.keys()),
+            state="readonly",
+            font=("Arial", 10),
+            width=10
+        )
+        format_dropdown.pack(side="left", padx=5)
+        format_dropdown.bind("<<ComboboxSelected>>", lambda event: self.text_format_changed())
         
         # Output section
         tk.Label(
@@ -734,6 +1098,63 @@ class LanguageBuddy:
         )
         copy_btn.pack(side="left", padx=5)
     
+    def refresh_text_screen(self):
+        """Show the current target language; typed text and the last translation are kept"""
+        self.text_target_label.config(text=f"Translating to: {self.target_language.get()}")
+        self.schedule_live_translation()
+    
+    def text_format_changed(self):
+        """The same input reads differently in another format, so live mode translates it again"""
+        self.text_markup = TEXT_FORMATS[self.text_format.get()]
+        self.live_translation_shown = None
+        self.live_translator.cancel()
+        self.schedule_live_translation()
+    
+    def schedule_live_translation(self):
+        """Translate the input shortly after the user stops typing (live mode only)"""
+        if self.live_translate_job:
+            self.root.after_cancel(self.live_translate_job)
+            self.live_translate_job = None
+        if not self.live_translate.get():
+            self.live_translator.cancel()
+            return
+        self.live_translate_job = self.root.after(LIVE_TRANSLATE_DELAY_MS, self.start_live_translation)
+    
+    def start_live_translation(self):
+        """Hand the current input to the live translator, replacing any older request"""
+        self.live_translate_job = None
+        input_text = self.text_input.get("1.0", tk.END).strip()
+        target = self.target_language.get()
+        if not input_text:
+            self.live_translator.cancel()
+            return
+        if (input_text, target) in (self.live_translation_shown, self.live_translator.latest):
+            return  # only the cursor moved
+        self.live_translator.submit(input_text, target)
+    
+    def translate_live_text(self, input_text, target, is_stale):
+        """Live-mode translation: unchanged sentences come from the cache, only edited ones are requested"""
+        markup = self.text_markup
+        with self.prefetcher.foreground():
+            if markup:
+                return self.translate_markup_text(input_text, markup, target, is_stale)
+            return translate_segments(input_text, lambda sentence: translate_to_language(sentence, target), is_stale)
+    
+    def show_live_translation(self, input_text, target, translated_text):
+        """Show a live result if the input still matches it (Tk thread only)"""
+        try:
+            current = self.text_input.get("1.0", tk.END).strip()
+        except tk.TclError:
+            return
+        if current != input_text or target != self.target_language.get() or not self.live_translate.get():
+            return  # typed over while the result was on its way
+        self.live_translation_shown = (input_text, target)
+        self.text_output.config(state="normal")
+        self.text_output.delete("1.0", tk.END)
+        self.text_output.insert("1.0", translated_text)
+        self.text_output.config(state="disabled")
+        self.current_translation = translated_text
+    
     def translate_text(self):
         """Translate the input text using multiple translation methods for maximum reliability"""
         input_text = self.text_input.get("1.0", tk.END).strip()
@@ -748,11 +1169,16 @@ class LanguageBuddy:
         self.text_output.config(state="disabled")
         self.root.update()
         
-        # Use the robust translation helper
-        translated_text = self.translate_any_text(input_text)
+        # HTML and Markdown go through the markup translator; plain text uses the robust translation helper
+        markup = TEXT_FORMATS[self.text_format.get()]
+        if markup:
+            with self.prefetcher.foreground():
+                translated_text = self.translate_markup_text(input_text, markup, self.target_language.get())
+        else:
+            translated_text = self.translate_any_text(input_text)
         
         # If translation failed for long text, try splitting into sentences
-        if "not available" in translated_text and len(input_text) > 100:
+        if "not available" in translated_text and len(input_text) > 100 and not markup:
             try:
                 sentences = input_text.replace('!', '.').replace('?', '.').split('.')
                 translated_sentences = []
@@ -771,9 +1197,9 @@ class LanguageBuddy:
             except Exception as e:
                 print(f"Sentence splitting error: {e}")
         
-        self.display_translation(translated_text)
+        self.display_translation(translated_text, input_text)
     
-    def display_translation(self, translated_text):
+    def display_translation(self, translated_text, source_text=None):
         """Helper method to display translation and update progress"""
         # Update output
         self.text_output.config(state="normal")
@@ -785,8 +1211,21 @@ class LanguageBuddy:
         self.user_data["total_translations"] += 1
         self.save_user_data()
         
+        if source_text:
+            self.record_history(source_text, translated_text, "text")
+        
         # Store translation for speech
         self.current_translation = translated_text
+        self.live_translation_shown = None
+    
+    def record_history(self, source_text, translated_text, mode):
+        """Store a successful translation in the history database"""
+        if not self.history or "⚠️" in translated_text:
+            return
+        try:
+            self.history.add(source_text, translated_text, self.target_language.get(), mode)
+        except Exception as e:
+            print(f"History save error: {e}")
     
     def speak_translation(self):
         """Speak the translation using text-to-speech with automatic installation"""
@@ -842,10 +1281,10 @@ class LanguageBuddy:
             else:
                 return
         
-        if not self.tts_engine:
+        if not self.tts_worker:
             self.init_tts()
         
-        if not self.tts_engine:
+        if not self.tts_worker:
             messagebox.showerror("Speech Error", 
                                "Could not initialize text-to-speech engine.\n\n"
                                "Please restart the application.")
@@ -862,18 +1301,8 @@ class LanguageBuddy:
             
             print(f"Speaking: {text_to_speak}")
             
-            # Speak the text in a separate thread to avoid freezing UI
-            def speak_in_thread():
-                try:
-                    self.tts_engine.say(text_to_speak)
-                    self.tts_engine.runAndWait()
-                    print("Speech completed successfully")
-                except Exception as e:
-                    print(f"Speech error: {e}")
-            
-            speak_thread = threading.Thread(target=speak_in_thread)
-            speak_thread.daemon = True
-            speak_thread.start()
+            # The TTS worker plays it in the background, replacing anything already playing
+            self.tts_worker.speak(Utterance(text_to_speak, rate=150, voice=self.voice_for_target()))
             
         except Exception as e:
             print(f"Speech error: {e}")
@@ -899,7 +1328,7 @@ class LanguageBuddy:
     
     def open_speech_translation(self):
         """Open the speech translation interface"""
-        if not speech_recognition_available:
+        if not speech_recognition_available or not self.asr_backend:
             messagebox.showinfo("Speech Recognition Not Available", 
                               "Speech recognition is not available. Please install:\n\n"
                               "pip install speechrecognition\n"
@@ -907,12 +1336,12 @@ class LanguageBuddy:
                               "For now, you can use the text translation feature.")
             return
         
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
+        self.show_screen("speech", self.build_speech_screen)
+    
+    def build_speech_screen(self, screen):
+        """Create the speech translation interface"""
         # Header
-        header_frame = tk.Frame(self.root, bg="#f0f8ff")
+        header_frame = tk.Frame(screen, bg="#f0f8ff")
         header_frame.pack(fill="x", pady=10)
         
         tk.Button(
@@ -934,7 +1363,7 @@ class LanguageBuddy:
         ).pack()
         
         # Instructions
-        instruction_frame = tk.Frame(self.root, bg="#fff3cd", relief="raised", bd=2)
+        instruction_frame = tk.Frame(screen, bg="#fff3cd", relief="raised", bd=2)
         instruction_frame.pack(pady=20, padx=20, fill="x")
         
         tk.Label(
@@ -958,7 +1387,7 @@ class LanguageBuddy:
         ).pack(anchor="w", padx=20, pady=(0, 10))
         
         # Recording section
-        record_frame = tk.Frame(self.root, bg="#f0f8ff")
+        record_frame = tk.Frame(screen, bg="#f0f8ff")
         record_frame.pack(pady=30)
         
         self.record_btn = tk.Button(
@@ -974,6 +1403,29 @@ class LanguageBuddy:
         )
         self.record_btn.pack(pady=10)
         
+        self.continuous_btn = tk.Button(
+            record_frame,
+            text="🔁 Continuous Mode",
+            font=("Arial", 10, "bold"),
+            bg="#8e44ad",
+            fg="white",
+            width=20,
+            command=self.toggle_continuous,
+            cursor="hand2"
+        )
+        self.continuous_btn.pack(pady=5)
+        
+        tk.Checkbutton(
+            record_frame,
+            text="🔊 Speak translations automatically",
+            variable=self.speak_back,
+            font=("Arial", 10),
+            bg="#f0f8ff",
+            fg="#2c3e50",
+            activebackground="#f0f8ff",
+            cursor="hand2"
+        ).pack(pady=5)
+        
         self.recording_status = tk.Label(
             record_frame,
             text="Ready to record",
@@ -984,7 +1436,7 @@ class LanguageBuddy:
         self.recording_status.pack(pady=5)
         
         # Results section
-        results_frame = tk.Frame(self.root, bg="#f0f8ff")
+        results_frame = tk.Frame(screen, bg="#f0f8ff")
         results_frame.pack(pady=20, padx=20, fill="both", expand=True)
         
         tk.Label(
@@ -1050,28 +1502,71 @@ class LanguageBuddy:
         self.record_btn.config(text="⏹️ Stop Recording", bg="#f39c12")
         self.recording_status.config(text="🔴 Recording... Speak now!", fg="#e74c3c")
         
+        timer = StageTimer()
         try:
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source)
-                audio = self.recognizer.listen(source, timeout=10)
+            # The saved threshold is used as-is; it keeps adapting while listening
+            if self.mic_calibration:
+                with self.mic_calibration.mic_lock:
+                    with timer.stage("capture"):
+                        with self.microphone as source:
+                            audio = self.recognizer.listen(source, timeout=10)
+                self.mic_calibration.remember(self.recognizer.energy_threshold)
+            else:
+                with self.microphone as source:
+                    with timer.stage("calibration"):
+                        self.recognizer.adjust_for_ambient_noise(source)
+                    with timer.stage("capture"):
+                        audio = self.recognizer.listen(source, timeout=10)
+            
+            # Trim silence locally, then recognize, translate and (optionally) speak
+            # each sentence as soon as the previous stage hands it over
+            with timer.stage("vad"):
+                utterances, vad = split_utterances(audio, energy_threshold=self.recognizer.energy_threshold)
+            self.vad_stats.add(vad)
+            if not utterances:
+                raise UnknownValueError()
             
-            # Recognize speech
-            text = self.recognizer.recognize_google(audio)
+            captured_at = time.perf_counter()
+            speak_back = self.speak_back.get() and self.tts_worker
+            pipeline = VoicePipeline(
+                self.asr_backend.recognize,
+                self.translate_any_text,
+                speak=self.speak_pipelined if speak_back else None,
+                stats=self.latency_stats
+            ).start()
+            for utterance in utterances:
+                pipeline.submit(utterance, captured_at)
+            pipeline.close()
             
-            # Update input display
-            self.speech_input.config(state="normal")
-            self.speech_input.delete("1.0", tk.END)
-            self.speech_input.insert("1.0", text)
-            self.speech_input.config(state="disabled")
+            for widget in (self.speech_input, self.speech_output):
+                widget.config(state="normal")
+                widget.delete("1.0", tk.END)
+                widget.config(state="disabled")
             
-            # Use the robust translation helper (same as text translation)
-            translation = self.translate_any_text(text)
+            texts, translations, errors = [], [], []
+            first_translated_at = None
+            for sentence in pipeline.results():
+                if sentence.error:
+                    errors.append(sentence.error)
+                    continue
+                if not texts:
+                    first_translated_at = sentence.translated_at
+                texts.append(sentence.text)
+                translations.append(sentence.translation)
+                for widget, value in ((self.speech_input, sentence.text), (self.speech_output, sentence.translation)):
+                    widget.config(state="normal")
+                    widget.insert(tk.END, value + " ")
+                    widget.config(state="disabled")
+            if pipeline.recognized_at:
+                timer.record("recognition", pipeline.recognized_at - captured_at)
+            if first_translated_at:
+                timer.record("first translation", first_translated_at - captured_at)
+            timer.record("pipeline", time.perf_counter() - captured_at)
             
-            # Update output
-            self.speech_output.config(state="normal")
-            self.speech_output.delete("1.0", tk.END)
-            self.speech_output.insert("1.0", translation)
-            self.speech_output.config(state="disabled")
+            if not texts:
+                raise errors[0] if errors else UnknownValueError()
+            text = " ".join(texts)
+            translation = " ".join(translations)
             
             # Store for speech
             self.current_translation = translation
@@ -1079,7 +1574,17 @@ class LanguageBuddy:
             # Update progress
             self.user_data["total_translations"] += 1
             self.save_user_data()
+            self.record_history(text, translation, "speech")
             
+            print(f"Speech timing: {timer.summary()}")
+            print(f"Voice activity: {vad.summary()} (session: {self.vad_stats.summary()})")
+            print(f"Speech latency: {self.latency_stats.summary()}")
+            status = f"✅ Done in {timer.total():.1f}s ({timer.summary()})"
+            if self.latency_stats.count("end_to_end"):
+                status += (f"\nEnd-to-end p50 {self.latency_stats.percentile('end_to_end', 50):.1f}s, "
+                           f"p95 {self.latency_stats.percentile('end_to_end', 95):.1f}s")
+            self.recording_status.config(text=status, fg="#27ae60")
+        
         except sr.UnknownValueError:
             self.recording_status.config(text="Could not understand speech. Try again!", fg="#e74c3c")
         except sr.RequestError:
@@ -1097,14 +1602,157 @@ class LanguageBuddy:
         """Stop recording (handled automatically)"""
         pass
     
+    def speak_pipelined(self, text, on_start, on_done):
+        """Queue one pipelined sentence behind whatever is already being spoken"""
+        self.tts_worker.speak(Utterance(
+            text,
+            rate=150,
+            voice=self.voice_for_target(),
+            on_start=lambda utterance: on_start(),
+            on_done=lambda utterance, completed: on_done(completed)
+        ), interrupt=False)
+    
+    def recognize_speech(self, audio, timer=None):
+        """Recognize only the voiced parts of a recording.
+        Silence is trimmed locally and long recordings are split at pauses, with the
+        pieces recognized in parallel. Returns (text, VADStats)"""
+        timer = timer or StageTimer()
+        threshold = self.recognizer.energy_threshold if self.recognizer else None
+        with timer.stage("vad"):
+            utterances, vad = split_utterances(audio, energy_threshold=threshold)
+        self.vad_stats.add(vad)
+        if not utterances:
+            raise UnknownValueError()
+        
+        with timer.stage("recognition"):
+            if len(utterances) == 1:
+                return self.asr_backend.recognize(utterances[0]), vad
+            
+            def recognize_part(part):
+                try:
+                    return self.asr_backend.recognize(part)
+                except UnknownValueError:
+                    return ""
+            
+            with ThreadPoolExecutor(max_workers=min(4, len(utterances))) as pool:
+                parts = [part for part in pool.map(recognize_part, utterances) if part]
+        if not parts:
+            raise UnknownValueError()
+        return " ".join(parts), vad
+    
+    def toggle_continuous(self):
+        """Switch continuous speech translation on or off"""
+        if self.continuous_translator:
+            self.stop_continuous()
+        else:
+            self.start_continuous()
+    
+    def start_continuous(self):
+        """Listen in the background and translate each phrase as it is captured"""
+        if self.is_recording or self.continuous_translator:
+            return
+        if self.mic_calibration and not self.mic_calibration.mic_lock.acquire(timeout=2):
+            self.recording_status.config(text="Microphone is busy. Try again in a moment.", fg="#e74c3c")
+            return
+        
+        self.is_recording = True
+        self.continuous_results = queue.Queue()
+        self.continuous_translator = ContinuousTranslator(
+            self.recognizer,
+            self.microphone,
+            recognize=lambda audio: self.recognize_speech(audio)[0],
+            translate=self.translate_any_text,
+            on_result=self.continuous_results.put
+        )
+        try:
+            self.continuous_translator.start()
+        except Exception as e:
+            self.continuous_translator = None
+            self.is_recording = False
+            if self.mic_calibration:
+                self.mic_calibration.mic_lock.release()
+            self.recording_status.config(text=f"Error: {str(e)}", fg="#e74c3c")
+            return
+        
+        for widget in (self.speech_input, self.speech_output):
+            widget.config(state="normal")
+            widget.delete("1.0", tk.END)
+            widget.config(state="disabled")
+        
+        self.record_btn.config(state="disabled")
+        self.continuous_btn.config(text="⏹️ Stop Continuous", bg="#f39c12")
+        self.recording_status.config(text="🔁 Listening continuously... Just keep talking!", fg="#8e44ad")
+        self.poll_continuous_results()
+    
+    def stop_continuous(self):
+        """Stop background listening; phrases already captured still get translated"""
+        translator = self.continuous_translator
+        if not translator:
+            return
+        translator.stop()
+        self.continuous_translator = None
+        self.finishing_translator = translator  # still polled until its workers are done
+        self.is_recording = False
+        if self.mic_calibration:
+            self.mic_calibration.mic_lock.release()
+        
+        try:
+            self.record_btn.config(state="normal")
+            self.continuous_btn.config(text="🔁 Continuous Mode", bg="#8e44ad")
+            self.recording_status.config(text="Ready to record", fg="#7f8c8d")
+        except tk.TclError:
+            pass  # the screen is being closed
+    
+    def poll_continuous_results(self):
+        """Move finished phrases from the worker threads into the text boxes (Tk thread only)"""
+        results = self.continuous_results
+        if results is None:
+            return
+        translator = self.continuous_translator or self.finishing_translator
+        try:
+            while True:
+                result = results.get_nowait()
+                self.show_continuous_result(result)
+        except queue.Empty:
+            pass
+        except tk.TclError:
+            return  # the screen was closed
+        
+        if results.qsize() or (translator and translator.busy()):
+            self.root.after(100, self.poll_continuous_results)
+    
+    def show_continuous_result(self, result):
+        """Append one phrase and its translation to the speech screen"""
+        if result.error:
+            if speech_recognition_available and isinstance(result.error, sr.RequestError):
+                self.recording_status.config(text="Speech service error. Check internet connection.", fg="#e74c3c")
+            return  # unintelligible phrases are skipped
+        
+        self.speech_input.config(state="normal")
+        self.speech_input.insert(tk.END, result.text + "\n")
+        self.speech_input.see(tk.END)
+        self.speech_input.config(state="disabled")
+        
+        self.speech_output.config(state="normal")
+        self.speech_output.insert(tk.END, result.translation + "\n")
+        self.speech_output.see(tk.END)
+        self.speech_output.config(state="disabled")
+        
+        self.current_translation = result.translation
+        if self.speak_back.get() and self.tts_worker:
+            self.tts_worker.speak(Utterance(result.translation, rate=150, voice=self.voice_for_target()), interrupt=False)
+        self.user_data["total_translations"] += 1
+        self.save_user_data()
+        self.record_history(result.text, result.translation, "speech")
+    
     def open_learning_mode(self):
         """Open the interactive learning mode"""
-        # Clear the window
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        
+        self.show_screen("learning", self.build_learning_screen, self.show_learning_screen)
+    
+    def build_learning_screen(self, screen):
+        """Create the learning mode header and the frame its lessons are drawn in"""
         # Header
-        header_frame = tk.Frame(self.root, bg="#f0f8ff")
+        header_frame = tk.Frame(screen, bg="#f0f8ff")
         header_frame.pack(fill="x", pady=10)
         
         tk.Button(
@@ -1125,8 +1773,27 @@ class LanguageBuddy:
             fg="#2c3e50"
         ).pack()
         
+        # Everything below the header depends on the target language and the learner's answers
+        self.learning_body = tk.Frame(screen, bg="#f0f8ff")
+        self.learning_body.pack(fill="both", expand=True)
+        self.learning_body_key = None
+        self.learning_prefetch_words = []
+    
+    def show_learning_screen(self):
+        """Redraw the lessons if the language or day changed, otherwise just resume prefetching"""
+        if self.learning_body_key != (self.target_language.get(), datetime.now().date()):
+            self.refresh_learning_screen()
+        else:
+            self.start_learning_prefetch(self.learning_prefetch_words)
+    
+    def refresh_learning_screen(self):
+        """Draw today's words, the next quiz question and the learner's progress"""
+        for widget in self.learning_body.winfo_children():
+            widget.destroy()
+        self.learning_body_key = (self.target_language.get(), datetime.now().date())
+        
         # Daily words section
-        words_frame = tk.Frame(self.root, bg="#e8f5e8", relief="raised", bd=2)
+        words_frame = tk.Frame(self.learning_body, bg="#e8f5e8", relief="raised", bd=2)
         words_frame.pack(pady=20, padx=20, fill="x")
         
         tk.Label(
@@ -1137,58 +1804,22 @@ class LanguageBuddy:
             fg="#27ae60"
         ).pack(pady=10)
         
-        # Sample daily words - now includes multiple languages
+        # Daily words come from the vocabulary file for the target language
         target_lang = LANGUAGES.get(self.target_language.get(), "es")
+        vocabulary = self.vocabulary.get(target_lang)
+        todays_words = vocabulary.daily_words(4)
+        daily_words = [word.as_tuple() for word in todays_words]
+        if self.srs and todays_words:
+            self.srs.introduce(target_lang, [word.id for word in todays_words])
         
-        if target_lang == "es":  # Spanish
-            daily_words = [
-                ("Hello", "Hola", "OH-lah"),
-                ("Thank you", "Gracias", "GRAH-see-ahs"),
-                ("Please", "Por favor", "por fah-VOR"),
-                ("Goodbye", "Adiós", "ah-DYOHS")
-            ]
-        elif target_lang == "fr":  # French
-            daily_words = [
-                ("Hello", "Bonjour", "bon-ZHOOR"),
-                ("Thank you", "Merci", "mer-SEE"),
-                ("Please", "S'il vous plaît", "see voo PLAY"),
-                ("Goodbye", "Au revoir", "oh ruh-VWAHR")
-            ]
-        elif target_lang == "de":  # German
-            daily_words = [
-                ("Hello", "Hallo", "HAH-loh"),
-                ("Thank you", "Danke", "DAHN-keh"),
-                ("Please", "Bitte", "BIT-teh"),
-                ("Goodbye", "Auf Wiedersehen", "owf VEE-der-zayn")
-            ]
-        elif target_lang == "ur":  # Urdu
-            daily_words = [
-                ("Hello", "ہیلو / السلام علیکم", "As-salaam alaykum"),
-                ("Thank you", "شکریہ", "Shukriya"),
-                ("Please", "برائے کرم", "Barae karam"),
-                ("Goodbye", "الوداع", "Alvida")
-            ]
-        elif target_lang == "hi":  # Hindi
-            daily_words = [
-                ("Hello", "नमस्ते", "na-mas-teh"),
-                ("Thank you", "धन्यवाद", "dhan-ya-vaad"),
-                ("Please", "कृपया", "kri-pa-ya"),
-                ("Goodbye", "अलविदा", "al-vi-da")
-            ]
-        elif target_lang == "ar":  # Arabic
-            daily_words = [
-                ("Hello", "مرحبا", "mar-ha-ban"),
-                ("Thank you", "شكرا", "shuk-ran"),
-                ("Please", "من فضلك", "min fad-lak"),
-                ("Goodbye", "وداعا", "wa-da-an")
-            ]
-        else:  # Default to Spanish
-            daily_words = [
-                ("Hello", "Hola", "OH-lah"),
-                ("Thank you", "Gracias", "GRAH-see-ahs"),
-                ("Please", "Por favor", "por fah-VOR"),
-                ("Goodbye", "Adiós", "ah-DYOHS")
-            ]
+        if not daily_words:
+            tk.Label(
+                words_frame,
+                text=f"No practice words for {self.target_language.get()} yet.",
+                font=("Arial", 11),
+                bg="#e8f5e8",
+                fg="#7f8c8d"
+            ).pack(pady=(0, 10))
         
         for english, target_word, pronunciation in daily_words:
             word_frame = tk.Frame(words_frame, bg="#ffffff", relief="ridge", bd=1)
@@ -1231,7 +1862,7 @@ class LanguageBuddy:
             practice_btn.pack(anchor="e", padx=10, pady=5)
         
         # Quiz section
-        quiz_frame = tk.Frame(self.root, bg="#fff3cd", relief="raised", bd=2)
+        quiz_frame = tk.Frame(self.learning_body, bg="#fff3cd", relief="raised", bd=2)
         quiz_frame.pack(pady=20, padx=20, fill="x")
         
         tk.Label(
@@ -1242,24 +1873,42 @@ class LanguageBuddy:
             fg="#856404"
         ).pack(pady=10)
         
+        # Ask about the most overdue word, or one of today's words when nothing is due
+        next_word = self.next_quiz_word(target_lang, vocabulary, todays_words)
+        self.quiz_question = self.quiz_generator(target_lang).question(next_word) if next_word else None
+        self.quiz_language = target_lang
+        quiz_word = next_word.word if next_word else ""
+        question_frame = tk.Frame(quiz_frame, bg="#fff3cd")
+        question_frame.pack(pady=5)
+        
         tk.Label(
-            quiz_frame,
-            text="What does 'Hola' mean in English?",
+            question_frame,
+            text=self.quiz_question.prompt if self.quiz_question else "No quiz words available yet.",
             font=("Arial", 12),
             bg="#fff3cd",
             fg="#856404"
-        ).pack(pady=5)
+        ).pack(side="left")
+        
+        tk.Button(
+            question_frame,
+            text="🔊",
+            font=("Arial", 9),
+            bg="#3498db",
+            fg="white",
+            command=lambda: self.practice_word(quiz_word),
+            cursor="hand2"
+        ).pack(side="left", padx=5)
         
         # Quiz options
         self.quiz_var = tk.StringVar()
-        quiz_options = [("Hello", "Hello"), ("Goodbye", "Goodbye"), ("Thank you", "Thank you")]
+        quiz_options = self.quiz_question.options if self.quiz_question else []
         
-        for text, value in quiz_options:
+        for option in quiz_options:
             tk.Radiobutton(
                 quiz_frame,
-                text=text,
+                text=option,
                 variable=self.quiz_var,
-                value=value,
+                value=option,
                 font=("Arial", 11),
                 bg="#fff3cd",
                 fg="#856404"
@@ -1277,7 +1926,7 @@ class LanguageBuddy:
         check_btn.pack(pady=10)
         
         # Progress section
-        progress_frame = tk.Frame(self.root, bg="#ecf0f1", relief="raised", bd=2)
+        progress_frame = tk.Frame(self.learning_body, bg="#ecf0f1", relief="raised", bd=2)
         progress_frame.pack(pady=20, padx=20, fill="x")
         
         tk.Label(
@@ -1304,6 +1953,55 @@ class LanguageBuddy:
             bg="#ecf0f1",
             fg="#34495e"
         ).pack(pady=(5, 10))
+        
+        if self.srs:
+            review_stats = self.srs.stats(target_lang)
+            tk.Label(
+                progress_frame,
+                text=f"{review_stats['learned']} of {len(vocabulary)} {self.target_language.get()} words learned • "
+                     f"{self.srs.due_count(target_lang)} due for review",
+                font=("Arial", 10),
+                bg="#ecf0f1",
+                fg="#7f8c8d"
+            ).pack(pady=(0, 10))
+        
+        # Render the practice audio while the user reads, so the first click plays instantly
+        self.learning_prefetch_words = [target_word for _, target_word, _ in daily_words] + ([quiz_word] if quiz_word else [])
+        self.start_learning_prefetch(self.learning_prefetch_words)
+    
+    def next_quiz_word(self, language, vocabulary, fallback_words):
+        """The vocabulary word to quiz next: the most overdue review, else one of today's words"""
+        if self.srs:
+            for word_id in self.srs.next_due(language, count=5):
+                word = vocabulary.get(word_id)
+                if word:
+                    return word
+        return random.choice(fallback_words) if fallback_words else None
+    
+    def quiz_generator(self, language):
+        """Quiz generator for a language, with its distractor indexes built once"""
+        if language not in self.quiz_generators:
+            self.quiz_generators[language] = QuizGenerator(self.vocabulary.get(language))
+        return self.quiz_generators[language]
+    
+    def start_learning_prefetch(self, words):
+        """Queue low-priority synthesis of learning-mode words into the audio cache"""
+        self.cancel_learning_prefetch()
+        if not self.tts_worker:
+            return
+        
+        self.learning_prefetch = threading.Event()
+        voice = self.voice_for_target()
+        self.tts_worker.prefetch(
+            [Utterance(word, rate=PRACTICE_SPEECH_RATE, voice=voice) for word in words],
+            self.learning_prefetch
+        )
+    
+    def cancel_learning_prefetch(self):
+        """Stop pre-synthesizing learning-mode audio (the user left the screen)"""
+        if self.learning_prefetch and self.tts_worker:
+            self.tts_worker.cancel_prefetch(self.learning_prefetch)
+        self.learning_prefetch = None
     
     def practice_word(self, word):
         """Practice pronunciation of a word with automatic TTS installation"""
@@ -1354,38 +2052,22 @@ class LanguageBuddy:
             else:
                 return
         
-        if not self.tts_engine:
+        if not self.tts_worker:
             self.init_tts()
         
-        if not self.tts_engine:
+        if not self.tts_worker:
             messagebox.showerror("Speech Error", 
                                "Could not initialize text-to-speech engine.\n\n"
                                "Please restart the application.")
             return
 
         try:
-            # Create a copy of the engine for practice with slower rate
-            practice_rate = 120  # Slower for learning
-            original_rate = self.tts_engine.getProperty('rate')
-            
-            self.tts_engine.setProperty('rate', practice_rate)
+            practice_rate = PRACTICE_SPEECH_RATE  # Slower for learning
             
             print(f"Practicing word: {word}")
             
-            # Speak the word in a separate thread
-            def speak_practice():
-                try:
-                    self.tts_engine.say(word)
-                    self.tts_engine.runAndWait()
-                    # Reset rate back to normal
-                    self.tts_engine.setProperty('rate', original_rate)
-                    print("Word practice completed")
-                except Exception as e:
-                    print(f"Practice speech error: {e}")
-            
-            speak_thread = threading.Thread(target=speak_practice)
-            speak_thread.daemon = True
-            speak_thread.start()
+            # Each utterance carries its own rate, so the shared voice settings never change
+            self.tts_worker.speak(Utterance(word, rate=practice_rate, voice=self.voice_for_target()))
             
         except Exception as e:
             print(f"Practice speech error: {e}")
@@ -1394,13 +2076,293 @@ class LanguageBuddy:
                                f"Try restarting the application or check your audio settings.")
     
     def check_quiz_answer(self):
-        """Check the quiz answer"""
-        if self.quiz_var.get() == "Hello":
-            messagebox.showinfo("Correct! 🎉", "Great job! 'Hola' means 'Hello' in English.")
+        """Check the quiz answer and reschedule the word"""
+        question = self.quiz_question
+        if not question:
+            return
+        word = question.word
+        if not self.quiz_var.get():
+            messagebox.showinfo("Pick an Answer", "Choose one of the answers first!")
+            return
+        
+        correct = question.is_correct(self.quiz_var.get())
+        if self.srs:
+            # SM-2 grades: 4 = correct, 1 = wrong but familiar once shown
+            card = self.srs.review(self.quiz_language, word.id, 4 if correct else 1)
+            next_review = f"\n\nNext review in {card.interval:g} day{'s' if card.interval != 1 else ''}."
+        else:
+            next_review = ""
+        
+        if correct:
+            messagebox.showinfo("Correct! 🎉", f"Great job! '{word.word}' means '{word.english}' in English.{next_review}")
             self.user_data["daily_words_learned"] += 1
             self.save_user_data()
         else:
-            messagebox.showinfo("Try Again", "Not quite right. 'Hola' means 'Hello' in English. Keep practicing!")
+            messagebox.showinfo("Try Again", f"Not quite right. '{word.word}' means '{word.english}' in English. "
+                                             f"Keep practicing!{next_review}")
+        self.refresh_learning_screen()
+    
+    def open_history(self):
+        """Open the translation history browser"""
+        if not self.history:
+            messagebox.showinfo("History Not Available",
+                              "Translation history could not be opened on this computer.")
+            return
+        
+        self.show_screen("history", self.build_history_screen, self.refresh_history)
+    
+    def build_history_screen(self, screen):
+        """Create the translation history browser"""
+        # Header
+        header_frame = tk.Frame(screen, bg="#f0f8ff")
+        header_frame.pack(fill="x", pady=10)
+        
+        tk.Button(
+            header_frame,
+            text="⬅️ Back to Home",
+            font=("Arial", 10),
+            bg="#95a5a6",
+            fg="white",
+            command=self.create_main_interface,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+        
+        tk.Label(
+            header_frame,
+            text="📜 Translation History",
+            font=("Arial", 18, "bold"),
+            bg="#f0f8ff",
+            fg="#2c3e50"
+        ).pack()
+        
+        # Search box
+        search_frame = tk.Frame(screen, bg="#f0f8ff")
+        search_frame.pack(fill="x", padx=20, pady=10)
+        
+        tk.Label(
+            search_frame,
+            text="🔍 Search:",
+            font=("Arial", 12, "bold"),
+            bg="#f0f8ff",
+            fg="#2c3e50"
+        ).pack(side="left")
+        
+        self.history_search = tk.StringVar()
+        tk.Entry(
+            search_frame,
+            textvariable=self.history_search,
+            font=("Arial", 12)
+        ).pack(side="left", fill="x", expand=True, padx=10)
+        
+        self.history_count_label = tk.Label(
+            search_frame,
+            text="",
+            font=("Arial", 10),
+            bg="#f0f8ff",
+            fg="#7f8c8d"
+        )
+        self.history_count_label.pack(side="right")
+        
+        # Only the visible rows are real widgets; pages come from the database on demand
+        self.history_list = VirtualList(
+            screen,
+            count_rows=lambda: self.history.count(self.history_search.get()),
+            fetch_rows=lambda offset, limit, previous: self.history.fetch(
+                offset, limit, self.history_search.get(), before_id=previous["id"] if previous else None),
+            format_row=self.format_history_row,
+            on_activate=self.copy_history_entry,
+            relief="sunken",
+            bd=1
+        )
+        self.history_list.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        
+        tk.Label(
+            screen,
+            text="Double-click an entry to copy its translation",
+            font=("Arial", 9, "italic"),
+            bg="#f0f8ff",
+            fg="#7f8c8d"
+        ).pack(pady=(0, 10))
+        
+        # Debounce typing so each keystroke doesn't hit the database
+        self.history_search_job = None
+        self.shown_history_search = ""
+        self.history_search.trace_add("write", lambda *args: self.schedule_history_search())
+    
+    def schedule_history_search(self):
+        """Re-run the history search shortly after the user stops typing"""
+        if self.history_search_job:
+            self.root.after_cancel(self.history_search_job)
+        self.history_search_job = self.root.after(200, self.refresh_history)
+    
+    def refresh_history(self):
+        """Reload the history list for the current search; the database is searched off the Tk thread"""
+        self.history_search_job = None
+        search = self.history_search.get()
+        self.history_count_label.config(text="🔍 Searching...")
+        threading.Thread(target=self.load_history, args=(search,), name="history-search", daemon=True).start()
+    
+    def load_history(self, search):
+        """Count the matches and read the first page (worker thread)"""
+        try:
+            total = self.history.count(search)
+            first_page = self.history.fetch(0, self.history_list.page_size, search)
+        except Exception as e:
+            print(f"History search error: {e}")
+            return
+        self.root.after(0, self.show_history, search, total, first_page)
+    
+    def show_history(self, search, total, first_page):
+        """Show a finished search unless the user has typed a newer one (Tk thread only)"""
+        if search != self.history_search.get():
+            return
+        # A new search starts from the top; reopening the screen keeps the place in the list
+        self.history_list.refresh(total, first_page, keep_position=search == self.shown_history_search)
+        self.shown_history_search = search
+        self.history_count_label.config(text=f"{total} entries")
+    
+    def format_history_row(self, entry):
+        """Two-line summary of a history entry for the list"""
+        source = entry["source_text"].replace("\n", " ")
+        translated = entry["translated_text"].replace("\n", " ")
+        if len(source) > 70:
+            source = source[:67] + "..."
+        if len(translated) > 80:
+            translated = translated[:77] + "..."
+        title = f"{entry['created_at'].replace('T', ' ')}  •  {entry['target_language']}  •  {source}"
+        return title, translated
+    
+    def copy_history_entry(self, entry):
+        """Copy a history entry's translation to the clipboard"""
+        self.current_translation = entry["translated_text"]
+        self.root.clipboard_clear()
+        self.root.clipboard_append(entry["translated_text"])
+        self.history_count_label.config(text="📋 Copied!")
+    
+    def open_diagnostics(self):
+        """Open the live diagnostics screen"""
+        self.show_screen("diagnostics", self.build_diagnostics_screen, self.refresh_diagnostics)
+    
+    def build_diagnostics_screen(self, screen):
+        """Create the diagnostics screen; its labels are updated in place while it is open"""
+        # Header
+        header_frame = tk.Frame(screen, bg="#f0f8ff")
+        header_frame.pack(fill="x", pady=10)
+        
+        tk.Button(
+            header_frame,
+            text="⬅️ Back to Home",
+            font=("Arial", 10),
+            bg="#95a5a6",
+            fg="white",
+            command=self.create_main_interface,
+            cursor="hand2"
+        ).pack(side="left", padx=10)
+        
+        tk.Label(
+            header_frame,
+            text="🩺 Diagnostics",
+            font=("Arial", 18, "bold"),
+            bg="#f0f8ff",
+            fg="#2c3e50"
+        ).pack()
+        
+        tk.Checkbutton(
+            screen,
+            text="🧠 Trace memory (slows the app a little while on)",
+            variable=self.trace_memory,
+            command=self.toggle_memory_tracing,
+            font=("Arial", 10),
+            bg="#f0f8ff",
+            fg="#2c3e50",
+            activebackground="#f0f8ff",
+            cursor="hand2"
+        ).pack(pady=(0, 5))
+        
+        sections_frame = tk.Frame(screen, bg="#f0f8ff")
+        sections_frame.pack(fill="both", expand=True, padx=20, pady=5)
+        sections_frame.grid_columnconfigure(0, weight=1)
+        sections_frame.grid_columnconfigure(1, weight=1)
+        
+        # (section, title, row, column, columns spanned)
+        layout = [
+            ("cache", "💾 Translation Cache", 0, 0, 1),
+            ("queues", "📥 Queued Work", 0, 1, 1),
+            ("providers", "🔌 Translation Services", 1, 0, 2),
+            ("threads", "🧵 Threads and Widgets", 2, 0, 1),
+            ("memory", "🧠 Top Memory Allocations", 2, 1, 1),
+        ]
+        self.diagnostics_labels = {}
+        for section, title, row, column, span in layout:
+            frame = tk.Frame(sections_frame, bg="#ecf0f1", relief="raised", bd=2)
+            frame.grid(row=row, column=column, columnspan=span, sticky="nsew", padx=5, pady=5)
+            tk.Label(
+                frame,
+                text=title,
+                font=("Arial", 12, "bold"),
+                bg="#ecf0f1",
+                fg="#2c3e50"
+            ).pack(anchor="w", padx=10, pady=(5, 0))
+            label = tk.Label(
+                frame,
+                text="",
+                font=("Courier", 9),
+                bg="#ecf0f1",
+                fg="#34495e",
+                justify="left"
+            )
+            label.pack(anchor="w", padx=10, pady=(0, 5))
+            self.diagnostics_labels[section] = label
+    
+    def diagnostics_queues(self):
+        """Depth of every queue of background work, read when the report is collected"""
+        return {
+            "speech to play": lambda: self.tts_worker.pending() if self.tts_worker else 0,
+            "speech to pre-render": lambda: self.tts_worker.pending_prefetch() if self.tts_worker else 0,
+            "phrases to prefetch": self.prefetcher.pending,
+            "live translation running": lambda: int(self.live_translator.running),
+        }
+    
+    def count_widgets(self, widget):
+        return 1 + sum(self.count_widgets(child) for child in widget.winfo_children())
+    
+    def refresh_diagnostics(self):
+        """Collect a report off the Tk thread - a memory snapshot walks every traced block"""
+        self.diagnostics_job = None
+        widgets = f"\n\n{self.count_widgets(self.root)} Tk widgets, {len(self.screens)} screens built"
+        threading.Thread(target=self.collect_diagnostics, args=(self.diagnostics_generation, widgets),
+                         name="diagnostics", daemon=True).start()
+    
+    def collect_diagnostics(self, generation, widgets):
+        """Build the report sections (worker thread)"""
+        try:
+            sections = format_report(diagnostics_report(self.diagnostics_queues()))
+        except Exception as e:
+            print(f"Diagnostics error: {e}")
+            sections = {"threads": f"Diagnostics error: {e}"}
+        sections["threads"] = sections.get("threads", "") + widgets
+        self.root.after(0, self.show_diagnostics, generation, sections)
+    
+    def show_diagnostics(self, generation, sections):
+        """Update the diagnostics labels and come back in a second while the screen is open (Tk thread only)"""
+        if generation != self.diagnostics_generation:
+            return  # the screen was left, or tracing toggled, while this report was collected
+        for section, label in self.diagnostics_labels.items():
+            text = sections.get(section, "")
+            if label.cget("text") != text:
+                label.config(text=text)
+        self.diagnostics_job = self.root.after(DIAGNOSTICS_REFRESH_MS, self.refresh_diagnostics)
+    
+    def toggle_memory_tracing(self):
+        """Start or stop tracemalloc; allocations are only seen from the moment tracing starts"""
+        if self.trace_memory.get():
+            memory_tracker.start()
+        else:
+            memory_tracker.stop()
+        self.diagnostics_generation += 1
+        if self.diagnostics_job:
+            self.root.after_cancel(self.diagnostics_job)
+        self.refresh_diagnostics()
     
     def show_help(self):
         """Show help information"""
@@ -1419,6 +2381,10 @@ class LanguageBuddy:
 • Speak clearly in English
 • Click 'Stop Recording'
 • Get instant translation!
+• Or use 'Continuous Mode' to keep talking
+  and see each phrase translated as you go
+• Tick 'Speak translations automatically' to
+  hear each sentence as soon as it's translated
 
 🎓 LEARNING MODE:
 • Practice daily words
@@ -1426,6 +2392,11 @@ class LanguageBuddy:
 • Track your progress
 • Learn pronunciation
 
+📜 TRANSLATION HISTORY:
+• Every translation is saved automatically
+• Type in the search box to filter
+• Double-click an entry to copy it
+
 💡 TIPS:
 • Speak clearly for best results
 • Use a quiet environment for speech
@@ -1468,135 +2439,62 @@ Visit our website for tutorials and guides.
         self.root.mainloop()
     
     def translate_any_text(self, input_text):
-        """Robust translation method that tries multiple APIs and ensures real translation"""
-        target_lang = LANGUAGES.get(self.target_language.get(), "es")
-        target_lang_name = self.target_language.get()
-        
-        print(f"Translating '{input_text}' to {target_lang} ({target_lang_name})")
-        print(f"Available services: deep_translator={deep_translator_available}, googletrans={translator_available}, requests={requests_available}")
-        
-        # Method 1: Try Deep Translator (Google Translate via deep-translator)
-        if deep_translator_available:
-            try:
-                translator = GoogleTranslator(source='auto', target=target_lang)
-                translated_text = translator.translate(input_text)
-                if translated_text and translated_text.strip() and translated_text.lower() != input_text.lower():
-                    print(f"Deep Translator success: {translated_text}")
-                    return translated_text
-                else:
-                    print(f"Deep Translator returned same text or empty: {translated_text}")
-            except Exception as e:
-                print(f"Deep Translator error: {e}")
-        
-        # Method 2: Try original googletrans
-        if translator_available and google_translator:
-            try:
-                translation = google_translator.translate(input_text, dest=target_lang)
-                if translation and translation.text and translation.text.lower() != input_text.lower():
-                    print(f"GoogleTrans success: {translation.text}")
-                    return translation.text
-                else:
-                    print(f"GoogleTrans returned same text or empty: {translation.text if translation else 'None'}")
-            except Exception as e:
-                print(f"GoogleTrans error: {e}")
-        
-        # Method 3: Try MyMemory API via requests
-        if requests_available:
-            try:
-                url = f"https://api.mymemory.translated.net/get"
-                params = {
-                    'q': input_text,
-                    'langpair': f'en|{target_lang}'
-                }
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('responseStatus') == 200:
-                        translated_text = data['responseData']['translatedText']
-                        if translated_text and translated_text.lower() != input_text.lower():
-                            print(f"MyMemory API success: {translated_text}")
-                            return translated_text
-                        else:
-                            print(f"MyMemory returned same text: {translated_text}")
-            except Exception as e:
-                print(f"MyMemory API error: {e}")
+        """Robust translation method that tries multiple APIs and ensures real translation.
+        Plain text only - speech and continuous mode use it whatever the text screen's format is"""
+        with self.prefetcher.foreground():
+            return translate_to_language(input_text, self.target_language.get())
+    
+    def translate_markup_text(self, input_text, markup, target, is_stale=None):
+        """Translate an HTML or Markdown document's text nodes, keeping its tags and code as written"""
+        result = translate_markup(input_text, markup, lambda text: translate_to_language(text, target), is_stale=is_stale)
+        if result is None:
+            return None  # live mode input changed meanwhile
+        print(f"{markup} translation: {result.summary()}")
+        if result.error and result.failed == result.nodes:
+            return result.error
+        return result.text
+    
+    def schedule_cache_prefetch(self):
+        """Warm the translation cache once the app has been left alone for a while"""
+        if self.prefetch_job:
+            self.root.after_cancel(self.prefetch_job)
+        self.prefetch_generation += 1
+        self.prefetcher.cancel()
+        self.prefetch_job = self.root.after(PREFETCH_IDLE_MS, self.start_cache_prefetch)
+    
+    def postpone_cache_prefetch(self, event=None):
+        """Restart the idle wait when the user presses a key or clicks"""
+        if self.prefetch_job:
+            self.root.after_cancel(self.prefetch_job)
+            self.prefetch_job = self.root.after(PREFETCH_IDLE_MS, self.start_cache_prefetch)
+    
+    def start_cache_prefetch(self):
+        """Collect the phrases most likely to be translated next; the history query runs off the Tk thread"""
+        self.prefetch_job = None
+        target = self.target_language.get()
+        if target == "English":
+            return
         
-     
-        if requests_available:
+        vocabulary = self.vocabulary.get(LANGUAGES.get(target, "es"))
+        daily = [word.english for word in vocabulary.daily_words(4)]
+        common = [word.english for word in vocabulary.ranked(0, 20)]
+        phrasebook = [english for english, lang_code in SAMPLE_TRANSLATIONS if lang_code == LANGUAGES.get(target, "es")]
+        threading.Thread(target=self.queue_cache_prefetch, args=(self.prefetch_generation, target, daily, phrasebook, common),
+                         name="prefetch-rank", daemon=True).start()
+    
+    def queue_cache_prefetch(self, generation, target, daily, phrasebook, common):
+        """Rank the phrases, the user's own favourites first, and hand them to the prefetcher (worker thread)"""
+        frequent = []
+        if self.history:
             try:
-                url = "https://libretranslate.de/translate"
-                data = {
-                    'q': input_text,
-                    'source': 'en',
-                    'target': target_lang,
-                    'format': 'text'
-                }
-                response = requests.post(url, data=data, timeout=10)
-                if response.status_code == 200:
-                    result = response.json()
-                    translated_text = result.get('translatedText', '')
-                    if translated_text and translated_text.lower() != input_text.lower():
-                        print(f"LibreTranslate success: {translated_text}")
-                        return translated_text
-                    else:
-                        print(f"LibreTranslate returned same text: {translated_text}")
+                frequent = self.history.frequent_sources(30)
             except Exception as e:
-                print(f"LibreTranslate error: {e}")
-        
-        # Method 5: Fallback to dictionary
-        translated_text = SAMPLE_TRANSLATIONS.get((input_text, target_lang))
-        
-        # Try case-insensitive match
-        if not translated_text:
-            for (english_text, lang_code), trans in SAMPLE_TRANSLATIONS.items():
-                if english_text.lower() == input_text.lower() and lang_code == target_lang:
-                    translated_text = trans
-                    break
-        
-        if translated_text:
-            print(f"Dictionary match found: {translated_text}")
-            return translated_text
-        
-        # Method 6: Simple word substitutions
-        simple_substitutions = {
-            "hello": {"es": "Hola", "fr": "Bonjour", "de": "Hallo", "ur": "السلام علیکم", "hi": "नमस्ते", "ar": "مرحبا"},
-            "hi": {"es": "Hola", "fr": "Salut", "de": "Hallo", "ur": "السلام علیکم", "hi": "नमस्ते", "ar": "مرحبا"},
-            "thanks": {"es": "Gracias", "fr": "Merci", "de": "Danke", "ur": "شکریہ", "hi": "धन्यवाद", "ar": "شكرا"},
-            "thank you": {"es": "Gracias", "fr": "Merci", "de": "Danke", "ur": "شکریہ", "hi": "धन्यवाद", "ar": "شكرا"},
-            "yes": {"es": "Sí", "fr": "Oui", "de": "Ja", "ur": "جی ہاں", "hi": "हाँ", "ar": "نعم"},
-            "no": {"es": "No", "fr": "Non", "de": "Nein", "ur": "نہیں", "hi": "नहीं", "ar": "لا"},
-            "goodbye": {"es": "Adiós", "fr": "Au revoir", "de": "Auf Wiedersehen", "ur": "الوداع", "hi": "अलविदा", "ar": "وداعا"},
-            "good morning": {"es": "Buenos días", "fr": "Bonjour", "de": "Guten Morgen", "ur": "صبح بخیر", "hi": "सुप्रभात", "ar": "صباح الخير"},
-            "good night": {"es": "Buenas noches", "fr": "Bonne nuit", "de": "Gute Nacht", "ur": "شب بخیر", "hi": "शुभ रात्रि", "ar": "تصبح على خير"},
-            "please": {"es": "Por favor", "fr": "S'il vous plaît", "de": "Bitte", "ur": "براہ کرم", "hi": "कृपया", "ar": "من فضلك"},
-            "excuse me": {"es": "Disculpe", "fr": "Excusez-moi", "de": "Entschuldigung", "ur": "معذرت", "hi": "माफ़ करें", "ar": "عذرا"}
-        }
-        
-        text_lower = input_text.lower().strip()
-        if text_lower in simple_substitutions and target_lang in simple_substitutions[text_lower]:
-            translated_text = simple_substitutions[text_lower][target_lang]
-            print(f"Simple substitution found: {translated_text}")
-            return translated_text
-        
-        # Method 7: Try word-by-word translation for simple phrases
-        words = input_text.lower().split()
-        if len(words) <= 3:  # Only for short phrases
-            translated_words = []
-            for word in words:
-                if word in simple_substitutions and target_lang in simple_substitutions[word]:
-                    translated_words.append(simple_substitutions[word][target_lang])
-                else:
-                    translated_words.append(word)  # Keep original if no translation
-            
-            if any(tw != w for tw, w in zip(translated_words, words)):  # At least one word was translated
-                result = ' '.join(translated_words)
-                print(f"Word-by-word translation: {result}")
-                return result
-        
-        # Final fallback - clear error message
-        error_msg = f"⚠️ Translation to {target_lang_name} failed. All translation services are currently unavailable. Please check your internet connection and try again."
-        print(f"All translation methods failed for: {input_text}")
-        return error_msg
+                print(f"Could not read history for prefetching: {e}")
+        if generation != self.prefetch_generation:
+            return  # the language changed again while history was read
+        phrases = rank_phrases(frequent, daily, phrasebook, common)
+        print(f"Prefetching {len(phrases)} {target} translations in the background")
+        self.prefetcher.prefetch(target, phrases)
 
 if __name__ == "__main__":
     app = LanguageBuddy()
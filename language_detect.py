@@ -0,0 +1,282 @@
+"""
+Local language detection for Language Buddy
+Guesses the language of a piece of text without any network call. Non-Latin
+scripts are recognized from Unicode ranges and the letters each language adds
+to them; Latin-script languages are told apart with character trigram profiles
+built from the sample text below. Text that fits none of them well (Dutch,
+Ukrainian, Persian...) is reported as unknown rather than as its nearest match
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+# Below this many letters a guess is too weak to act on
+MIN_LETTERS = 3
+
+# Letters needed before a guess can reach full confidence. A few Latin words share
+# most of their trigrams across languages ("Grande latte"), and a short run of kanji
+# with no kana reads the same in Chinese and Japanese
+LATIN_EVIDENCE_LETTERS = 20
+HAN_EVIDENCE_LETTERS = 8
+
+# Share of the text's trigrams the best profile must have seen. The profiles only know
+# six languages, so the best of them can still be a poor fit: Dutch scores as German
+# and Czech as Italian, yet only a third or less of their trigrams appear in that profile
+MIN_PROFILE_FIT = 0.45
+
+# (first code point, last code point, script)
+SCRIPT_RANGES = [
+    (0x0041, 0x024F, "latin"),
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0750, 0x077F, "arabic"),
+    (0xFB50, 0xFDFF, "arabic"),
+    (0xFE70, 0xFEFF, "arabic"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x1100, 0x11FF, "hangul"),
+    (0x3130, 0x318F, "hangul"),
+    (0xAC00, 0xD7AF, "hangul"),
+    (0x3040, 0x309F, "kana"),
+    (0x30A0, 0x30FF, "kana"),
+    (0x31F0, 0x31FF, "kana"),
+    (0xFF66, 0xFF9F, "kana"),
+    (0x3400, 0x4DBF, "han"),
+    (0x4E00, 0x9FFF, "han"),
+    (0xF900, 0xFAFF, "han"),
+]
+
+# Scripts that pin down a single app language
+SCRIPT_LANGUAGES = {
+    "hangul": "ko",
+}
+
+# Letters Urdu uses that Arabic and Persian do not
+URDU_LETTERS = set("ٹڈڑںےۓھہۂۃ")
+
+# Scripts that other languages write too: script -> (app language, its markers, other
+# languages' markers). The guess is only sure when one of the language's own markers
+# shows up and none of the others do. Markers are letters, or whole words for
+# Devanagari, where Hindi, Marathi and Nepali share every letter
+SHARED_SCRIPTS = {
+    "cyrillic": ("ru", set("ыэё"), set("іїєґўђјљњћџѓќѕ")),    # Ukrainian, Belarusian, Serbian, Macedonian
+    "arabic": ("ar", set("ةىيك"), set("پچژگکی")),            # Persian (and Urdu without its own letters)
+    "devanagari": ("hi", {"है", "हैं", "था", "थी", "थे", "में", "नहीं", "और", "क्या", "मैं", "हूँ", "आप"},
+                   {"ळ", "आहे", "आहेत", "छ", "छन्", "हुन्छ"}),  # Marathi, Nepali
+}
+SHARED_SCRIPT_DOUBT = 0.5   # confidence factor for a shared script without the language's markers
+
+# Representative text for each Latin-script language; trigram profiles are built from it
+SAMPLE_TEXT = {
+    "en": """
+        Hello, how are you today? I am fine, thank you very much. What is your name?
+        My name is John and I would like to learn a new language. Where is the train
+        station? Can you help me please? I don't understand. Good morning, good night,
+        see you later. The weather is nice and the children are playing in the garden.
+        This is the best restaurant in the city and they have the freshest bread.
+        I have been working there for three years, and it was something that we
+        should have done with them. Would you like some water or a cup of coffee?
+        Excuse me, where is the bathroom? Thank you for your help, have a good day.
+        I would like to book a table for two people tonight. How much does this cost?
+        Could you tell me the way to the hospital, the airport or the nearest pharmacy?
+        We are looking for a cheap hotel near the beach with a room for our family. The
+        meeting starts at nine o'clock, so please don't be late again. Which bus goes to
+        the museum? My phone is broken and I need to call my brother before he leaves.
+        Everybody knows that reading every day makes learning much easier than before.
+    """,
+    "es": """
+        Hola, ¿cómo estás hoy? Estoy bien, muchas gracias. ¿Cómo te llamas? Me llamo
+        Juan y me gustaría aprender un idioma nuevo. ¿Dónde está la estación de tren?
+        ¿Puedes ayudarme, por favor? No entiendo. Buenos días, buenas noches, hasta
+        luego. El tiempo es agradable y los niños están jugando en el jardín. Este es
+        el mejor restaurante de la ciudad y tienen el pan más fresco. He trabajado allí
+        durante tres años y era algo que deberíamos haber hecho con ellos. ¿Quieres un
+        vaso de agua o una taza de café? Disculpe, ¿dónde está el baño? Gracias por su
+        ayuda, que tenga un buen día. Nosotros queremos que ella lo haga pronto.
+        Me gustaría reservar una mesa para dos personas esta noche. ¿Cuánto cuesta esto?
+        ¿Podría decirme cómo llegar al hospital, al aeropuerto o a la farmacia más
+        cercana? Buscamos un hotel barato cerca de la playa con una habitación para
+        nuestra familia. La reunión empieza a las nueve, así que no llegues tarde otra
+        vez. ¿Qué autobús va al museo? Mi teléfono está roto y necesito llamar a mi
+        hermano antes de que se vaya. Todo el mundo sabe que leer cada día hace que
+        aprender sea mucho más fácil.
+    """,
+    "fr": """
+        Bonjour, comment allez-vous aujourd'hui ? Je vais bien, merci beaucoup. Comment
+        vous appelez-vous ? Je m'appelle Jean et je voudrais apprendre une nouvelle
+        langue. Où est la gare ? Pouvez-vous m'aider, s'il vous plaît ? Je ne comprends
+        pas. Bonne nuit, à bientôt. Il fait beau et les enfants jouent dans le jardin.
+        C'est le meilleur restaurant de la ville et ils ont le pain le plus frais. J'ai
+        travaillé là-bas pendant trois ans et c'était quelque chose que nous aurions dû
+        faire avec eux. Voulez-vous un verre d'eau ou une tasse de café ? Excusez-moi,
+        où sont les toilettes ? Merci pour votre aide, bonne journée.
+        Je voudrais réserver une table pour deux personnes ce soir. Combien ça coûte ?
+        Pourriez-vous m'indiquer le chemin de l'hôpital, de l'aéroport ou de la pharmacie
+        la plus proche ? Nous cherchons un hôtel pas cher près de la plage avec une
+        chambre pour notre famille. La réunion commence à neuf heures, alors ne sois pas
+        encore en retard. Quel bus va au musée ? Mon téléphone est cassé et je dois
+        appeler mon frère avant qu'il parte. Tout le monde sait que lire chaque jour rend
+        l'apprentissage beaucoup plus facile.
+    """,
+    "de": """
+        Hallo, wie geht es dir heute? Mir geht es gut, vielen Dank. Wie heißt du? Ich
+        heiße Johann und ich möchte eine neue Sprache lernen. Wo ist der Bahnhof?
+        Kannst du mir bitte helfen? Ich verstehe das nicht. Guten Morgen, gute Nacht,
+        bis später. Das Wetter ist schön und die Kinder spielen im Garten. Das ist das
+        beste Restaurant der Stadt und sie haben das frischeste Brot. Ich habe dort drei
+        Jahre gearbeitet, und es war etwas, das wir mit ihnen hätten machen sollen.
+        Möchtest du ein Glas Wasser oder eine Tasse Kaffee? Entschuldigung, wo ist die
+        Toilette? Danke für deine Hilfe, einen schönen Tag noch. Auf Wiedersehen.
+        Ich möchte für heute Abend einen Tisch für zwei Personen reservieren. Wie viel
+        kostet das? Können Sie mir den Weg zum Krankenhaus, zum Flughafen oder zur
+        nächsten Apotheke zeigen? Wir suchen ein günstiges Hotel in der Nähe des Strandes
+        mit einem Zimmer für unsere Familie. Die Besprechung beginnt um neun Uhr, also
+        komm bitte nicht wieder zu spät. Welcher Bus fährt zum Museum? Mein Handy ist
+        kaputt und ich muss meinen Bruder anrufen, bevor er geht. Jeder weiß, dass
+        tägliches Lesen das Lernen viel leichter macht.
+    """,
+    "it": """
+        Ciao, come stai oggi? Sto bene, grazie mille. Come ti chiami? Mi chiamo Giovanni
+        e vorrei imparare una nuova lingua. Dov'è la stazione dei treni? Puoi aiutarmi,
+        per favore? Non capisco. Buongiorno, buonanotte, a più tardi. Il tempo è bello e
+        i bambini stanno giocando nel giardino. Questo è il miglior ristorante della città
+        e hanno il pane più fresco. Ho lavorato lì per tre anni, ed era qualcosa che
+        avremmo dovuto fare con loro. Vuoi un bicchiere d'acqua o una tazza di caffè?
+        Scusi, dov'è il bagno? Grazie per il tuo aiuto, buona giornata. Arrivederci.
+        Vorrei prenotare un tavolo per due persone stasera. Quanto costa questo? Potrebbe
+        indicarmi la strada per l'ospedale, l'aeroporto o la farmacia più vicina?
+        Cerchiamo un albergo economico vicino alla spiaggia con una camera per la nostra
+        famiglia. La riunione comincia alle nove, quindi non arrivare di nuovo in ritardo.
+        Quale autobus va al museo? Il mio telefono è rotto e devo chiamare mio fratello
+        prima che parta. Tutti sanno che leggere ogni giorno rende l'apprendimento molto
+        più facile.
+    """,
+    "pt": """
+        Olá, como você está hoje? Estou bem, muito obrigado. Como você se chama? Eu me
+        chamo João e gostaria de aprender uma nova língua. Onde fica a estação de trem?
+        Você pode me ajudar, por favor? Não entendo. Bom dia, boa noite, até logo. O
+        tempo está agradável e as crianças estão brincando no jardim. Este é o melhor
+        restaurante da cidade e eles têm o pão mais fresco. Eu trabalhei lá durante três
+        anos, e era algo que nós deveríamos ter feito com eles. Você quer um copo de
+        água ou uma xícara de café? Com licença, onde fica o banheiro? Obrigado pela sua
+        ajuda, tenha um bom dia. Não sei se ele já chegou em casa.
+        Eu gostaria de reservar uma mesa para duas pessoas hoje à noite. Quanto custa
+        isto? Poderia me dizer o caminho para o hospital, o aeroporto ou a farmácia mais
+        próxima? Estamos procurando um hotel barato perto da praia com um quarto para a
+        nossa família. A reunião começa às nove horas, então não se atrase outra vez.
+        Qual ônibus vai para o museu? Meu telefone está quebrado e preciso ligar para o
+        meu irmão antes que ele saia. Todo mundo sabe que ler todos os dias torna o
+        aprendizado muito mais fácil.
+    """,
+}
+
+_profiles = None  # code -> (trigram log-probabilities, log-probability of an unseen trigram)
+
+def char_script(char):
+    """Script name for one character, or None for digits, punctuation and spaces"""
+    point = ord(char)
+    for first, last, script in SCRIPT_RANGES:
+        if first <= point <= last:
+            if script == "latin" and not char.isalpha():
+                return None
+            return script
+    return None
+
+def detect_script(text):
+    """Counter of scripts used by the letters in text"""
+    return Counter(script for script in map(char_script, text) if script)
+
+def _normalize(text):
+    text = unicodedata.normalize("NFC", text.lower())
+    return " " + re.sub(r"[^\w']+|\d+|_", " ", text).strip() + " "
+
+def trigrams(text):
+    """Character trigrams of the normalized text, word boundaries included"""
+    text = _normalize(text)
+    return [text[i:i + 3] for i in range(len(text) - 2) if text[i:i + 3].strip()]
+
+def _build_profiles():
+    global _profiles
+    if _profiles is None:
+        profiles = {}
+        for code, sample in SAMPLE_TEXT.items():
+            counts = Counter(trigrams(sample))
+            total = sum(counts.values())
+            vocabulary = len(counts) + 1
+            # Add-one smoothing so unseen trigrams are unlikely rather than impossible
+            profiles[code] = ({gram: math.log((count + 1) / (total + vocabulary)) for gram, count in counts.items()},
+                              math.log(1 / (total + vocabulary)))
+        _profiles = profiles
+    return _profiles
+
+def _profile_fit(text, code):
+    """Share of the text's trigrams that occur in a language's profile"""
+    grams = trigrams(text)
+    table = _build_profiles()[code][0]
+    return sum(1 for gram in grams if gram in table) / len(grams) if grams else 0.0
+
+def _markers(text):
+    """Letters and whole words of text, for matching SHARED_SCRIPTS markers"""
+    return set(text) | {word.strip(".,!?;:'\"()।॥؟،") for word in text.split()}
+
+def _latin_scores(text, candidates=None):
+    """Posterior probability for each Latin-script language"""
+    grams = trigrams(text)
+    profiles = _build_profiles()
+    codes = [code for code in profiles if candidates is None or code in candidates]
+    if not grams or not codes:
+        return {}
+    log_scores = {}
+    for code in codes:
+        table, unseen = profiles[code]
+        log_scores[code] = sum(table.get(gram, unseen) for gram in grams)
+    best = max(log_scores.values())
+    weights = {code: math.exp(score - best) for code, score in log_scores.items()}
+    total = sum(weights.values())
+    return {code: weight / total for code, weight in weights.items()}
+
+def detect_language(text, candidates=None):
+    """Best guess at the language of text as (code, confidence).
+    Returns (None, 0.0) when there are too few letters to tell, or when the text
+    reads like none of the Latin-script languages the profiles know"""
+    scripts = detect_script(text or "")
+    letters = sum(scripts.values())
+    if letters < MIN_LETTERS:
+        return None, 0.0
+    script, count = scripts.most_common(1)[0]
+    share = count / letters
+    
+    if script in ("han", "kana"):
+        # Japanese mixes kanji with kana; text with no kana at all is Chinese
+        share = (scripts.get("han", 0) + scripts.get("kana", 0)) / letters
+        if scripts.get("kana"):
+            return "ja", share
+        return "zh", share * min(1.0, letters / HAN_EVIDENCE_LETTERS)
+    if script in SCRIPT_LANGUAGES:
+        return SCRIPT_LANGUAGES[script], share
+    if script == "arabic" and any(char in URDU_LETTERS for char in text):
+        return "ur", share
+    if script in SHARED_SCRIPTS:
+        code, own, others = SHARED_SCRIPTS[script]
+        found = _markers(text)
+        if found & own and not found & others:
+            return code, share
+        return code, share * SHARED_SCRIPT_DOUBT
+    if script == "latin":
+        scores = _latin_scores(text, candidates)
+        if not scores:
+            return None, 0.0
+        code = max(scores, key=scores.get)
+        if _profile_fit(text, code) < MIN_PROFILE_FIT:
+            return None, 0.0
+        # Short inputs get their confidence scaled down
+        confidence = scores[code] * share * min(1.0, letters / LATIN_EVIDENCE_LETTERS)
+        return code, confidence
+    return None, 0.0
+
+def is_language(text, code, min_confidence=0.8):
+    """True when text is confidently detected as the given language"""
+    detected, confidence = detect_language(text)
+    return detected == code and confidence >= min_confidence
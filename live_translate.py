@@ -0,0 +1,101 @@
+"""
+Translate-as-you-type for Language Buddy
+Text is split into sentences so that, while the user keeps typing, only the
+sentence being edited goes to a provider - finished sentences come straight
+from the translation cache. At most one request runs at a time: keystrokes
+that arrive meanwhile replace each other, and a result whose input has
+changed since it was requested is dropped instead of shown
+"""
+
+import re
+import threading
+
+SEGMENT_END = re.compile(r'(?<=[.!?。！？])\s+|\s*\n\s*')
+
+def split_segments(text):
+    """[(sentence, separator)] where joining every sentence + separator gives back text.
+    Leading whitespace is kept as a separator-only entry"""
+    segments = []
+    position = 0
+    for match in SEGMENT_END.finditer(text):
+        segments.append((text[position:match.start()], match.group()))
+        position = match.end()
+    segments.append((text[position:], ""))
+    return segments
+
+def translate_segments(text, translate, is_stale=None):
+    """Translate text one sentence at a time with translate(sentence), keeping the
+    original spacing between sentences. Returns None as soon as is_stale() is true"""
+    parts = []
+    for sentence, separator in split_segments(text):
+        if is_stale and is_stale():
+            return None
+        if sentence.strip():
+            translation = translate(sentence)
+            if translation.startswith("⚠️"):
+                return translation  # a provider error for any sentence is shown as is
+            parts.append(translation)
+        parts.append(separator)
+    return "".join(parts)
+
+class LiveTranslator:
+    def __init__(self, translate, deliver):
+        self.translate = translate  # callable(text, target, is_stale) -> translation or None
+        self.deliver = deliver      # callable(text, target, translation), called on the worker thread
+        self.lock = threading.Lock()
+        self.latest = None          # (text, target) typed most recently
+        self.version = 0            # bumped on every submit/cancel
+        self.running = False
+        self.submitted = 0
+        self.started = 0
+        self.dropped = 0            # finished after the input had already changed
+    
+    def submit(self, text, target):
+        """Translate text into target, superseding anything requested earlier"""
+        with self.lock:
+            self.latest = (text, target)
+            self.version += 1
+            self.submitted += 1
+            if self.running:
+                return  # the worker picks up the newest text when its request finishes
+            self.running = True
+        threading.Thread(target=self._run, name="live-translate", daemon=True).start()
+    
+    def cancel(self):
+        """Forget the pending text; a request already in flight is dropped when it returns"""
+        with self.lock:
+            self.latest = None
+            self.version += 1
+    
+    def _run(self):
+        done_version = None
+        while True:
+            with self.lock:
+                request, version = self.latest, self.version
+                if request is None or version == done_version:
+                    self.running = False
+                    return
+                self.started += 1
+            text, target = request
+            is_stale = lambda: self.version != version
+            try:
+                translation = self.translate(text, target, is_stale)
+            except Exception as e:
+                print(f"Live translation error: {e}")
+                translation = None
+            done_version = version
+            if translation is None or is_stale():
+                with self.lock:
+                    self.dropped += 1
+                continue
+            self.deliver(text, target, translation)
+    
+    def stats(self):
+        """Summary numbers for diagnostics"""
+        with self.lock:
+            return {
+                "submitted": self.submitted,
+                "started": self.started,
+                "dropped": self.dropped,
+                "skipped": self.submitted - self.started,
+            }
@@ -0,0 +1,368 @@
+"""
+Markup-aware translation for Language Buddy
+HTML and Markdown documents are split into markup, which is kept exactly as
+written, and text nodes, which are the only parts sent for translation. Tags,
+attributes, code blocks, inline code and link targets never reach a provider,
+so they can't be mangled and don't use up quota. Text nodes are sent a batch
+at a time, one node per line, and the translations are put back into the
+original document
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+
+MAX_BATCH_CHARS = 4500  # stays under the 5000 characters most free services accept per request
+
+class TextNode:
+    """Translatable text: raw is how it appears in the document, text is what gets sent"""
+    __slots__ = ("raw", "text", "escape")
+    
+    def __init__(self, raw, text, escape=None):
+        self.raw = raw
+        self.text = text
+        self.escape = escape    # turns a translation back into document syntax
+    
+    def __repr__(self):
+        return f"TextNode({self.text!r})"
+
+def _add_markup(parts, raw):
+    if not raw:
+        return
+    if parts and isinstance(parts[-1], str):
+        parts[-1] += raw
+    else:
+        parts.append(raw)
+
+def _add_text(parts, raw, prepare=None, escape=None):
+    """Add raw as a text node, keeping its surrounding whitespace as markup.
+    Text without any letters (numbers, punctuation, symbols) stays as it is"""
+    core = raw.strip()
+    text = prepare(core) if prepare else core
+    if not any(char.isalpha() for char in text):
+        _add_markup(parts, raw)
+        return
+    start = len(raw) - len(raw.lstrip())
+    _add_markup(parts, raw[:start])
+    parts.append(TextNode(core, text, escape))
+    _add_markup(parts, raw[start + len(core):])
+
+# HTML
+
+# Elements whose content is code or data rather than prose
+HTML_SKIP_ELEMENTS = {"script", "style", "code", "pre", "kbd", "samp", "var", "textarea", "svg", "math"}
+HTML_VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+                      "param", "source", "track", "wbr"}
+HTML_TEXT_ATTRIBUTES = re.compile(r"""(\s(?:alt|title|placeholder|aria-label)\s*=\s*)("[^"]*"|'[^']*')""",
+                                  re.IGNORECASE)
+
+def _html_text(raw):
+    return " ".join(html.unescape(raw).split())
+
+def _html_escape(text):
+    return html.escape(text, quote=False)
+
+def _html_attribute_escape(text):
+    return html.escape(text, quote=True)
+
+class _HTMLEvents(HTMLParser):
+    """Records where each parser event starts and whether it is translatable text"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=False)  # entities stay separate so offsets match the source
+        self.events = []    # (line, column, kind, start tag text)
+        self.open = []      # (tag, skipped) for elements that haven't been closed
+        self.skipping = 0
+    
+    def _event(self, kind, tag_text=None):
+        line, column = self.getpos()
+        if kind == "text" and self.skipping:
+            kind = "markup"
+        self.events.append((line, column, kind, tag_text))
+    
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        skip = (tag in HTML_SKIP_ELEMENTS or (attributes.get("translate") or "").lower() == "no"
+                or "notranslate" in (attributes.get("class") or "").split())
+        self._event("markup" if self.skipping or skip else "tag", self.get_starttag_text())
+        if tag not in HTML_VOID_ELEMENTS:
+            self.open.append((tag, skip))
+            self.skipping += skip
+    
+    def handle_startendtag(self, tag, attrs):
+        self._event("markup" if self.skipping else "tag", self.get_starttag_text())
+    
+    def handle_endtag(self, tag):
+        self._event("markup")
+        if any(name == tag for name, _ in self.open):
+            while self.open:
+                name, skip = self.open.pop()
+                self.skipping -= skip
+                if name == tag:
+                    break
+    
+    def handle_data(self, data):
+        self._event("text")
+    
+    def handle_entityref(self, name):
+        self._event("text")
+    
+    def handle_charref(self, name):
+        self._event("text")
+    
+    def handle_comment(self, data):
+        self._event("markup")
+    
+    def handle_decl(self, decl):
+        self._event("markup")
+    
+    def handle_pi(self, data):
+        self._event("markup")
+    
+    def unknown_decl(self, data):
+        self._event("markup")
+
+def segment_html(source):
+    """Split an HTML document into markup strings and TextNodes; joining every raw part gives back source.
+    Text inside code, scripts and elements marked translate="no" is left alone, while alt, title,
+    placeholder and aria-label attribute values are translated"""
+    parser = _HTMLEvents()
+    parser.feed(source)
+    parser.close()
+    
+    line_starts = [0]
+    line_starts.extend(index + 1 for index, char in enumerate(source) if char == "\n")
+    offsets = [(line_starts[line - 1] + column, kind, tag_text) for line, column, kind, tag_text in parser.events]
+    
+    parts = []
+    position = 0
+    text_start = None
+    for index, (offset, kind, tag_text) in enumerate(offsets):
+        end = offsets[index + 1][0] if index + 1 < len(offsets) else len(source)
+        if kind == "text":
+            # Runs of data and entity references make up one text node
+            if text_start is None:
+                text_start = offset
+            continue
+        if text_start is not None:
+            _add_text(parts, source[text_start:offset], _html_text, _html_escape)
+            text_start = None
+        elif position < offset:
+            _add_markup(parts, source[position:offset])
+        if kind == "tag":
+            tag_end = offset + len(tag_text)
+            tag_position = 0
+            for match in HTML_TEXT_ATTRIBUTES.finditer(tag_text):
+                value = match.group(2)
+                _add_markup(parts, tag_text[tag_position:match.start(2) + 1])
+                _add_text(parts, value[1:-1], html.unescape, _html_attribute_escape)
+                tag_position = match.end(2) - 1
+            _add_markup(parts, tag_text[tag_position:])
+            _add_markup(parts, source[tag_end:end])
+        else:
+            _add_markup(parts, source[offset:end])
+        position = end
+    if text_start is not None:
+        _add_text(parts, source[text_start:], _html_text, _html_escape)
+    elif position < len(source):
+        _add_markup(parts, source[position:])
+    return parts
+
+# Markdown
+
+MARKDOWN_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+MARKDOWN_BLOCK_PREFIX = re.compile(
+    r"^(?: {0,3}>[ \t]?)*"                      # block quotes
+    r"(?:[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+(?:\[[ xX]\][ \t]+)?)?"  # list items and task boxes
+    r"(?: {0,3}#{1,6}[ \t]+)?"                  # headings
+)
+MARKDOWN_LIST_ITEM = re.compile(r"^(?: {0,3}>[ \t]?)*[ \t]*(?:[-*+]|\d{1,9}[.)])[ \t]+")
+MARKDOWN_RAW_LINE = re.compile(
+    r"^ {0,3}(?:([-*_=])(?:[ \t]*\1){2,}[ \t]*"  # rules and heading underlines
+    r"|\[[^\]]+\]:\s.*"                         # link reference definitions
+    r"|\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)+\|?[ \t]*)$"  # table alignment rows
+)
+MARKDOWN_INLINE_MARKUP = re.compile(
+    r"(`+).+?(?<!`)\1(?!`)"                     # inline code
+    r"|!?\["                                    # start of link text or image alt text
+    r"|\](?:\([^)]*\)|\[[^\]]*\])?"             # end of link text and its target
+    r"|<[A-Za-z/!][^>]*>"                       # inline HTML and autolinks
+    r"|\b(?:https?|ftp)://[^\s)>\]]+"           # bare URLs
+    r"|\|"                                      # table cell borders
+    r"|[ \t]+#+[ \t]*$"                         # closing hashes of a heading
+)
+
+def _markdown_inline(parts, line):
+    position = 0
+    for match in MARKDOWN_INLINE_MARKUP.finditer(line):
+        _add_text(parts, line[position:match.start()])
+        _add_markup(parts, match.group())
+        position = match.end()
+    _add_text(parts, line[position:])
+
+def segment_markdown(source):
+    """Split a Markdown document into markup strings and TextNodes; joining every raw part gives
+    back source. Each line of prose is its own node. Code blocks, inline code, link targets,
+    HTML tags and URLs are left alone"""
+    parts = []
+    fence = None            # opening fence of the code block we're in
+    in_comment = False
+    in_list = False
+    in_indented_code = False
+    previous_blank = True
+    for line in source.splitlines(keepends=True):
+        content = line.rstrip("\r\n")
+        ending = line[len(content):]
+        blank = not content.strip()
+        
+        if fence:
+            _add_markup(parts, line)
+            match = MARKDOWN_FENCE.match(content)
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence) \
+                    and not content.strip().strip(fence[0]):
+                fence = None
+            continue
+        match = MARKDOWN_FENCE.match(content)
+        if match:
+            fence = match.group(1)
+            _add_markup(parts, line)
+            previous_blank = False
+            continue
+        if in_comment:
+            _add_markup(parts, line)
+            in_comment = "-->" not in content
+            continue
+        
+        indented = content.startswith(("    ", "\t"))
+        if indented and not blank and (in_indented_code or (previous_blank and not in_list)):
+            in_indented_code = True
+            _add_markup(parts, line)
+            continue
+        if not blank:
+            in_indented_code = False
+        
+        if blank or MARKDOWN_RAW_LINE.match(content):
+            _add_markup(parts, line)
+        elif content.lstrip().startswith("<"):
+            for part in segment_html(content):
+                if isinstance(part, str):
+                    _add_markup(parts, part)
+                else:
+                    parts.append(part)
+            _add_markup(parts, ending)
+            in_comment = "<!--" in content and "-->" not in content[content.rindex("<!--"):]
+        else:
+            prefix = MARKDOWN_BLOCK_PREFIX.match(content).group()
+            if MARKDOWN_LIST_ITEM.match(content):
+                in_list = True
+            elif not indented:
+                in_list = False
+            _add_markup(parts, prefix)
+            _markdown_inline(parts, content[len(prefix):])
+            _add_markup(parts, ending)
+        previous_blank = blank
+    return parts
+
+FORMATS = {"html": segment_html, "markdown": segment_markdown}
+
+# Translation
+
+class MarkupTranslation:
+    """A translated document plus what it cost to translate"""
+    __slots__ = ("text", "nodes", "batches", "requests", "failed", "error", "document_bytes", "sent_bytes")
+    
+    def __init__(self, text, nodes=0, batches=0, requests=0, failed=0, error=None, document_bytes=0, sent_bytes=0):
+        self.text = text
+        self.nodes = nodes
+        self.batches = batches
+        self.requests = requests
+        self.failed = failed                # nodes left untranslated
+        self.error = error                  # first provider error, if any
+        self.document_bytes = document_bytes
+        self.sent_bytes = sent_bytes        # bytes sent to providers, retries included
+    
+    @property
+    def saved_bytes(self):
+        return self.document_bytes - self.sent_bytes
+    
+    def summary(self):
+        return (f"{self.nodes} text nodes in {self.requests} requests, sent {self.sent_bytes} of "
+                f"{self.document_bytes} bytes ({max(0, self.saved_bytes)} saved)")
+
+def segment(text, markup):
+    """Parts of text for a markup format ("html" or "markdown")"""
+    if markup not in FORMATS:
+        raise ValueError(f"Unknown markup format '{markup}'. Choose from: {', '.join(sorted(FORMATS))}")
+    return FORMATS[markup](text)
+
+def make_batches(texts, max_chars=MAX_BATCH_CHARS):
+    """Group texts so each group joined by newlines stays within max_chars (one long text may exceed it)"""
+    batch = []
+    size = 0
+    for text in texts:
+        if batch and size + 1 + len(text) > max_chars:
+            yield batch
+            batch = []
+            size = 0
+        size += len(text) + (1 if batch else 0)
+        batch.append(text)
+    if batch:
+        yield batch
+
+def rebuild(parts, translations):
+    """Join parts back into a document, with text nodes replaced by translations[node.text] where present"""
+    pieces = []
+    for part in parts:
+        if isinstance(part, str):
+            pieces.append(part)
+            continue
+        translation = translations.get(part.text)
+        if translation is None or translation == part.text:
+            pieces.append(part.raw)  # untouched nodes keep their original spelling and entities
+        else:
+            pieces.append(part.escape(translation) if part.escape else translation)
+    return "".join(pieces)
+
+def translate_markup(text, markup, translate, max_batch_chars=MAX_BATCH_CHARS, is_stale=None):
+    """Translate only the text nodes of an HTML or Markdown document with translate(text).
+    Nodes are sent one per line in batches; a batch that doesn't come back with one line per node
+    is retried a node at a time. Returns a MarkupTranslation, or None once is_stale() is true"""
+    parts = segment(text, markup)
+    nodes = [part.text for part in parts if isinstance(part, TextNode)]
+    result = MarkupTranslation(text, nodes=len(nodes), document_bytes=len(text.encode("utf-8")))
+    
+    def send(request_text):
+        result.requests += 1
+        result.sent_bytes += len(request_text.encode("utf-8"))
+        translation = translate(request_text)
+        if translation.startswith("⚠️"):
+            result.error = result.error or translation
+            return None
+        return translation
+    
+    translations = {}
+    for batch in make_batches(dict.fromkeys(nodes), max_batch_chars):
+        if is_stale and is_stale():
+            return None
+        result.batches += 1
+        translated = send("\n".join(batch))
+        if translated is None:
+            continue  # every provider failed; asking again node by node would fail the same way
+        if len(batch) == 1:
+            translations[batch[0]] = " ".join(translated.split())
+            continue
+        lines = [line.strip() for line in translated.splitlines() if line.strip()]
+        if len(lines) == len(batch):
+            translations.update(zip(batch, lines))
+            continue
+        print(f"Markup batch came back with {len(lines)} lines for {len(batch)} nodes - sending them one by one")
+        for node in batch:
+            if is_stale and is_stale():
+                return None
+            translation = send(node)
+            if translation is not None:
+                translations[node] = " ".join(translation.split())
+    
+    result.failed = sum(1 for node in nodes if node not in translations)
+    result.text = rebuild(parts, translations)
+    return result
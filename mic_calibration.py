@@ -0,0 +1,116 @@
+"""
+Microphone calibration for Language Buddy
+Ambient-noise calibration runs once (and again in the background when it gets
+old) instead of on every recording. The measured energy threshold is saved per
+microphone so the next session can start listening straight away
+"""
+
+import json
+import threading
+import time
+
+MIC_CALIBRATION_FILE = "mic_calibration.json"
+RECALIBRATE_AFTER = 30 * 60  # seconds before a saved threshold is refreshed
+CALIBRATION_SECONDS = 1.0
+
+class MicCalibration:
+    def __init__(self, recognizer, microphone, path=MIC_CALIBRATION_FILE, max_age=RECALIBRATE_AFTER):
+        self.recognizer = recognizer
+        self.microphone = microphone
+        self.path = path
+        self.max_age = max_age
+        self.mic_lock = threading.Lock()  # only one user of the microphone at a time
+        self.mic_key = self.microphone_key(microphone)
+        self.saved = self._load()
+        self.last_duration = None
+        self.timer = None
+    
+    @staticmethod
+    def microphone_key(microphone):
+        """Name that identifies the microphone across sessions"""
+        device_index = getattr(microphone, "device_index", None)
+        try:
+            import speech_recognition as sr
+            names = sr.Microphone.list_microphone_names()
+            if device_index is not None and device_index < len(names):
+                return f"{device_index}:{names[device_index]}"
+        except Exception:
+            pass
+        return "default" if device_index is None else str(device_index)
+    
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.saved, f, indent=1)
+        except OSError as e:
+            print(f"Could not save microphone calibration: {e}")
+    
+    def apply(self):
+        """Load the saved threshold into the recognizer. Returns False if there is none"""
+        entry = self.saved.get(self.mic_key)
+        if not entry:
+            return False
+        self.recognizer.energy_threshold = entry["energy_threshold"]
+        return True
+    
+    def is_stale(self):
+        entry = self.saved.get(self.mic_key)
+        return not entry or time.time() - entry.get("calibrated_at", 0) > self.max_age
+    
+    def calibrate(self, duration=CALIBRATION_SECONDS, wait=True):
+        """Measure ambient noise and store the threshold. Returns the time taken, or None if the mic was busy"""
+        if not self.mic_lock.acquire(blocking=wait):
+            return None
+        try:
+            start = time.perf_counter()
+            with self.microphone as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=duration)
+            self.last_duration = time.perf_counter() - start
+        finally:
+            self.mic_lock.release()
+        
+        self.remember(self.recognizer.energy_threshold, calibrated=True)
+        print(f"Microphone calibrated in {self.last_duration:.2f}s "
+              f"(energy threshold {self.recognizer.energy_threshold:.0f})")
+        return self.last_duration
+    
+    def remember(self, energy_threshold, calibrated=False):
+        """Persist a threshold, e.g. the one the recognizer adapted to while listening"""
+        entry = self.saved.get(self.mic_key)
+        if not calibrated and entry and abs(entry["energy_threshold"] - energy_threshold) < 0.1 * entry["energy_threshold"]:
+            return  # not worth a disk write
+        self.saved[self.mic_key] = {
+            "energy_threshold": energy_threshold,
+            "calibrated_at": time.time() if calibrated or not entry else entry.get("calibrated_at", 0),
+        }
+        self._save()
+    
+    def calibrate_in_background(self):
+        """Calibrate on a daemon thread; recording isn't blocked unless it starts mid-calibration"""
+        def run():
+            try:
+                self.calibrate(wait=False)
+            except Exception as e:
+                print(f"Microphone calibration error: {e}")
+        threading.Thread(target=run, name="mic-calibration", daemon=True).start()
+    
+    def start_periodic(self, is_busy):
+        """Recalibrate in the background whenever the saved threshold gets old and the mic is idle"""
+        def check():
+            if self.is_stale() and not is_busy():
+                self.calibrate_in_background()
+            self.start_periodic(is_busy)
+        self.timer = threading.Timer(min(self.max_age, 60), check)
+        self.timer.daemon = True
+        self.timer.start()
+    
+    def stop(self):
+        if self.timer:
+            self.timer.cancel()
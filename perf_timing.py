@@ -0,0 +1,88 @@
+"""
+Timing helpers for Language Buddy
+Measures how long each stage of a request takes so slow steps are easy to spot
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []  # (name, seconds) in the order they ran
+        self.started = time.perf_counter()
+    
+    @contextmanager
+    def stage(self, name):
+        """Time the body of a with-block as one named stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+    
+    def record(self, name, seconds):
+        """Add a stage that was timed elsewhere"""
+        self.stages.append((name, seconds))
+    
+    def total(self):
+        return time.perf_counter() - self.started
+    
+    def as_dict(self):
+        return {name: seconds for name, seconds in self.stages}
+    
+    def summary(self):
+        """One line like 'capture 2.31s | recognition 0.84s'"""
+        return " | ".join(f"{name} {seconds:.2f}s" for name, seconds in self.stages)
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers (None when empty)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceiling without floats
+    return ordered[int(rank) - 1]
+
+class LatencyStats:
+    """Rolling per-stage latency samples for p50/p95 reporting.
+    Safe to update from several threads at once"""
+    
+    def __init__(self, window=500):
+        self.window = window
+        self.samples = {}  # stage -> deque of seconds, in the order stages first appeared
+        self.lock = threading.Lock()
+    
+    def add(self, stage, seconds):
+        with self.lock:
+            if stage not in self.samples:
+                self.samples[stage] = deque(maxlen=self.window)
+            self.samples[stage].append(seconds)
+    
+    def add_timer(self, timer):
+        """Fold every stage of a finished StageTimer into the stats"""
+        for name, seconds in timer.stages:
+            self.add(name, seconds)
+    
+    def percentile(self, stage, pct):
+        with self.lock:
+            samples = list(self.samples.get(stage, ()))
+        return percentile(samples, pct)
+    
+    def count(self, stage):
+        with self.lock:
+            return len(self.samples.get(stage, ()))
+    
+    def report(self):
+        """{stage: {"count", "p50", "p95"}} for every stage seen so far"""
+        with self.lock:
+            snapshot = {stage: list(samples) for stage, samples in self.samples.items()}
+        return {
+            stage: {"count": len(samples), "p50": percentile(samples, 50), "p95": percentile(samples, 95)}
+            for stage, samples in snapshot.items()
+        }
+    
+    def summary(self):
+        """One line like 'recognition p50 0.81s p95 1.40s | translation p50 0.22s p95 0.35s'"""
+        return " | ".join(f"{stage} p50 {row['p50']:.2f}s p95 {row['p95']:.2f}s"
+                          for stage, row in self.report().items())
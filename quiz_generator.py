@@ -0,0 +1,97 @@
+"""
+Quiz generation for Language Buddy learning mode
+Builds multiple-choice questions from a language's vocabulary. Distractors
+are drawn from indexes prepared once per language (same part of speech and
+topic, same part of speech, similar length) so each question only costs a few
+dictionary lookups and a small random sample
+"""
+
+import random
+
+# Question directions
+TO_ENGLISH = "to_english"       # "What does 'Hola' mean in English?"
+FROM_ENGLISH = "from_english"   # "How do you say 'Hello' in Spanish?"
+
+class QuizQuestion:
+    __slots__ = ("word", "prompt", "answer", "options", "direction")
+    
+    def __init__(self, word, prompt, answer, options, direction):
+        self.word = word            # the VocabWord being tested
+        self.prompt = prompt
+        self.answer = answer
+        self.options = options      # shuffled, answer included
+        self.direction = direction
+    
+    def is_correct(self, choice):
+        return choice == self.answer
+    
+    def __repr__(self):
+        return f"QuizQuestion({self.prompt!r}, options={self.options!r})"
+
+def _length_bucket(text):
+    return min(len(text) // 4, 6)
+
+class QuizGenerator:
+    def __init__(self, vocabulary, rng=None):
+        self.vocabulary = vocabulary
+        self.rng = rng or random.Random()
+        self.by_pos_topic = {}
+        self.by_pos = {}
+        self.by_length = {}
+        for word in vocabulary.words:
+            self.by_pos_topic.setdefault((word.pos, word.topic), []).append(word)
+            self.by_pos.setdefault(word.pos, []).append(word)
+            self.by_length.setdefault(_length_bucket(word.english), []).append(word)
+    
+    def distractors(self, word, count=2, direction=TO_ENGLISH):
+        """count plausible wrong answers for word, closest matches first"""
+        answer = self._answer(word, direction)
+        chosen = []
+        seen = {answer.lower()}
+        pools = (
+            self.by_pos_topic.get((word.pos, word.topic), []),
+            self.by_pos.get(word.pos, []),
+            self.by_length.get(_length_bucket(word.english), []),
+            self.vocabulary.words,
+        )
+        for pool in pools:
+            if len(chosen) == count:
+                break
+            # Sample a little more than needed so duplicates don't force a rescan
+            for other in self.rng.sample(pool, min(len(pool), (count - len(chosen)) * 3 + 1)):
+                option = self._answer(other, direction)
+                # Words that share a spelling (French 'Bonjour' is hello and good morning) would be ambiguous
+                if option.lower() in seen or other.word == word.word or other.english == word.english:
+                    continue
+                chosen.append(option)
+                seen.add(option.lower())
+                if len(chosen) == count:
+                    break
+        return chosen
+    
+    def question(self, word, choices=3, direction=TO_ENGLISH, language_name=None):
+        """Multiple-choice question about one word"""
+        answer = self._answer(word, direction)
+        options = [answer] + self.distractors(word, choices - 1, direction)
+        self.rng.shuffle(options)
+        if direction == TO_ENGLISH:
+            prompt = f"What does '{word.word}' mean in English?"
+        else:
+            prompt = f"How do you say '{word.english}' in {language_name or self.vocabulary.name}?"
+        return QuizQuestion(word, prompt, answer, options, direction)
+    
+    def drill(self, count, words=None, choices=4, mixed=False):
+        """A batch of questions for timed drills, cycling through words (default: the most frequent ones)"""
+        pool = list(words) if words is not None else self.vocabulary.ranked(0, count)
+        if not pool:
+            return []
+        questions = []
+        for index in range(count):
+            word = pool[index % len(pool)]
+            direction = self.rng.choice((TO_ENGLISH, FROM_ENGLISH)) if mixed else TO_ENGLISH
+            questions.append(self.question(word, choices, direction))
+        return questions
+    
+    @staticmethod
+    def _answer(word, direction):
+        return word.english if direction == TO_ENGLISH else word.word
@@ -0,0 +1,193 @@
+"""
+Spaced repetition for Language Buddy learning mode
+Each word a learner has seen becomes a card that is rescheduled with the SM-2
+algorithm after every quiz answer. Cards are stored in SQLite one row at a
+time, and the cards waiting for review are kept in an in-memory heap per
+language so the next due card is found in O(log n)
+"""
+
+import heapq
+import sqlite3
+import threading
+import time
+
+PROGRESS_DB_FILE = "learning_progress.db"
+DEFAULT_PROFILE = "default"
+DAY = 24 * 60 * 60
+
+MIN_EASE = 1.3
+START_EASE = 2.5
+
+class Card:
+    __slots__ = ("word_id", "repetitions", "interval", "ease", "due", "lapses", "reviewed_at")
+    
+    def __init__(self, word_id, repetitions=0, interval=0.0, ease=START_EASE, due=0.0, lapses=0, reviewed_at=None):
+        self.word_id = word_id
+        self.repetitions = repetitions  # correct answers in a row
+        self.interval = interval        # days until the next review
+        self.ease = ease
+        self.due = due                  # epoch seconds
+        self.lapses = lapses            # times the word was forgotten
+        self.reviewed_at = reviewed_at
+    
+    def __repr__(self):
+        return f"Card({self.word_id!r}, interval={self.interval:g}d, ease={self.ease:.2f})"
+
+def sm2(card, quality, now=None):
+    """Reschedule a card after an answer graded 0 (blackout) to 5 (perfect).
+    Updates the card in place and returns it"""
+    now = time.time() if now is None else now
+    quality = max(0, min(5, int(quality)))
+    if quality < 3:
+        if card.repetitions:
+            card.lapses += 1
+        card.repetitions = 0
+        card.interval = 1
+    else:
+        card.repetitions += 1
+        if card.repetitions == 1:
+            card.interval = 1
+        elif card.repetitions == 2:
+            card.interval = 6
+        else:
+            card.interval = round(card.interval * card.ease, 1)
+    card.ease = max(MIN_EASE, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    card.due = now + card.interval * DAY
+    card.reviewed_at = now
+    return card
+
+class SpacedRepetition:
+    def __init__(self, db_path=PROGRESS_DB_FILE, profile=DEFAULT_PROFILE):
+        self.db_path = db_path
+        self.profile = profile
+        self.lock = threading.Lock()
+        self.queues = {}    # language -> heap of (due, word_id); stale entries are skipped
+        self.due_at = {}    # language -> {word_id: current due}, the truth the heap is checked against
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS cards ("
+                " profile TEXT NOT NULL,"
+                " language TEXT NOT NULL,"
+                " word_id TEXT NOT NULL,"
+                " repetitions INTEGER NOT NULL DEFAULT 0,"
+                " interval REAL NOT NULL DEFAULT 0,"
+                " ease REAL NOT NULL DEFAULT 2.5,"
+                " due REAL NOT NULL,"
+                " lapses INTEGER NOT NULL DEFAULT 0,"
+                " reviewed_at REAL,"
+                " PRIMARY KEY (profile, language, word_id))"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cards_due ON cards (profile, language, due)"
+            )
+            self.conn.commit()
+    
+    def _queue(self, language):
+        """Due heap for a language, built from the database the first time it is needed"""
+        if language not in self.queues:
+            rows = self.conn.execute(
+                "SELECT word_id, due FROM cards WHERE profile = ? AND language = ?",
+                (self.profile, language)
+            ).fetchall()
+            self.due_at[language] = {word_id: due for word_id, due in rows}
+            heap = [(due, word_id) for word_id, due in rows]
+            heapq.heapify(heap)
+            self.queues[language] = heap
+        return self.queues[language]
+    
+    def _push(self, language, word_id, due):
+        heap = self._queue(language)
+        current = self.due_at[language]
+        current[word_id] = due
+        heapq.heappush(heap, (due, word_id))
+        if len(heap) > 2 * len(current) + 64:
+            # Too many superseded entries - rebuild from the live due times
+            heap[:] = [(when, card_id) for card_id, when in current.items()]
+            heapq.heapify(heap)
+    
+    def introduce(self, language, word_ids, now=None):
+        """Start tracking new words; they are due straight away. Known words are left alone"""
+        now = time.time() if now is None else now
+        with self.lock:
+            self._queue(language)
+            known = self.due_at[language]
+            new_ids = [word_id for word_id in dict.fromkeys(word_ids) if word_id not in known]
+            if not new_ids:
+                return 0
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO cards (profile, language, word_id, due) VALUES (?, ?, ?, ?)",
+                [(self.profile, language, word_id, now) for word_id in new_ids]
+            )
+            self.conn.commit()
+            for word_id in new_ids:
+                self._push(language, word_id, now)
+            return len(new_ids)
+    
+    def next_due(self, language, count=1, now=None):
+        """Up to count word ids that are due, most overdue first"""
+        now = time.time() if now is None else now
+        with self.lock:
+            heap = self._queue(language)
+            current = self.due_at[language]
+            picked = []
+            while heap and len(picked) < count:
+                due, word_id = heap[0]
+                if current.get(word_id) != due:
+                    heapq.heappop(heap)  # superseded by a later review
+                    continue
+                if due > now:
+                    break
+                picked.append(heapq.heappop(heap))
+            for entry in picked:
+                heapq.heappush(heap, entry)
+            return [word_id for _, word_id in picked]
+    
+    def get(self, language, word_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT word_id, repetitions, interval, ease, due, lapses, reviewed_at FROM cards"
+                " WHERE profile = ? AND language = ? AND word_id = ?",
+                (self.profile, language, word_id)
+            ).fetchone()
+        return Card(*row) if row else None
+    
+    def review(self, language, word_id, quality, now=None):
+        """Grade one answer, reschedule the card and save just that card"""
+        card = self.get(language, word_id) or Card(word_id)
+        sm2(card, quality, now)
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO cards (profile, language, word_id, repetitions, interval, ease, due, lapses, reviewed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (profile, language, word_id) DO UPDATE SET"
+                " repetitions = excluded.repetitions, interval = excluded.interval, ease = excluded.ease,"
+                " due = excluded.due, lapses = excluded.lapses, reviewed_at = excluded.reviewed_at",
+                (self.profile, language, word_id, card.repetitions, card.interval, card.ease,
+                 card.due, card.lapses, card.reviewed_at)
+            )
+            self.conn.commit()
+            self._push(language, word_id, card.due)
+        return card
+    
+    def due_count(self, language, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM cards WHERE profile = ? AND language = ? AND due <= ?",
+                (self.profile, language, now)
+            ).fetchone()[0]
+    
+    def stats(self, language):
+        """{"cards", "learned"} where learned means answered correctly at least once in a row"""
+        with self.lock:
+            cards, learned = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(repetitions > 0), 0) FROM cards WHERE profile = ? AND language = ?",
+                (self.profile, language)
+            ).fetchone()
+        return {"cards": cards, "learned": learned}
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self.lock:
+            self.conn.close()
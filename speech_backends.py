@@ -0,0 +1,204 @@
+"""
+Speech recognition backends for Language Buddy
+Every backend turns captured audio into English text behind the same
+recognize(audio) call, so the speech screens don't care which engine runs.
+The backend is chosen per deployment with the LANGUAGE_BUDDY_ASR environment
+variable: a single name ("google", "sphinx", "whisper", "faster_whisper",
+"vosk", "stub") or a fallback chain such as "google,sphinx"
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+
+try:
+    import speech_recognition as sr
+    speech_recognition_available = True
+    UnknownValueError = sr.UnknownValueError
+    RequestError = sr.RequestError
+except ImportError:
+    sr = None
+    speech_recognition_available = False
+    
+    class UnknownValueError(Exception):
+        pass
+    
+    class RequestError(Exception):
+        pass
+
+ASR_ENV_VAR = "LANGUAGE_BUDDY_ASR"
+DEFAULT_BACKEND = "google"
+
+def _module_installed(name):
+    return importlib.util.find_spec(name) is not None
+
+class RecognizerBackend:
+    name = "base"
+    offline = False
+    
+    def __init__(self, recognizer=None):
+        if recognizer is None and speech_recognition_available:
+            recognizer = sr.Recognizer()
+        self.recognizer = recognizer
+    
+    def is_available(self):
+        return speech_recognition_available
+    
+    def recognize(self, audio):
+        """Return the text spoken in an sr.AudioData clip"""
+        raise NotImplementedError
+    
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API - accurate, but needs a network round-trip per utterance"""
+    name = "google"
+    
+    def __init__(self, recognizer=None, language="en-US"):
+        super().__init__(recognizer)
+        self.language = language
+    
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio, language=self.language)
+
+class SphinxBackend(RecognizerBackend):
+    """CMU PocketSphinx - fully local and fast, less accurate"""
+    name = "sphinx"
+    offline = True
+    
+    def __init__(self, recognizer=None, language="en-US"):
+        super().__init__(recognizer)
+        self.language = language
+    
+    def is_available(self):
+        return speech_recognition_available and _module_installed("pocketsphinx")
+    
+    def recognize(self, audio):
+        return self.recognizer.recognize_sphinx(audio, language=self.language)
+
+class WhisperBackend(RecognizerBackend):
+    """OpenAI Whisper running locally - accurate, heavier on CPU"""
+    name = "whisper"
+    offline = True
+    
+    def __init__(self, recognizer=None, model="base", language="english"):
+        super().__init__(recognizer)
+        self.model = model
+        self.language = language
+    
+    def is_available(self):
+        return speech_recognition_available and _module_installed("whisper")
+    
+    def recognize(self, audio):
+        text = self.recognizer.recognize_whisper(audio, model=self.model, language=self.language)
+        if not text.strip():
+            raise UnknownValueError()
+        return text.strip()
+
+class FasterWhisperBackend(WhisperBackend):
+    """Whisper through CTranslate2 - same models, lower latency on CPU"""
+    name = "faster_whisper"
+    
+    def is_available(self):
+        return speech_recognition_available and _module_installed("faster_whisper")
+    
+    def recognize(self, audio):
+        text = self.recognizer.recognize_faster_whisper(audio, model=self.model, language="en")
+        if not text.strip():
+            raise UnknownValueError()
+        return text.strip()
+
+class VoskBackend(RecognizerBackend):
+    """Vosk (Kaldi) - small local models, very low latency. Expects a model in ./model"""
+    name = "vosk"
+    offline = True
+    
+    def is_available(self):
+        return speech_recognition_available and _module_installed("vosk") and os.path.isdir("model")
+    
+    def recognize(self, audio):
+        result = self.recognizer.recognize_vosk(audio)
+        if isinstance(result, str) and result.lstrip().startswith("{"):
+            result = json.loads(result).get("text", "")  # older speech_recognition versions return JSON
+        elif isinstance(result, dict):
+            result = result.get("text", "")
+        if not result or not result.strip():
+            raise UnknownValueError()
+        return result.strip()
+
+class StubBackend(RecognizerBackend):
+    """Deterministic recognizer for tests and demos - no audio processing at all"""
+    name = "stub"
+    offline = True
+    
+    def __init__(self, recognizer=None, transcripts=None, default_text="Hello"):
+        super().__init__(recognizer)
+        self.transcripts = transcripts or {}  # sha1 of raw audio -> text
+        self.default_text = default_text
+        self.calls = 0
+    
+    def is_available(self):
+        return True
+    
+    @staticmethod
+    def audio_key(audio):
+        raw = audio.get_raw_data() if hasattr(audio, "get_raw_data") else bytes(audio)
+        return hashlib.sha1(raw).hexdigest()
+    
+    def recognize(self, audio):
+        self.calls += 1
+        raw = audio.get_raw_data() if hasattr(audio, "get_raw_data") else bytes(audio)
+        if not raw.strip(b"\x00"):
+            raise UnknownValueError()  # pure silence
+        return self.transcripts.get(hashlib.sha1(raw).hexdigest(), self.default_text)
+
+class FallbackBackend(RecognizerBackend):
+    """Tries backends in order, moving on when one can't be reached"""
+    name = "fallback"
+    
+    def __init__(self, backends):
+        super().__init__(backends[0].recognizer if backends else None)
+        self.backends = backends
+        self.offline = any(backend.offline for backend in backends)
+    
+    def recognize(self, audio):
+        last_error = None
+        for backend in self.backends:
+            try:
+                return backend.recognize(audio)
+            except RequestError as e:
+                print(f"{backend.name} recognizer unavailable: {e}")
+                last_error = e
+        raise last_error or RequestError("no speech recognition backend available")
+    
+    def __repr__(self):
+        return f"FallbackBackend({', '.join(backend.name for backend in self.backends)})"
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (GoogleBackend, SphinxBackend, WhisperBackend, FasterWhisperBackend, VoskBackend, StubBackend)
+}
+
+def create_backend(spec=None, recognizer=None):
+    """Build the backend named by spec (or $LANGUAGE_BUDDY_ASR), skipping engines that aren't installed"""
+    spec = spec or os.environ.get(ASR_ENV_VAR) or DEFAULT_BACKEND
+    backends = []
+    for name in (part.strip().lower() for part in spec.split(",")):
+        if not name:
+            continue
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown speech recognition backend '{name}'. "
+                             f"Choose from: {', '.join(sorted(BACKENDS))}")
+        backend = BACKENDS[name](recognizer)
+        if backend.is_available():
+            backends.append(backend)
+        else:
+            print(f"Speech recognition backend '{name}' is not installed - skipping")
+    
+    if not backends:
+        backends = [GoogleBackend(recognizer)]
+    if len(backends) == 1:
+        return backends[0]
+    return FallbackBackend(backends)
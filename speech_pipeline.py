@@ -0,0 +1,147 @@
+"""
+Pipelined voice-to-voice translation for Language Buddy
+Captured speech flows through recognize -> translate -> speak as separate
+stages connected by queues, so the first sentence can already be playing
+while later ones are still being recognized and translated. Every hand-off
+is timed into LatencyStats for p50/p95 reporting
+"""
+
+import queue
+import re
+import threading
+import time
+
+from continuous_speech import OrderedResults
+from perf_timing import LatencyStats
+from speech_backends import UnknownValueError
+
+SENTENCE_END = re.compile(r'(?<=[.!?。！？])\s+')
+
+def split_sentences(text):
+    """Split recognized text into sentences so each can move on by itself"""
+    return [sentence.strip() for sentence in SENTENCE_END.split(text or "") if sentence.strip()]
+
+class PipelineSentence:
+    def __init__(self, text=None, captured_at=None, error=None):
+        self.text = text
+        self.translation = None
+        self.error = error
+        self.captured_at = captured_at      # perf_counter() when its audio was captured
+        self.translated_at = None
+        self.speech_started_at = None
+
+class VoicePipeline:
+    def __init__(self, recognize, translate, speak=None, stats=None, recognize_workers=2):
+        self.recognize = recognize          # callable(audio) -> text
+        self.translate = translate          # callable(text) -> translation
+        self.speak = speak                  # callable(text, on_start, on_done); must not block
+        self.stats = stats or LatencyStats()
+        self.recognize_workers = recognize_workers
+        self.audio = queue.Queue()
+        self.sentences = queue.Queue()
+        self.output = queue.Queue()
+        self.recognized = OrderedResults(self._hand_off)
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.active_recognizers = 0
+        self.recognized_at = None           # perf_counter() when the last utterance finished recognizing
+        self.speaking = 0                   # sentences handed to speak that haven't finished
+        self.translated_all = threading.Event()
+        self.spoken_all = threading.Event()
+    
+    def start(self):
+        """Start the stage threads"""
+        self.active_recognizers = self.recognize_workers
+        for index in range(self.recognize_workers):
+            threading.Thread(target=self._recognize_stage, name=f"pipeline-recognize-{index}", daemon=True).start()
+        threading.Thread(target=self._translate_stage, name="pipeline-translate", daemon=True).start()
+        return self
+    
+    def submit(self, audio, captured_at=None):
+        """Feed one captured utterance into the pipeline"""
+        self.audio.put((self.sequence, audio, captured_at or time.perf_counter()))
+        self.sequence += 1
+    
+    def close(self):
+        """No more audio is coming; the stages drain and then stop"""
+        for _ in range(self.recognize_workers):
+            self.audio.put(None)
+    
+    def results(self):
+        """Yield each PipelineSentence in spoken order as soon as it is translated"""
+        while True:
+            sentence = self.output.get()
+            if sentence is None:
+                return
+            yield sentence
+    
+    def _recognize_stage(self):
+        while True:
+            item = self.audio.get()
+            if item is None:
+                break
+            sequence, audio, captured_at = item
+            start = time.perf_counter()
+            try:
+                sentences = [PipelineSentence(text, captured_at) for text in split_sentences(self.recognize(audio))]
+            except UnknownValueError:
+                sentences = []  # nothing intelligible in this utterance
+            except Exception as e:
+                sentences = [PipelineSentence(captured_at=captured_at, error=e)]
+            finished = time.perf_counter()
+            self.stats.add("recognition", finished - start)
+            with self.lock:
+                self.recognized_at = max(self.recognized_at or finished, finished)
+            self.recognized.add(sequence, sentences)
+        
+        with self.lock:
+            self.active_recognizers -= 1
+            last = self.active_recognizers == 0
+        if last:
+            self.sentences.put(None)  # every utterance has been handed on by now
+    
+    def _hand_off(self, sentences):
+        """Called in utterance order by the reorder buffer"""
+        for sentence in sentences:
+            self.sentences.put(sentence)
+    
+    def _translate_stage(self):
+        while True:
+            sentence = self.sentences.get()
+            if sentence is None:
+                break
+            if sentence.error is None:
+                start = time.perf_counter()
+                try:
+                    sentence.translation = self.translate(sentence.text)
+                except Exception as e:
+                    sentence.error = e
+                sentence.translated_at = time.perf_counter()
+                self.stats.add("translation", sentence.translated_at - start)
+            
+            if sentence.error is None and self.speak:
+                with self.lock:
+                    self.speaking += 1
+                self.speak(sentence.translation,
+                           lambda sentence=sentence: self._speech_started(sentence),
+                           lambda completed, sentence=sentence: self._speech_done(sentence, completed))
+            elif sentence.error is None:
+                self.stats.add("end_to_end", sentence.translated_at - sentence.captured_at)
+            self.output.put(sentence)
+        
+        self.translated_all.set()
+        self.output.put(None)
+        with self.lock:
+            if self.speaking == 0:
+                self.spoken_all.set()
+    
+    def _speech_started(self, sentence):
+        sentence.speech_started_at = time.perf_counter()
+        self.stats.add("tts_wait", sentence.speech_started_at - sentence.translated_at)
+        self.stats.add("end_to_end", sentence.speech_started_at - sentence.captured_at)
+    
+    def _speech_done(self, sentence, completed):
+        with self.lock:
+            self.speaking -= 1
+            if self.speaking == 0 and self.translated_all.is_set():
+                self.spoken_all.set()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy batch audio transcription
+"""
+
+import sys
+import os
+import io
+import json
+import math
+import struct
+import tempfile
+import wave
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Translations made by the test go to a shared cache of its own, removed when the run ends,
+# not ./translation_cache.db or one left over from an earlier run
+CACHE_DIR = tempfile.TemporaryDirectory()
+os.environ.setdefault("LANGUAGE_BUDDY_CACHE_DB", os.path.join(CACHE_DIR.name, "translation_cache.db"))
+
+from batch_transcribe import run_batch
+
+def write_clip(path, seconds, tone=True, sample_rate=16000):
+    """Write a mono 16-bit WAV file with a tone or pure silence"""
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        value = int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate)) if tone else 0
+        frames += struct.pack("<h", value)
+    with wave.open(path, "wb") as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(2)
+        clip.setframerate(sample_rate)
+        clip.writeframes(bytes(frames))
+
+def test_batch_transcription():
+    """Test that a folder of clips is processed in parallel and reported in order"""
+    print("Testing Language Buddy Batch Transcription...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        names = []
+        for i in range(8):
+            name = f"clip_{i:02d}.wav"
+            write_clip(os.path.join(temp_dir, name), 0.2 + 0.05 * i, tone=(i != 3))
+            names.append(name)
+        
+        output = io.StringIO()
+        summary = run_batch([temp_dir], "Spanish", backend_spec="stub", workers=2, output=output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        
+        assert [os.path.basename(result["file"]) for result in results] == names
+        assert summary["files"] == 8 and summary["errors"] == 1
+        assert results[3]["error"] == "could not understand audio"
+        assert results[0]["text"] == "Hello"
+        assert results[0]["translation"]
+        print(f"First result: {results[0]}")
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_batch_transcription()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy background cache prefetcher
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache_prefetch import CachePrefetcher, TokenBucket, rank_phrases
+from translation_cache import TranslationCache
+
+def wait_until(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_cache_prefetch():
+    """Test phrase ranking, rate limiting, pausing and replacing jobs"""
+    print("Testing Language Buddy Cache Prefetch...")
+    
+    assert rank_phrases(["Hello", "Water"], ["hello ", "Please"], ["Yes"], limit=3) == ["Hello", "Water", "Please"]
+    
+    # The bucket allows a burst, then one token per 1/rate seconds
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=3, clock=lambda: now[0])
+    assert [bucket.try_take() for _ in range(4)] == [True, True, True, False]
+    assert abs(bucket.wait_time() - 0.5) < 1e-9
+    now[0] += 0.5
+    assert bucket.try_take() and not bucket.try_take()
+    
+    cache = TranslationCache()
+    cache.put("Hello", "Spanish", "Hola")
+    fetched = []
+    
+    def translate(phrase, target):
+        fetched.append((phrase, target))
+        cache.put(phrase, target, phrase.upper())
+    
+    prefetcher = CachePrefetcher(translate, cache.contains, rate=50, burst=2)
+    
+    # Nothing is fetched while the user has a translation running
+    with prefetcher.foreground():
+        prefetcher.prefetch("Spanish", ["Hello", "Thank you", "Please", "Water", "Food"])
+        time.sleep(0.1)
+        assert fetched == []
+    assert wait_until(prefetcher.is_idle)
+    assert [phrase for phrase, _ in fetched] == ["Thank you", "Please", "Water", "Food"]
+    assert prefetcher.stats["already_cached"] == 1 and prefetcher.stats["paused"] == 1
+    
+    # Requests are spread out by the rate limit: 2 at once, then 50 per second
+    fetched.clear()
+    start = time.perf_counter()
+    prefetcher.prefetch("French", [f"phrase {i}" for i in range(12)])
+    assert prefetcher.pending() > 6  # the queue depth shown on the diagnostics screen
+    assert wait_until(prefetcher.is_idle)
+    assert prefetcher.pending() == 0
+    elapsed = time.perf_counter() - start
+    assert len(fetched) == 12
+    print(f"12 prefetches at 50/s in {elapsed * 1000:.0f}ms")
+    assert elapsed >= 0.15
+    
+    # Switching language again abandons the rest of the old list
+    slow = CachePrefetcher(translate, cache.contains, rate=5, burst=1)
+    fetched.clear()
+    slow.prefetch("German", [f"wort {i}" for i in range(20)])
+    time.sleep(0.1)
+    slow.prefetch("Italian", ["ciao"])
+    assert wait_until(slow.is_idle)
+    german = [phrase for phrase, target in fetched if target == "German"]
+    assert len(german) <= 2 and ("ciao", "Italian") in fetched
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_cache_prefetch()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy continuous speech translation
+"""
+
+import sys
+import os
+import random
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from continuous_speech import ContinuousTranslator
+
+class FakeRecognizer:
+    """Delivers a list of phrases through listen_in_background like speech_recognition does"""
+    def __init__(self, phrases):
+        self.phrases = phrases
+        self.capture_blocked = 0
+    
+    def listen_in_background(self, source, callback, phrase_time_limit=None):
+        def listen():
+            for phrase in self.phrases:
+                start = time.perf_counter()
+                callback(self, phrase)
+                # Capture must never wait on recognition or translation
+                if time.perf_counter() - start > 0.01:
+                    self.capture_blocked += 1
+                time.sleep(0.005)
+        threading.Thread(target=listen, daemon=True).start()
+        return lambda wait_for_stop=True: None
+
+def slow_recognize(audio):
+    time.sleep(random.uniform(0.01, 0.08))
+    if audio == "mumble":
+        raise ValueError("could not understand audio")
+    return audio
+
+def slow_translate(text):
+    time.sleep(random.uniform(0.01, 0.08))
+    return text.upper()
+
+def test_continuous_translation():
+    """Test that results stream back in spoken order while work runs concurrently"""
+    print("Testing Language Buddy Continuous Speech Translation...")
+    
+    phrases = [f"phrase {i}" for i in range(30)]
+    phrases[7] = "mumble"
+    recognizer = FakeRecognizer(phrases)
+    
+    results = []
+    finished = threading.Event()
+    def on_result(result):
+        results.append(result)
+        if len(results) == len(phrases):
+            finished.set()
+    
+    translator = ContinuousTranslator(recognizer, None, slow_recognize, slow_translate, on_result, workers=4)
+    start = time.perf_counter()
+    translator.start()
+    assert finished.wait(5)
+    elapsed = time.perf_counter() - start
+    translator.stop()
+    
+    assert [result.sequence for result in results] == list(range(len(phrases)))
+    assert results[0].translation == "PHRASE 0"
+    assert results[7].error is not None
+    assert recognizer.capture_blocked == 0
+    print(f"Translated {len(phrases)} phrases in order in {elapsed:.2f}s with 4 workers")
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_continuous_translation()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy diagnostics
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+import tracemalloc
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from diagnostics import collect, format_report, thread_summary, MemoryTracker
+from translation_cache import TranslationCache
+from translation_providers import ProviderChain, TranslationProvider
+
+class FlakyProvider(TranslationProvider):
+    type = "flaky"
+    
+    def translate(self, text, source, target):
+        if text == "fail":
+            raise RuntimeError("service down")
+        return f"{target}:{text}"
+
+def test_diagnostics():
+    """Test the report sections, queue depths and memory snapshots"""
+    print("Testing Language Buddy Diagnostics...")
+    
+    cache = TranslationCache()
+    cache.put("Hello", "es", "Hola")
+    cache.get("Hello", "es")
+    cache.get("Goodbye", "es")
+    chain = ProviderChain([FlakyProvider("flaky", failure_threshold=2)])
+    chain.translate("Hello", "en", "es")
+    chain.translate("fail", "en", "es")
+    chain.translate("fail", "en", "es")
+    
+    # Numbered worker threads are grouped by name
+    release = threading.Event()
+    workers = [threading.Thread(target=release.wait, name=f"diag-worker_{i}", daemon=True) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    try:
+        assert thread_summary()["groups"]["diag-worker"] == 3
+        
+        report = collect(cache, chain, {"speech": lambda: 2, "broken": lambda: 1 / 0})
+        json.dumps(report)  # served as-is by the HTTP service
+        assert report["cache"]["hit_rate"] == 0.5
+        assert report["queues"] == {"speech": 2, "broken": None}
+        provider = report["providers"][0]
+        assert provider["state"] == "open" and provider["calls"] == 3 and provider["failures"] == 2
+        
+        sections = format_report(report)
+        assert sections["cache"].startswith("Hit rate 50%")
+        assert sections["providers"].startswith("flaky: open (retry in")
+        assert "diag-worker × 3" in sections["threads"] and "speech: 2" in sections["queues"]
+    finally:
+        release.set()
+    
+    # Memory snapshots are reused until the interval passes, then retaken
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    now = [0.0]
+    tracker = MemoryTracker(limit=5, clock=lambda: now[0])
+    assert tracker.report() == {"tracing": False}
+    assert format_report(collect(memory=tracker))["memory"] == "Memory tracing is off"
+    tracker.start()
+    try:
+        hoard = [bytearray(1000) for _ in range(3000)]
+        first = tracker.report()
+        assert first["current_kb"] > 2900 and "test_diagnostics.py:" in first["top"][0]["location"]
+        assert first["top"][0]["blocks"] >= 3000
+        start = time.perf_counter()
+        for _ in range(100):
+            assert tracker.report()["top"] is first["top"]
+        print(f"100 cached memory reports in {(time.perf_counter() - start) * 1000:.1f}ms")
+        now[0] += 5
+        del hoard
+        assert tracker.report()["top"] is not first["top"]
+        assert "KB" in format_report(collect(memory=tracker))["memory"]
+    finally:
+        tracker.stop()
+    assert not tracemalloc.is_tracing()
+    
+    # Concurrent reports (as from parallel /diagnostics requests) while tracing is toggled don't trip over each other
+    tracker = MemoryTracker(limit=3, interval=0)
+    errors = []
+    def reporter():
+        try:
+            for _ in range(20):
+                report = tracker.report()
+                assert not report["tracing"] or report["snapshot_age"] >= 0
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=reporter) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for _ in range(10):
+        tracker.start()
+        tracker.stop()
+    for thread in threads:
+        thread.join()
+    assert not errors and not tracemalloc.is_tracing()
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_diagnostics()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy glossary enforcement
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from glossary import Glossary, load_glossary
+
+def test_glossary():
+    """Test matching, masking, restoring and large glossaries"""
+    print("Testing Language Buddy Glossary...")
+    
+    glossary = Glossary([("Acme",), ("Acme Cloud", {"es": "Nube Acme"}), ("he",), ("cloud sync",)])
+    text = "Try acme cloud today. Acme syncs. The Acme Cloud Sync app uses cloud sync."
+    found = [(text[match.start:match.end], match.entry.term) for match in glossary.find(text)]
+    # Longest term wins, case is ignored, and 'he' inside 'The' is not a word of its own
+    assert found == [("acme cloud", "Acme Cloud"), ("Acme", "Acme"), ("Acme Cloud", "Acme Cloud"),
+                     ("cloud sync", "cloud sync")]
+    
+    masked, replacements = glossary.mask("Acme Cloud keeps your files in cloud sync", "es")
+    assert masked == "[[G0]] keeps your files in [[G1]]"
+    assert replacements == ["Nube Acme", "cloud sync"]
+    
+    # Placeholders come back even when a provider adds spaces inside them
+    fake_provider = lambda masked_text: masked_text.replace("keeps your files in", "mantiene tus archivos en").replace("[[G1]]", "[[ G1 ]]")
+    translated = glossary.translate("Acme Cloud keeps your files in cloud sync", "es", fake_provider)
+    assert translated == "Nube Acme mantiene tus archivos en cloud sync"
+    assert glossary.translate("Nothing protected here", "es", str.upper) == "NOTHING PROTECTED HERE"
+    assert glossary.translate("hello acme", "es", str.lower) == "hello acme"  # placeholder case changed
+    assert glossary.translate("Acme", "fr", lambda text: 1 / 0) == "Acme"  # nothing left to send
+    # Placeholder-like text the user typed survives untouched
+    assert glossary.translate("Open [[G0]] and cloud sync", "es", str.upper) == "OPEN [[G0]] AND cloud sync"
+    assert glossary.fingerprint() != Glossary([("Acme",)]).fingerprint()
+    assert glossary.fingerprint() == Glossary([("Acme",), ("Acme Cloud", {"es": "Nube Acme"}), ("he",), ("cloud sync",)]).fingerprint()
+    
+    # Overlapping terms found through failure links
+    overlap = Glossary([("ab",), ("bcd",), ("cd",)], case_sensitive=True)
+    assert [(match.start, match.end) for match in overlap.find("x ab cd bcd")] == [(2, 4), (5, 7), (8, 11)]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "glossary.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"terms": ["Language Buddy", {"term": "flashcard", "translations": {"de": "Karteikarte"}}]}, f)
+        loaded = load_glossary(path)
+        assert len(loaded) == 2
+        assert loaded.mask("Language Buddy flashcard", "de")[1] == ["Language Buddy", "Karteikarte"]
+    
+    # Tens of thousands of terms over a long document in one linear pass
+    rng = random.Random(3)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    terms = {"".join(rng.choice(letters) for _ in range(rng.randint(5, 12))) for _ in range(50000)}
+    big = Glossary((term,) for term in terms)
+    start = time.perf_counter()
+    big.find("warm up")
+    build_time = time.perf_counter() - start
+    sample = rng.sample(sorted(terms), 200)
+    words = ["plain"] * 100000
+    for i, term in enumerate(sample):
+        words[i * 500] = term
+    document = " ".join(words)
+    start = time.perf_counter()
+    matches = big.find(document)
+    scan_time = time.perf_counter() - start
+    assert [document[match.start:match.end] for match in matches] == sample
+    print(f"Built 50000 terms in {build_time:.2f}s, scanned {len(document) // 1024} KB in {scan_time:.2f}s")
+    assert scan_time < 5
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_glossary()
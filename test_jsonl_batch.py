@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy JSONL batch translation
+"""
+
+import sys
+import os
+import io
+import json
+import random
+import subprocess
+import tempfile
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jsonl_batch import run_jobs
+
+LANGUAGE_NAMES = {"es": "Spanish", "fr": "French"}
+
+def resolve(value):
+    return LANGUAGE_NAMES.get(value.lower()) or (value if value in LANGUAGE_NAMES.values() else None)
+
+def test_jsonl_batch():
+    """Test ordering, bad lines and the in-flight limit"""
+    print("Testing Language Buddy JSONL Batch...")
+    
+    lock = threading.Lock()
+    active = [0, 0]  # running now, most at once
+    
+    def slow_translate(text, target):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(random.random() * 0.01)
+        with lock:
+            active[0] -= 1
+        return f"[{target}] {text}"
+    
+    lines = [json.dumps({"id": f"job-{i}", "text": f"sentence {i}", "target": "es" if i % 2 else "French"})
+             for i in range(200)]
+    lines[10] = "{not json"
+    lines[20] = json.dumps({"id": "no-text", "target": "es"})
+    lines[30] = json.dumps({"id": "bad-target", "text": "hi", "target": "xx"})
+    lines.insert(40, "   ")  # blank lines are skipped
+    
+    output = io.StringIO()
+    summary = run_jobs(iter(line + "\n" for line in lines), slow_translate, resolve, output, max_in_flight=8)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert summary == {"jobs": 200, "errors": 3}
+    assert [result["id"] for result in results][:3] == ["job-0", "job-1", "job-2"]
+    assert results[10]["id"] == 11 and "not valid JSON" in results[10]["error"]  # line number stands in
+    assert results[20]["error"] == "Missing 'text'" and "Unknown target" in results[30]["error"]
+    assert results[5]["translation"] == "[Spanish] sentence 5" and results[6]["target"] == "French"
+    assert 1 < active[1] <= 8
+    
+    # Unordered output still covers every job; a default target fills in missing ones
+    output = io.StringIO()
+    jobs = (json.dumps({"id": i, "text": f"phrase {i}"}) for i in range(100))
+    run_jobs(jobs, slow_translate, resolve, output, default_target="es", max_in_flight=4, ordered=False)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(result["id"] for result in results) == list(range(100))
+    assert all(result["target"] == "Spanish" for result in results)
+    
+    # Input is only read as fast as results are written, so memory stays flat
+    consumed = [0]
+    written = [0]
+    
+    def endless_input(count):
+        for i in range(count):
+            consumed[0] += 1
+            yield json.dumps({"id": i, "text": "x", "target": "es"})
+    
+    class CountingOutput:
+        def write(self, line):
+            written[0] += 1
+            assert consumed[0] - written[0] <= 8 + 1
+        def flush(self):
+            pass
+    
+    start = time.perf_counter()
+    summary = run_jobs(endless_input(20000), lambda text, target: text, resolve, CountingOutput(), max_in_flight=8)
+    print(f"20000 jobs in {(time.perf_counter() - start) * 1000:.0f}ms")
+    assert summary["jobs"] == 20000
+    
+    # Run as a command, stdout carries nothing but JSON lines - not even what's printed while importing
+    jobs = "\n".join([json.dumps({"id": "a", "text": "Hello", "target": "xx"}), "{not json"]) + "\n"
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jsonl_batch.py")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = dict(os.environ, LANGUAGE_BUDDY_CACHE_DB=os.path.join(temp_dir, "translation_cache.db"))
+        completed = subprocess.run([sys.executable, script], input=jobs, capture_output=True, text=True,
+                                   encoding="utf-8", env=env, timeout=60)
+    results = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [result["id"] for result in results] == ["a", 2] and completed.returncode == 1
+    assert "Translated 2 jobs" in completed.stderr
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_jsonl_batch()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy local language detection
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from language_detect import detect_language, detect_script, is_language
+
+def test_language_detection():
+    """Test script-based and trigram-based detection"""
+    print("Testing Language Buddy Language Detection...")
+    
+    samples = [
+        ("Where is the train station?", "en"),
+        ("¿Dónde está la estación de tren?", "es"),
+        ("Où est la gare, s'il vous plaît ?", "fr"),
+        ("Wo ist der Bahnhof, bitte?", "de"),
+        ("Dov'è la stazione dei treni?", "it"),
+        ("Onde fica a estação de trem, por favor?", "pt"),
+        ("Вы не подскажете, где вокзал?", "ru"),
+        ("रेलवे स्टेशन कहाँ है?", "hi"),
+        ("駅はどこですか", "ja"),
+        ("请问火车站在哪里呢", "zh"),
+        ("기차역이 어디에 있어요?", "ko"),
+        ("أين محطة القطار؟", "ar"),
+        ("ریلوے اسٹیشن کہاں ہے؟", "ur"),
+    ]
+    for text, expected in samples:
+        code, confidence = detect_language(text)
+        print(f"{text} -> {code} ({confidence:.2f})")
+        assert code == expected, (text, code)
+        assert confidence >= 0.8
+    
+    # Too little text to act on
+    assert detect_language("") == (None, 0.0)
+    assert detect_language("42!") == (None, 0.0)
+    assert detect_language("Hi")[0] is None
+    assert not is_language("Hola", "es")  # single words stay below the confidence bar
+    assert is_language("Muchas gracias por su ayuda", "es")
+    # Short phrases and kana-free kanji are too ambiguous to skip translation on
+    assert not is_language("Grande latte", "es")
+    assert not is_language("東京駅", "zh")
+    
+    # Languages the detector doesn't know aren't passed off as their nearest neighbour
+    assert detect_language("Ik wil graag een kopje koffie alstublieft, dank je wel") == (None, 0.0)
+    assert detect_language("Jag skulle vilja ha en kopp kaffe, tack så mycket") == (None, 0.0)
+    assert detect_language("Chtěl bych šálek kávy, děkuji vám velmi pěkně") == (None, 0.0)
+    assert not is_language("Я хотів би чашку кави, дякую", "ru")        # Ukrainian
+    assert not is_language("من یک فنجان قهوه می‌خواهم، متشکرم", "ar")    # Persian
+    assert not is_language("मला एक कप कॉफी हवी आहे", "hi")              # Marathi
+    
+    assert detect_script("Hello мир")["cyrillic"] == 3
+    assert detect_language("Buenos días", candidates={"en", "es"})[0] == "es"
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_language_detection()
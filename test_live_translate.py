@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy translate-as-you-type
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from live_translate import LiveTranslator, split_segments, translate_segments
+from translation_cache import TranslationCache
+
+def test_live_translate():
+    """Test sentence reuse, request coalescing and stale-result dropping"""
+    print("Testing Language Buddy Live Translation...")
+    
+    text = "Hello there. How are you?\nFine!  Thanks"
+    segments = split_segments(text)
+    assert "".join(sentence + separator for sentence, separator in segments) == text
+    assert [sentence for sentence, _ in segments] == ["Hello there.", "How are you?", "Fine!", "Thanks"]
+    
+    # Finished sentences come from the cache while the last one is typed
+    cache = TranslationCache()
+    requested = []
+    
+    def translate(sentence):
+        cached = cache.get(sentence, "es")
+        if cached is None:
+            requested.append(sentence)
+            cached = sentence.upper()
+            cache.put(sentence, "es", cached)
+        return cached
+    
+    typed = "Hello there. How are you"
+    for length in range(len("Hello there. H"), len(typed) + 1):
+        result = translate_segments(typed[:length], translate)
+    assert result == "HELLO THERE. HOW ARE YOU"
+    assert requested.count("Hello there.") == 1
+    assert translate_segments("Hello", translate, is_stale=lambda: True) is None
+    
+    # Keystrokes during a slow request are coalesced into one follow-up request
+    calls = []
+    delivered = []
+    release = threading.Event()
+    finished = threading.Event()
+    
+    def slow_translate(text, target, is_stale):
+        calls.append(text)
+        if len(calls) == 1:
+            release.wait(2)
+        return text.upper()
+    
+    def deliver(text, target, translation):
+        delivered.append(translation)
+        finished.set()
+    
+    live = LiveTranslator(slow_translate, deliver)
+    live.submit("h", "Spanish")
+    time.sleep(0.05)
+    for typed_text in ("he", "hel", "hell", "hello"):
+        live.submit(typed_text, "Spanish")
+    release.set()
+    assert finished.wait(2)
+    time.sleep(0.05)
+    assert calls == ["h", "hello"]
+    assert delivered == ["HELLO"]  # the answer for "h" was stale when it arrived
+    stats = live.stats()
+    assert stats["dropped"] == 1 and stats["skipped"] == 3
+    
+    # A cancelled request is never shown
+    finished.clear()
+    release.clear()
+    calls.clear()
+    live.submit("bye", "Spanish")
+    time.sleep(0.05)
+    live.cancel()
+    release.set()
+    time.sleep(0.1)
+    assert delivered == ["HELLO"] and not live.running
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_live_translate()
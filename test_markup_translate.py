@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy markup-aware translation
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from markup_translate import TextNode, segment_html, segment_markdown, translate_markup, make_batches
+
+HTML_DOCUMENT = """<!DOCTYPE html>
+<html><head><title>Welcome home</title><style>p { color: red; }</style></head>
+<body>
+  <h1 class="intro">Hello &amp; welcome</h1>
+  <p>Click <a href="/start" title="Start here">the button</a> to begin.</p>
+  <img src="cat.png" alt='A happy "cat"'><br/>
+  <pre><code>print("hello")</code></pre>
+  <p translate="no">Acme Corp</p><p>12:30 &ndash; 14:00</p>
+  <!-- a comment -->
+  <p>Tom &lt; Jerry</p>
+</body></html>"""
+
+MARKDOWN_DOCUMENT = """# Getting started ##
+
+Welcome to **Language Buddy**! See [the docs](https://example.com/docs "Docs") or ![a logo](logo.png).
+
+- Install with `pip install buddy`
+- [ ] Try it at https://example.com/try now
+> Quote here
+
+```python
+print("hello world")
+```
+
+    indented code here
+
+| Name | Value |
+|------|------:|
+| Speed | Fast |
+
+[docs]: https://example.com/reference
+<p align="center">Made with love</p>
+Last line"""
+
+def texts(parts):
+    return [part.text for part in parts if isinstance(part, TextNode)]
+
+def raw(parts):
+    return "".join(part if isinstance(part, str) else part.raw for part in parts)
+
+def test_markup_translate():
+    """Test HTML and Markdown segmentation, batching and rebuilding"""
+    print("Testing Language Buddy Markup Translation...")
+    
+    parts = segment_html(HTML_DOCUMENT)
+    assert raw(parts) == HTML_DOCUMENT
+    assert texts(parts) == ["Welcome home", "Hello & welcome", "Click", "Start here", "the button",
+                            "to begin.", 'A happy "cat"', "Tom < Jerry"]
+    
+    requests = []
+    def upper(text):
+        requests.append(text)
+        return text.upper()
+    
+    result = translate_markup(HTML_DOCUMENT, "html", upper)
+    assert len(requests) == 1 and result.batches == 1 and result.failed == 0
+    assert "<h1 class=\"intro\">HELLO &amp; WELCOME</h1>" in result.text
+    assert '<a href="/start" title="START HERE">THE BUTTON</a> TO BEGIN.' in result.text
+    assert "alt='A HAPPY &quot;CAT&quot;'" in result.text
+    assert '<code>print("hello")</code>' in result.text and "Acme Corp" in result.text
+    assert "12:30 &ndash; 14:00" in result.text and "TOM &lt; JERRY" in result.text
+    assert result.sent_bytes < result.document_bytes / 3
+    print(result.summary())
+    
+    parts = segment_markdown(MARKDOWN_DOCUMENT)
+    assert raw(parts) == MARKDOWN_DOCUMENT
+    assert texts(parts) == ["Getting started", "Welcome to **Language Buddy**! See", "the docs", "or", "a logo",
+                            "Install with", "Try it at", "now", "Quote here", "Name", "Value", "Speed", "Fast",
+                            "Made with love", "Last line"]
+    result = translate_markup(MARKDOWN_DOCUMENT, "markdown", str.upper)
+    assert result.text.startswith("# GETTING STARTED ##\n\nWELCOME TO **LANGUAGE BUDDY**! SEE [THE DOCS](https://example.com/docs")
+    assert "- INSTALL WITH `pip install buddy`" in result.text and "https://example.com/try NOW" in result.text
+    assert 'print("hello world")' in result.text and "    indented code here" in result.text
+    assert "| SPEED | FAST |" in result.text and "|------|------:|" in result.text
+    assert result.text.endswith('<p align="center">MADE WITH LOVE</p>\nLAST LINE')
+    
+    # Repeated nodes are sent once; an identity translation gives back the document unchanged
+    result = translate_markup("<li>Yes</li><li>No</li><li>Yes</li>", "html", str.upper)
+    assert result.text == "<li>YES</li><li>NO</li><li>YES</li>" and result.sent_bytes == len("YES\nNO")
+    assert translate_markup(HTML_DOCUMENT, "html", lambda text: text).text == HTML_DOCUMENT
+    
+    # A batch that loses its line breaks is retried node by node; provider errors leave the text alone
+    result = translate_markup("<p>Hello</p>\n<p>Bye</p>", "html", lambda text: text.replace("\n", " ").upper())
+    assert result.text == "<p>HELLO</p>\n<p>BYE</p>" and result.requests == 3
+    result = translate_markup("<p>Hello</p><p>Bye</p>", "html", lambda text: "⚠️ Translation not available")
+    assert result.text == "<p>Hello</p><p>Bye</p>" and result.failed == 2 and result.error.startswith("⚠️")
+    
+    assert list(make_batches(["aaa", "bbb", "ccc"], 7)) == [["aaa", "bbb"], ["ccc"]]
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_markup_translate()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy microphone calibration cache
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mic_calibration import MicCalibration
+
+class FakeRecognizer:
+    def __init__(self):
+        self.energy_threshold = 300
+        self.adjustments = 0
+    
+    def adjust_for_ambient_noise(self, source, duration=1.0):
+        self.adjustments += 1
+        self.energy_threshold = 812.5
+
+class FakeMicrophone:
+    device_index = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        return False
+
+def test_mic_calibration():
+    """Test that calibration is done once and reused across sessions"""
+    print("Testing Language Buddy Microphone Calibration...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "mic.json")
+        recognizer = FakeRecognizer()
+        calibration = MicCalibration(recognizer, FakeMicrophone(), path=path)
+        
+        assert not calibration.apply()
+        assert calibration.is_stale()
+        calibration.calibrate(duration=0)
+        assert recognizer.adjustments == 1
+        assert not calibration.is_stale()
+        
+        # A new session starts with the saved threshold and no calibration
+        next_session = FakeRecognizer()
+        calibration = MicCalibration(next_session, FakeMicrophone(), path=path)
+        assert calibration.apply()
+        assert next_session.energy_threshold == 812.5
+        assert next_session.adjustments == 0
+        assert not calibration.is_stale()
+        
+        # Calibration doesn't wait for a microphone that is busy recording
+        with calibration.mic_lock:
+            assert calibration.calibrate(wait=False) is None
+        print(f"Saved calibration: {calibration.saved}")
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_mic_calibration()
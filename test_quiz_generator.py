@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy quiz generator
+"""
+
+import sys
+import os
+import random
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vocabulary_store import VocabularyStore, VocabWord, LanguageVocabulary
+from quiz_generator import QuizGenerator, TO_ENGLISH, FROM_ENGLISH
+
+def test_quiz_generator():
+    """Test distractor choice and generation speed"""
+    print("Testing Language Buddy Quiz Generator...")
+    
+    store = VocabularyStore()
+    generator = QuizGenerator(store.get("es"), rng=random.Random(7))
+    
+    # Distractors share the part of speech and topic when the vocabulary allows it
+    two = store.get("es").get("two")
+    question = generator.question(two, choices=4)
+    assert question.prompt == "What does 'Dos' mean in English?"
+    assert question.answer == "Two" and "Two" in question.options
+    assert len(set(question.options)) == 4
+    assert set(question.options) <= {"One", "Two", "Three", "Four", "Five"}
+    assert question.is_correct("Two") and not question.is_correct("Three")
+    
+    question = generator.question(store.get("es").get("eat"), direction=FROM_ENGLISH)
+    assert question.prompt == "How do you say 'Eat' in Spanish?"
+    assert question.answer == "Comer"
+    
+    # Words spelled the same way are never offered as each other's wrong answer
+    french = QuizGenerator(store.get("fr"), rng=random.Random(1))
+    hello = store.get("fr").get("hello")
+    for _ in range(50):
+        assert "Good morning" not in french.question(hello).options
+    
+    # Falls back to other words when a group is too small
+    tiny = LanguageVocabulary("xx", [VocabWord("a", "Cat", "Gato", pos="noun", topic="animals"),
+                                     VocabWord("b", "Run", "Correr", pos="verb", topic="actions"),
+                                     VocabWord("c", "Red", "Rojo", pos="adjective", topic="colors")])
+    assert len(QuizGenerator(tiny).question(tiny.get("a"), choices=3).options) == 3
+    
+    # Drills: hundreds of questions per second on a large vocabulary
+    words = [VocabWord(f"w{i}", f"meaning {i}", f"palabra {i}", rank=i + 1,
+                       pos=("noun", "verb", "adjective")[i % 3], topic=f"topic {i % 40}") for i in range(20000)]
+    large = QuizGenerator(LanguageVocabulary("es", words))
+    start = time.perf_counter()
+    drill = large.drill(2000, words=words[:500], choices=4, mixed=True)
+    elapsed = time.perf_counter() - start
+    assert len(drill) == 2000
+    assert all(len(set(question.options)) == 4 for question in drill)
+    assert {question.direction for question in drill} == {TO_ENGLISH, FROM_ENGLISH}
+    print(f"{len(drill) / elapsed:.0f} questions per second")
+    assert len(drill) / elapsed > 500
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_quiz_generator()
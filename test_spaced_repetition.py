@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy spaced-repetition scheduler
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from spaced_repetition import SpacedRepetition, Card, sm2, DAY
+
+def test_spaced_repetition():
+    """Test SM-2 scheduling, the due queue and persistence"""
+    print("Testing Language Buddy Spaced Repetition...")
+    
+    # SM-2 intervals grow 1 -> 6 -> ~15 days and reset on a wrong answer
+    card = Card("hello")
+    assert [sm2(card, 4, now=0).interval for _ in range(3)] == [1, 6, 15.0]
+    sm2(card, 1, now=0)
+    assert card.repetitions == 0 and card.interval == 1 and card.lapses == 1
+    assert card.ease >= 1.3
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "progress.db")
+        now = 1_000_000.0
+        srs = SpacedRepetition(db_path, profile="ana")
+        assert srs.introduce("es", ["hello", "thank_you", "please"], now=now) == 3
+        assert srs.introduce("es", ["hello"], now=now) == 0
+        assert srs.due_count("es", now=now) == 3
+        
+        srs.review("es", "hello", 5, now=now)
+        srs.review("es", "please", 1, now=now - 10)
+        assert srs.next_due("es", count=5, now=now) == ["thank_you"]
+        assert srs.next_due("es", count=5, now=now + DAY) == ["thank_you", "please", "hello"]
+        
+        # Another profile has its own schedule
+        other = SpacedRepetition(db_path, profile="ben")
+        assert other.next_due("es", now=now) == []
+        
+        # State survives a restart
+        srs.close()
+        srs = SpacedRepetition(db_path, profile="ana")
+        assert srs.get("es", "hello").repetitions == 1
+        assert srs.stats("es") == {"cards": 3, "learned": 1}
+        assert srs.next_due("es", count=5, now=now) == ["thank_you"]
+        
+        # Large decks: fetching the next due card stays cheap after many reviews
+        srs.introduce("de", [f"w{i}" for i in range(20000)], now=now)
+        start = time.perf_counter()
+        for i in range(2000):
+            word_id = srs.next_due("de", now=now)[0]
+            srs.review("de", word_id, 4, now=now)
+        elapsed = time.perf_counter() - start
+        assert srs.due_count("de", now=now) == 18000
+        assert len(srs.queues["de"]) <= 2 * 20000 + 64
+        print(f"2000 reviews of a 20000 card deck in {elapsed * 1000:.0f}ms")
+        srs.close()
+        other.close()
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_spaced_repetition()
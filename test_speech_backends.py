@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy speech recognition backends
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from speech_backends import (create_backend, FallbackBackend, StubBackend,
+                             RecognizerBackend, RequestError, UnknownValueError)
+
+class OfflineBackend(RecognizerBackend):
+    """Behaves like an online recognizer without a network connection"""
+    name = "offline-google"
+    
+    def recognize(self, audio):
+        raise RequestError("no internet connection")
+
+def test_speech_backends():
+    """Test backend selection, the deterministic stub and fallback chains"""
+    print("Testing Language Buddy Speech Backends...")
+    
+    speech = b"\x01\x02\x03\x04" * 100
+    silence = b"\x00" * 400
+    
+    # The stub is deterministic and needs no audio libraries
+    stub = create_backend("stub")
+    assert isinstance(stub, StubBackend)
+    assert stub.recognize(speech) == "Hello"
+    stub.transcripts[StubBackend.audio_key(speech)] = "Good morning"
+    assert stub.recognize(speech) == "Good morning"
+    try:
+        stub.recognize(silence)
+        assert False, "silence should not be recognized"
+    except UnknownValueError:
+        pass
+    
+    # A chain moves on to the next engine when one can't be reached
+    chain = FallbackBackend([OfflineBackend(), StubBackend(default_text="Thank you")])
+    assert chain.recognize(speech) == "Thank you"
+    assert chain.offline
+    print(f"Fallback chain answered offline: {chain!r}")
+    
+    # Unknown names are reported instead of silently using Google
+    try:
+        create_backend("telepathy")
+        assert False, "unknown backend should be rejected"
+    except ValueError as e:
+        print(f"Rejected unknown backend: {e}")
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_speech_backends()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy voice-to-voice pipeline
+"""
+
+import sys
+import os
+import queue
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from speech_pipeline import VoicePipeline, split_sentences
+from speech_backends import UnknownValueError
+from perf_timing import LatencyStats, percentile
+
+def test_speech_pipeline():
+    """Test that sentences flow through the stages in order and get timed"""
+    print("Testing Language Buddy Voice Pipeline...")
+    
+    assert split_sentences("Hello there. How are you? Fine") == ["Hello there.", "How are you?", "Fine"]
+    assert percentile([3, 1, 2, 4], 50) == 2 and percentile([3, 1, 2, 4], 95) == 4
+    assert percentile([], 50) is None
+    
+    transcripts = {"a": "Good morning. See you soon", "b": "", "c": "Thank you"}
+    delays = {"a": 0.15, "b": 0.0, "c": 0.01}  # the first utterance is the slowest to recognize
+    
+    def recognize(audio):
+        time.sleep(delays[audio])
+        if not transcripts[audio]:
+            raise UnknownValueError()
+        return transcripts[audio]
+    
+    spoken = []
+    playback = queue.Queue()
+    
+    def player():
+        # Plays queued sentences one at a time on its own thread, like the TTS worker
+        while True:
+            text, on_start, on_done = playback.get()
+            on_start()
+            spoken.append(text)
+            on_done(True)
+    
+    threading.Thread(target=player, daemon=True).start()
+    
+    def speak(text, on_start, on_done):
+        playback.put((text, on_start, on_done))
+    
+    stats = LatencyStats()
+    pipeline = VoicePipeline(recognize, lambda text: text.upper(), speak=speak, stats=stats).start()
+    captured_at = time.perf_counter()
+    for audio in ("a", "b", "c"):
+        pipeline.submit(audio, captured_at)
+    pipeline.close()
+    
+    sentences = list(pipeline.results())
+    assert [sentence.text for sentence in sentences] == ["Good morning.", "See you soon", "Thank you"]
+    assert [sentence.translation for sentence in sentences] == ["GOOD MORNING.", "SEE YOU SOON", "THANK YOU"]
+    assert pipeline.spoken_all.wait(2)
+    assert spoken == ["GOOD MORNING.", "SEE YOU SOON", "THANK YOU"]
+    assert pipeline.recognized_at - captured_at >= 0.15  # waits for the slowest utterance
+    
+    report = stats.report()
+    assert report["recognition"]["count"] == 3
+    assert report["translation"]["count"] == 3
+    assert report["end_to_end"]["count"] == 3
+    assert report["end_to_end"]["p95"] >= report["end_to_end"]["p50"] >= 0.15
+    print(f"Latency: {stats.summary()}")
+    
+    # Recognition errors come through as sentences with an error and nothing is spoken
+    def failing(audio):
+        raise RuntimeError("offline")
+    
+    pipeline = VoicePipeline(failing, lambda text: text, stats=stats).start()
+    pipeline.submit("x")
+    pipeline.close()
+    sentences = list(pipeline.results())
+    assert len(sentences) == 1 and isinstance(sentences[0].error, RuntimeError)
+    assert pipeline.spoken_all.wait(1)
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_speech_pipeline()
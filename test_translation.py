@@ -5,10 +5,16 @@ Test script for the Language Buddy translation functionality
 
 import sys
 import os
+import tempfile
 
 # Add the current directory to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Translations made by the test go to a shared cache of its own, removed when the run ends,
+# not ./translation_cache.db or one left over from an earlier run
+CACHE_DIR = tempfile.TemporaryDirectory()
+os.environ.setdefault("LANGUAGE_BUDDY_CACHE_DB", os.path.join(CACHE_DIR.name, "translation_cache.db"))
+
 from language_buddy import LanguageBuddy
 import tkinter as tk
 
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy translation cache
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+from multiprocessing import Pool
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from translation_cache import TranslationCache, SharedTranslationCache
+
+def _worker_put(args):
+    """Runs in another process: translate a slice of sentences into the shared file"""
+    db_path, start, count = args
+    cache = TranslationCache(shared=SharedTranslationCache(db_path))
+    for i in range(start, start + count):
+        cache.put(f"sentence {i}", "es", f"frase {i}")
+    return count
+
+def test_translation_cache():
+    """Test lookups, LRU eviction and hit counting"""
+    print("Testing Language Buddy Translation Cache...")
+    
+    cache = TranslationCache(capacity=3)
+    assert cache.get("Hello", "es") is None
+    cache.put("Hello", "es", "Hola")
+    cache.put("Hello", "fr", "Bonjour")
+    assert cache.get("Hello", "es") == "Hola"
+    assert cache.get("  Hello ", "es") == "Hola"  # surrounding whitespace doesn't matter
+    assert cache.get("Hello", "de") is None
+    
+    # The least recently used entry goes first
+    cache.put("Thank you", "es", "Gracias")
+    cache.put("Please", "es", "Por favor")
+    assert len(cache) == 3
+    assert not cache.contains("Hello", "fr")
+    assert cache.contains("Hello", "es")
+    # Background lookups don't count towards the hit rate
+    assert cache.get("Please", "es", count=False) == "Por favor"
+    assert cache.get("Water", "es", count=False) is None
+    
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["hit_rate"] == 0.5
+    
+    # Lookups stay fast when the cache is full
+    cache = TranslationCache(capacity=10000)
+    for i in range(20000):
+        cache.put(f"sentence {i}", "es", f"frase {i}")
+    start = time.perf_counter()
+    for i in range(100000):
+        cache.get(f"sentence {10000 + i % 10000}", "es")
+    elapsed = time.perf_counter() - start
+    assert len(cache) == 10000 and cache.stats()["hit_rate"] == 1.0
+    print(f"100000 lookups in {elapsed * 1000:.0f}ms")
+    
+    # A translation made by one process is a hit for every other one
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "shared.db")
+        shared = SharedTranslationCache(db_path)
+        with Pool(4) as pool:
+            assert sum(pool.map(_worker_put, [(db_path, i * 250, 250) for i in range(4)])) == 1000
+        assert len(shared) == 1000
+        
+        # The shared cache is only opened once it's needed
+        opened = []
+        cache = TranslationCache(open_shared=lambda: opened.append(db_path) or shared)
+        assert opened == []
+        assert cache.get("sentence 999", "es") == "frase 999"
+        assert cache.get("sentence 999", "es") == "frase 999"
+        assert cache.get("sentence 1000", "es") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["shared_hits"], stats["misses"]) == (1, 1, 1)
+        assert opened == [db_path]
+        
+        # Threads read and write concurrently, each on its own connection
+        errors = []
+        def reader_writer(offset):
+            try:
+                for i in range(200):
+                    shared.put(f"thread {offset} {i}", "fr", f"fil {i}")
+                    assert shared.get(f"sentence {i}", "es") == f"frase {i}"
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=reader_writer, args=(n,)) for n in range(4)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"800 shared writes and reads on 4 threads in {(time.perf_counter() - start) * 1000:.0f}ms")
+        assert not errors and len(shared) == 1800
+        
+        # Connections opened by threads that have ended are closed, not kept forever
+        for _ in range(100):
+            thread = threading.Thread(target=shared.get, args=("sentence 1", "es"))
+            thread.start()
+            thread.join()
+        assert len(shared.connections) == 1  # this thread's own
+        
+        # A different glossary or provider setup doesn't see the old translations
+        versioned = TranslationCache(shared=shared, version="v2")
+        assert versioned.get("sentence 999", "es") is None
+        versioned.put("sentence 999", "es", "oración 999")
+        assert versioned.get("sentence 999", "es") == "oración 999" and cache.get("sentence 999", "es") == "frase 999"
+        
+        # Old entries are pruned once the file passes its limit
+        shared.max_entries = 500
+        shared.prune()
+        assert len(shared) == 500
+        shared.close()
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_translation_cache()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy translation history store
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from translation_history import TranslationHistory
+
+def test_history_paging_and_search():
+    """Test paging and incremental search over a large history"""
+    print("Testing Language Buddy Translation History...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        history = TranslationHistory(os.path.join(temp_dir, "history.db"))
+        
+        entry_count = 100000
+        start = time.perf_counter()
+        history.add_many(
+            (f"Sentence number {i}", f"Frase número {i}", "Spanish", "text")
+            for i in range(entry_count)
+        )
+        print(f"Inserted {entry_count} entries in {time.perf_counter() - start:.2f}s")
+        
+        assert history.count() == entry_count
+        
+        # Newest entries come first
+        first_page = history.fetch(0, 50)
+        assert len(first_page) == 50
+        assert first_page[0]["source_text"] == f"Sentence number {entry_count - 1}"
+        
+        # A page deep in the list is fetched without loading the rest
+        start = time.perf_counter()
+        deep_page = history.fetch(90000, 50)
+        print(f"Fetched page at offset 90000 in {(time.perf_counter() - start) * 1000:.1f}ms")
+        assert deep_page[0]["source_text"] == f"Sentence number {entry_count - 1 - 90000}"
+        
+        # Scrolling on from a page continues after its last id instead of counting past earlier rows
+        start = time.perf_counter()
+        next_page = history.fetch(90050, 50, before_id=deep_page[-1]["id"])
+        print(f"Fetched the following page by id in {(time.perf_counter() - start) * 1000:.1f}ms")
+        assert next_page == history.fetch(90050, 50)
+        matching = history.fetch(0, 5, "99", before_id=next_page[-1]["id"])
+        assert all("99" in entry["source_text"] and entry["id"] < next_page[-1]["id"] for entry in matching)
+        
+        # Incremental search narrows the results as the user types
+        for query in ["9", "99", "999", "9999", "99999", "número 12345"]:
+            expected = sum(1 for i in range(entry_count) if query in f"Sentence number {i}" or query in f"Frase número {i}")
+            start = time.perf_counter()
+            matches = history.count(query)
+            print(f"Search '{query}': {matches} matches in {(time.perf_counter() - start) * 1000:.1f}ms")
+            assert matches == expected
+        
+        # LIKE wildcards in the search are treated literally
+        history.add("100% done", "100% hecho", "Spanish")
+        assert history.count("100%") == 1
+        assert history.count("_") == 0
+        
+        # Phrases translated most often come first, whatever the language
+        history.add("Good morning", "Bonjour", "French")
+        history.add("Good morning", "Guten Morgen", "German")
+        assert history.frequent_sources(1) == ["Good morning"]
+        
+        history.close()
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_history_paging_and_search()
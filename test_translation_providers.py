@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy translation provider registry
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import TimeoutError
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from translation_providers import load_providers, merge_config, requests_available, CircuitBreaker, TranslationProvider, build_chain
+
+CUSTOM_MODULE = '''
+CALLS = []
+
+def translate(text, source, target):
+    CALLS.append((text, source, target))
+    if text == "fail":
+        raise RuntimeError("backend down")
+    return f"{target}:{text}"
+'''
+
+class FakeLibreTranslate(BaseHTTPRequestHandler):
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+        body = json.dumps({"translatedText": f"libre {form['target'][0]}: {form['q'][0]}"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+def test_translation_providers():
+    """Test config merging, priorities, language limits and custom providers"""
+    print("Testing Language Buddy Translation Providers...")
+    
+    # Built-in entries can be tuned or switched off by name
+    entries = merge_config({"providers": [{"name": "mymemory", "enabled": False, "timeout": 3},
+                                          {"name": "mine", "type": "module", "function": "x:y"}]})
+    by_name = {entry["name"]: entry for entry in entries}
+    assert by_name["mymemory"] == {"name": "mymemory", "type": "mymemory", "priority": 30,
+                                   "enabled": False, "timeout": 3}
+    assert [entry["name"] for entry in merge_config({"include_defaults": False})] == []
+    assert repr(build_chain([])) == "ProviderChain(no providers available)"
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, "inhouse_mt.py"), "w") as f:
+            f.write(CUSTOM_MODULE)
+        sys.path.insert(0, temp_dir)
+        
+        config_path = os.path.join(temp_dir, "providers.json")
+        with open(config_path, "w") as f:
+            json.dump({"include_defaults": False, "providers": [
+                {"name": "broken", "type": "module", "function": "inhouse_mt:translate", "priority": 1,
+                 "languages": ["de"]},
+                {"name": "inhouse", "type": "module", "function": "inhouse_mt:translate", "priority": 5},
+                {"name": "missing", "type": "module", "function": "not_installed_mt:translate"},
+            ]}, f)
+        
+        # $LANGUAGE_BUDDY_PROVIDERS points at the config; uninstalled providers are skipped
+        os.environ["LANGUAGE_BUDDY_PROVIDERS"] = config_path
+        try:
+            chain = load_providers()
+        finally:
+            del os.environ["LANGUAGE_BUDDY_PROVIDERS"]
+        assert [provider.name for provider in chain.providers] == ["broken", "inhouse"]
+        assert repr(chain) == "ProviderChain(broken, inhouse; not installed: missing)"
+        assert [provider.name for provider in chain.for_language("es")] == ["inhouse"]
+        assert chain.translate("Hello", "en", "es") == ("es:Hello", "inhouse")
+        assert chain.translate("Hello", None, "de") == ("de:Hello", "broken")
+        
+        # A provider that raises hands over to the next one; nothing left means (None, None)
+        import inhouse_mt
+        assert chain.translate("fail", "en", "de") == (None, None)
+        assert len([call for call in inhouse_mt.CALLS if call[0] == "fail"]) == 2
+        
+        # Failing three times in a row opens a provider's circuit, and it is skipped until the reset timeout
+        now = [0.0]
+        for provider in chain.providers:
+            provider.breaker.clock = lambda: now[0]
+        chain.translate("fail", "en", "de")
+        chain.translate("fail", "en", "de")
+        calls = len(inhouse_mt.CALLS)
+        assert chain.translate("Hello", "en", "de") == (None, None) and len(inhouse_mt.CALLS) == calls
+        stats = {row["name"]: row for row in chain.stats()}
+        assert stats["broken"]["state"] == "open" and stats["broken"]["skipped"] == 1
+        assert stats["inhouse"]["failures"] == 3 and stats["inhouse"]["p50"] is not None
+        now[0] += 61
+        assert chain.translate("Hello", "en", "de") == ("de:Hello", "broken")
+        assert [row["state"] for row in chain.stats()] == ["closed", "half-open"]
+        
+        # Unknown provider types are reported
+        with open(config_path, "w") as f:
+            json.dump({"providers": [{"name": "odd", "type": "carrier_pigeon"}]}, f)
+        try:
+            load_providers(config_path)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "carrier_pigeon" in str(e)
+        sys.path.remove(temp_dir)
+    
+    # A half-open circuit lets a single trial through; if it fails the circuit opens again
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow() and breaker.retry_in() == 10
+    now[0] = 10
+    assert breaker.state == "half-open" and breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.times_opened == 2
+    now[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow() and breaker.allow()
+    
+    # Libraries without a timeout setting are cut off by call_with_timeout
+    provider = TranslationProvider("hanging", timeout=0.1)
+    assert provider.call_with_timeout(str.upper, "ok") == "OK"
+    start = time.perf_counter()
+    try:
+        provider.call_with_timeout(time.sleep, 1)
+        assert False, "expected a timeout"
+    except TimeoutError:
+        assert time.perf_counter() - start < 0.5
+    
+    # A self-hosted LibreTranslate server is just a URL in the config
+    if requests_available:
+        server = HTTPServer(("127.0.0.1", 0), FakeLibreTranslate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"include_defaults": False, "providers": [
+                {"name": "office", "type": "libretranslate", "timeout": 2,
+                 "url": f"http://127.0.0.1:{server.server_address[1]}/translate"}]}, f)
+        try:
+            chain = load_providers(f.name)
+            assert chain.translate("Good night", "en", "fr") == ("libre fr: Good night", "office")
+        finally:
+            server.shutdown()
+            os.remove(f.name)
+    else:
+        print("requests is not installed - skipping the LibreTranslate check")
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_translation_providers()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy translation service
+"""
+
+import sys
+import os
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from translation_server import TranslationService, make_server
+
+LANGUAGE_NAMES = {"es": "Spanish", "fr": "French", "de": "German"}
+
+def resolve(value):
+    if value == "boom":
+        raise RuntimeError("resolver crashed")
+    value = value.lower()
+    return LANGUAGE_NAMES.get(value) or next((name for name in LANGUAGE_NAMES.values() if name.lower() == value), None)
+
+def fake_translate(text, target):
+    if text == "slow":
+        time.sleep(0.5)
+    if text == "broken":
+        return f"⚠️ Translation to {target} failed."
+    return f"{text} ({target})"
+
+def request(connection, method, path, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    connection.request(method, path, body=data, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read()), response
+
+def test_translation_server():
+    """Test the endpoints, keep-alive and backpressure"""
+    print("Testing Language Buddy Translation Service...")
+    
+    service = TranslationService(fake_translate, resolve, workers=2, queue_size=1)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    
+    try:
+        # Every request below reuses one kept-alive connection
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        status, body, _ = request(connection, "POST", "/translate", {"text": "Hello", "target": "es"})
+        assert status == 200 and body["translation"] == "Hello (Spanish)"
+        sock = connection.sock
+        
+        status, body, _ = request(connection, "POST", "/translate/batch",
+                                  {"texts": ["One", "Two", "broken"], "target": "French"})
+        assert status == 200
+        assert [result.get("translation") for result in body["results"]] == ["One (French)", "Two (French)", None]
+        assert "error" in body["results"][2]
+        
+        status, body, _ = request(connection, "POST", "/translate/fanout",
+                                  {"text": "Hi", "targets": ["es", "fr", "Spanish", "de"]})
+        assert [result["target"] for result in body["results"]] == ["Spanish", "French", "German"]
+        assert connection.sock is sock  # no reconnect happened
+        
+        # Bad input is rejected without reaching the workers
+        assert request(connection, "POST", "/translate", {"text": "Hi", "target": "xx"})[0] == 400
+        assert request(connection, "POST", "/translate", {"target": "es"})[0] == 400
+        assert request(connection, "POST", "/nowhere", {})[0] == 404
+        assert request(connection, "POST", "/translate/batch", {"texts": ["x"] * 101, "target": "es"})[0] == 400
+        
+        # Unexpected errors get a JSON 500 and the connection stays usable
+        status, body, _ = request(connection, "POST", "/translate", {"text": "Hi", "target": "boom"})
+        assert status == 500 and "resolver crashed" in body["error"]
+        
+        # Two workers + one queue slot: a batch needing more room than is left gets 503
+        slow = threading.Thread(target=lambda: request(http.client.HTTPConnection("127.0.0.1", port, timeout=5),
+                                                       "POST", "/translate/batch",
+                                                       {"texts": ["slow", "slow"], "target": "es"}))
+        slow.start()
+        time.sleep(0.1)
+        status, body, response = request(connection, "POST", "/translate/batch",
+                                         {"texts": ["a", "b"], "target": "es"})
+        assert status == 503 and response.getheader("Retry-After") == "1"
+        assert request(connection, "POST", "/translate", {"text": "fits", "target": "es"})[0] == 200
+        slow.join()
+        
+        status, health, _ = request(connection, "GET", "/health")
+        assert status == 200 and health["status"] == "ok" and health["queued"] == 0
+        status, metrics, _ = request(connection, "GET", "/metrics")
+        assert metrics["counts"]["rejected"] == 1 and metrics["counts"]["failed"] == 1
+        assert metrics["latency"]["translation"]["count"] == metrics["counts"]["translations"]
+        status, diagnostics, _ = request(connection, "GET", "/diagnostics")
+        assert status == 200 and diagnostics["queues"] == {"service waiting": 0, "service running": 0}
+        assert diagnostics["threads"]["groups"]["service-translate"] >= 1 and "translation" in diagnostics["latency"]
+        
+        # Throughput over keep-alive
+        start = time.perf_counter()
+        for i in range(200):
+            assert request(connection, "POST", "/translate", {"text": f"phrase {i}", "target": "de"})[0] == 200
+        elapsed = time.perf_counter() - start
+        print(f"200 requests on one connection in {elapsed * 1000:.0f}ms")
+        assert elapsed < 4  # no per-request reconnect or Nagle stall
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+    
+    # A timed-out request cancels its jobs that haven't started; the running one finishes
+    service = TranslationService(fake_translate, resolve, workers=1, queue_size=4)
+    try:
+        service.translate_many([("slow", "Spanish")] * 3, timeout=0.1)
+        assert False, "expected a timeout"
+    except TimeoutError:
+        pass
+    time.sleep(0.6)
+    assert service.health()["queued"] == 0 and service.health()["running"] == 0
+    assert service.metrics()["counts"]["translations"] == 1
+    service.close()
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_translation_server()
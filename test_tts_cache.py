@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy synthesized speech cache
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tts_cache import AudioCache, AudioPlayer
+
+class FakeEngine:
+    """Stand-in for a pyttsx3 engine that writes predictable audio files"""
+    def __init__(self):
+        self.properties = {"rate": 150, "voice": "default"}
+        self.pending = []
+        self.synthesized = 0
+    
+    def getProperty(self, name):
+        return self.properties[name]
+    
+    def setProperty(self, name, value):
+        self.properties[name] = value
+    
+    def save_to_file(self, text, path):
+        self.pending.append((text, path, self.properties["rate"]))
+    
+    def runAndWait(self):
+        for text, path, rate in self.pending:
+            with open(path, "wb") as f:
+                f.write(b"RIFF" + f"{text}@{rate}".encode("utf-8") * 100)
+            self.synthesized += 1
+        self.pending = []
+
+def test_audio_cache():
+    """Test cache hits, per-setting keys and size-bounded eviction"""
+    print("Testing Language Buddy Audio Cache...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = FakeEngine()
+        cache = AudioCache(temp_dir, max_bytes=10000)
+        
+        # Repeat playback reuses the rendered file
+        first = cache.get_or_render(engine, "Hola", "voice-es", 120)
+        second = cache.get_or_render(engine, "Hola", "voice-es", 120)
+        assert first == second
+        assert engine.synthesized == 1
+        print(f"Repeat lookup hit the cache: {cache.stats()}")
+        
+        # Rendering doesn't leave the engine on the practice rate
+        assert engine.getProperty("rate") == 150
+        
+        # Voice and rate are part of the key
+        cache.get_or_render(engine, "Hola", "voice-es", 150)
+        cache.get_or_render(engine, "Hola", "voice-fr", 120)
+        assert engine.synthesized == 3
+        
+        # Filling the cache evicts the least recently used files
+        cache.get("Hola", "voice-es", 120)
+        for i in range(20):
+            cache.get_or_render(engine, f"Word {i}", "voice-es", 120)
+        assert cache.total_bytes <= cache.max_bytes
+        assert cache.get("Hola", "voice-fr", 120) is None
+        print(f"Cache after eviction: {cache.stats()}")
+        
+        # A new cache instance picks up the files already on disk
+        reopened = AudioCache(temp_dir, max_bytes=10000)
+        assert reopened.get("Word 19", "voice-es", 120) is not None
+    
+    # A stop() that lands before play() starts still cancels the file; reset() re-arms the player
+    if not sys.platform.startswith("win"):
+        player = AudioPlayer()
+        player.command = [sys.executable, "-c", "import sys, time; time.sleep(float(sys.argv[1]))"]
+        player.stop()
+        start = time.perf_counter()
+        assert player.play("5")
+        assert time.perf_counter() - start < 1 and player.process is None
+        player.reset()
+        start = time.perf_counter()
+        assert player.play("0.2") and time.perf_counter() - start >= 0.2
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_audio_cache()
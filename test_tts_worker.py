@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy text-to-speech worker
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tts_worker import TTSWorker, Utterance
+
+class FakeEngine:
+    """Stand-in for a pyttsx3 engine that records which thread uses it"""
+    def __init__(self):
+        self.properties = {"rate": 150, "voice": "default", "volume": 0.9, "voices": []}
+        self.threads = set()
+        self.spoken = []
+        self.callbacks = {}
+        self.stopped = False
+    
+    def getProperty(self, name):
+        self.threads.add(threading.get_ident())
+        return self.properties[name]
+    
+    def setProperty(self, name, value):
+        self.threads.add(threading.get_ident())
+        self.properties[name] = value
+    
+    def connect(self, topic, callback):
+        self.callbacks[topic] = callback
+        return topic
+    
+    def disconnect(self, token):
+        self.callbacks.pop(token, None)
+    
+    def say(self, text):
+        self.text = text
+    
+    def stop(self):
+        self.stopped = True
+    
+    def runAndWait(self):
+        self.threads.add(threading.get_ident())
+        self.stopped = False
+        # Pretend each word takes a little while to speak
+        for position, word in enumerate(self.text.split()):
+            self.callbacks['started-word']("utterance", position, len(word))
+            if self.stopped:
+                return
+            time.sleep(0.05)
+        self.spoken.append((self.text, self.properties["rate"]))
+
+class NoPlayer:
+    """Player that reports no audio output, forcing direct synthesis"""
+    def available(self):
+        return False
+    
+    def reset(self):
+        pass
+    
+    def stop(self):
+        pass
+
+def test_tts_worker():
+    """Test per-utterance settings and interruption"""
+    print("Testing Language Buddy TTS Worker...")
+    
+    engine = FakeEngine()
+    worker = TTSWorker(lambda: engine, player=NoPlayer())
+    worker.start()
+    assert worker.ready.wait(2)
+    
+    # Queued utterances keep their own rates
+    finished = threading.Event()
+    worker.speak(Utterance("Hola", rate=120), interrupt=False)
+    worker.speak(Utterance("Gracias", rate=150, on_done=lambda u, done: finished.set()), interrupt=False)
+    assert finished.wait(2)
+    assert engine.spoken == [("Hola", 120), ("Gracias", 150)]
+    print(f"Spoken with own settings: {engine.spoken}")
+    
+    # Rapid clicks replace the current utterance instead of stacking up
+    results = []
+    done = threading.Event()
+    def record(utterance, completed):
+        results.append((utterance.text, completed))
+        if utterance.text == "last":
+            done.set()
+    
+    worker.speak(Utterance("one two three four five six seven eight", on_done=record))
+    time.sleep(0.1)
+    for i in range(10):
+        worker.speak(Utterance(f"click {i}", on_done=record))
+    worker.speak(Utterance("last", on_done=record))
+    assert done.wait(2)
+    
+    assert results[-1] == ("last", True)
+    assert all(not completed for text, completed in results[:-1])
+    assert engine.spoken[-1][0] == "last"
+    print(f"Interrupted {len(results) - 1} utterances, spoke only the last one")
+    
+    # The engine is only ever touched from the worker thread
+    assert engine.threads == {worker.ident}
+    
+    worker.shutdown()
+    worker.join(2)
+    assert not worker.is_alive()
+    print("\nTest completed!")
+
+class FakeCache:
+    """Audio cache stand-in that records what was rendered"""
+    def __init__(self):
+        self.rendered = []
+        self.render_started = threading.Event()
+    
+    def contains(self, text, voice, rate):
+        return any(item[0] == text for item in self.rendered)
+    
+    def render(self, engine, text, voice, rate):
+        self.render_started.set()
+        time.sleep(0.05)
+        self.rendered.append((text, rate))
+        return f"{text}.wav"
+
+def test_tts_prefetch():
+    """Test background pre-synthesis and its cancellation"""
+    print("Testing Language Buddy TTS Prefetch...")
+    
+    engine = FakeEngine()
+    cache = FakeCache()
+    worker = TTSWorker(lambda: engine, audio_cache=cache, player=NoPlayer())
+    worker.start()
+    assert worker.ready.wait(2)
+    
+    # Prefetched words end up in the cache without being spoken
+    screen = threading.Event()
+    worker.prefetch([Utterance(word, rate=120) for word in ["Hola", "Gracias", "Hola"]], screen)
+    deadline = time.time() + 2
+    while worker.pending_prefetch() and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert cache.rendered == [("Hola", 120), ("Gracias", 120)]
+    assert engine.spoken == []
+    
+    # Leaving the screen drops the jobs that haven't run yet
+    cache.render_started.clear()
+    screen = threading.Event()
+    worker.prefetch([Utterance(f"Word {i}", rate=120) for i in range(50)], screen)
+    assert cache.render_started.wait(2)
+    worker.cancel_prefetch(screen)
+    time.sleep(0.2)
+    assert len(cache.rendered) < 10
+    assert worker.pending_prefetch() == 0
+    print(f"Rendered {len(cache.rendered) - 2} of 50 words before cancelling")
+    
+    worker.shutdown()
+    worker.join(2)
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_tts_worker()
+    test_tts_prefetch()
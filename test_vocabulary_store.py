@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy vocabulary store
+"""
+
+import sys
+import os
+import datetime
+import json
+import tempfile
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Translations made by the test go to a shared cache of its own, removed when the run ends,
+# not ./translation_cache.db or one left over from an earlier run
+CACHE_DIR = tempfile.TemporaryDirectory()
+os.environ.setdefault("LANGUAGE_BUDDY_CACHE_DB", os.path.join(CACHE_DIR.name, "translation_cache.db"))
+
+from vocabulary_store import VocabularyStore
+from language_buddy import LANGUAGES
+
+def test_vocabulary_store():
+    """Test bundled vocabularies, lazy loading and indexed access"""
+    print("Testing Language Buddy Vocabulary Store...")
+    
+    store = VocabularyStore()
+    assert set(store.available_languages()) == set(LANGUAGES.values())
+    assert store.loaded == {}  # nothing read until a language is used
+    
+    for name, code in LANGUAGES.items():
+        vocabulary = store.get(code)
+        assert len(vocabulary) >= 40, name
+        assert all(word.word and word.english and word.pronunciation for word in vocabulary.words), name
+        ranks = [word.rank for word in vocabulary.words]
+        assert ranks == sorted(ranks)
+        assert len(vocabulary.daily_words(4)) == 4
+    assert store.get("es").get("hello").word == "Hola"
+    assert store.get("ja").get("thank_you").pronunciation
+    
+    # A language without a file is empty rather than another language's words
+    assert len(store.get("xx")) == 0 and store.get("xx").daily_words() == []
+    
+    # Large vocabularies stay quick to load and query
+    with tempfile.TemporaryDirectory() as temp_dir:
+        words = [{"id": f"w{i}", "english": f"word {i}", "word": f"palabra {i}", "pronunciation": "",
+                  "rank": i + 1, "pos": "noun", "topic": f"topic {i % 50}", "lesson": i // 100 + 1}
+                 for i in range(30000)]
+        with open(os.path.join(temp_dir, "es.json"), "w", encoding="utf-8") as f:
+            json.dump({"language": "es", "words": words}, f)
+        
+        large = VocabularyStore(temp_dir)
+        start = time.perf_counter()
+        vocabulary = large.get("es")
+        load_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for day in range(1000):
+            vocabulary.daily_words(4, datetime.date(2024, 1, 1) + datetime.timedelta(days=day))
+            vocabulary.random(10)
+            vocabulary.lesson(day % 300 + 1)
+        query_time = time.perf_counter() - start
+        
+        assert vocabulary.ranked(0, 3)[0].id == "w0"
+        assert len(vocabulary.lesson(7)) == 100
+        assert len(vocabulary.by_topic["topic 3"]) == 600
+        print(f"Loaded 30000 words in {load_time * 1000:.0f}ms, 3000 queries in {query_time * 1000:.0f}ms")
+        assert query_time < 1.0
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_vocabulary_store()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script for Language Buddy voice-activity trimming
+"""
+
+import sys
+import os
+import math
+import struct
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import speech_recognition as sr
+from voice_activity import split_utterances, trim_silence, find_speech_regions, SessionVADStats
+
+SAMPLE_RATE = 16000
+
+def pcm(seconds, tone=True):
+    """Mono 16-bit samples: a 440 Hz tone or pure silence"""
+    frames = bytearray()
+    for i in range(int(seconds * SAMPLE_RATE)):
+        value = int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE)) if tone else 0
+        frames += struct.pack("<h", value)
+    return bytes(frames)
+
+def test_voice_activity():
+    """Test that silence is trimmed and long pauses split a recording"""
+    print("Testing Language Buddy Voice Activity Detection...")
+    
+    raw = pcm(1.0, tone=False) + pcm(0.6) + pcm(1.2, tone=False) + pcm(0.5) + pcm(1.0, tone=False)
+    audio = sr.AudioData(raw, SAMPLE_RATE, 2)
+    
+    utterances, stats = split_utterances(audio, energy_threshold=300)
+    assert len(utterances) == 2
+    assert stats.utterances == 2
+    assert stats.bytes_saved > len(raw) // 2
+    assert stats.seconds_saved > 2.0
+    assert all(isinstance(utterance, sr.AudioData) for utterance in utterances)
+    print(f"Split: {stats.summary()}")
+    
+    # Without a calibrated threshold the noise floor is estimated from the clip
+    utterances, _ = split_utterances(audio)
+    assert len(utterances) == 2
+    
+    # Trimming keeps the pause between the two phrases
+    trimmed, stats = trim_silence(audio, energy_threshold=300)
+    assert trimmed is not None and stats.utterances == 1
+    assert 2.0 < len(trimmed.frame_data) / (SAMPLE_RATE * 2) < 3.0
+    
+    # Pure silence yields nothing to recognize
+    utterances, stats = split_utterances(sr.AudioData(pcm(1.0, tone=False), SAMPLE_RATE, 2), energy_threshold=300)
+    assert utterances == [] and stats.bytes_saved == stats.input_bytes
+    
+    # A click shorter than min_speech is ignored
+    assert find_speech_regions([False] * 10 + [True] + [False] * 10) == []
+    
+    session = SessionVADStats()
+    session.add(stats)
+    session.add(stats)
+    assert session.input_bytes == 2 * stats.input_bytes
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_voice_activity()
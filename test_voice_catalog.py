@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the Language Buddy voice catalog
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import voice_catalog
+from voice_catalog import VoiceCatalog
+
+class FakeVoice:
+    def __init__(self, voice_id, name, languages=None, gender=None):
+        self.id = voice_id
+        self.name = name
+        self.languages = languages or []
+        self.gender = gender
+
+class FakeEngine:
+    def __init__(self, voices):
+        self.voices = voices
+        self.scans = 0
+    
+    def getProperty(self, name):
+        assert name == 'voices'
+        self.scans += 1
+        return self.voices
+
+WINDOWS_VOICES = [
+    FakeVoice(r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Speech\Voices\Tokens\TTS_MS_EN-US_DAVID_11.0", "Microsoft David Desktop - English (United States)"),
+    FakeVoice(r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Speech\Voices\Tokens\TTS_MS_EN-US_ZIRA_11.0", "Microsoft Zira Desktop - English (United States)"),
+    FakeVoice(r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Speech\Voices\Tokens\TTS_MS_ES-ES_HELENA_11.0", "Microsoft Helena Desktop - Spanish (Spain)"),
+    FakeVoice(r"HKEY_LOCAL_MACHINE\SOFTWARE\Microsoft\Speech\Voices\Tokens\TTS_MS_JA-JP_HARUKA_11.0", "Microsoft Haruka Desktop - Japanese"),
+]
+
+ESPEAK_VOICES = [
+    FakeVoice("gmw/en", "English (Great Britain)", [b"\x02en-gb"], "male"),
+    FakeVoice("roa/fr", "French", [b"\x05fr-fr"], "male"),
+    FakeVoice("inc/ur", "Urdu", [b"\x05ur"], "male"),
+    FakeVoice("inc/hi", "Hindi", [b"\x05hi"], "male"),
+]
+
+def test_voice_catalog():
+    """Test the language index and the on-disk cache"""
+    print("Testing Language Buddy Voice Catalog...")
+    
+    catalog = VoiceCatalog.from_engine(FakeEngine(WINDOWS_VOICES))
+    assert catalog.voice_for("es").endswith("HELENA_11.0")
+    assert catalog.voice_for("ja").endswith("HARUKA_11.0")
+    assert catalog.voice_for("en").endswith("ZIRA_11.0")  # female voices are preferred
+    assert catalog.voice_for("ur") is None
+    assert catalog.default_voice.endswith("ZIRA_11.0")
+    print(f"Windows voices by language: {sorted(catalog.by_language)}")
+    
+    catalog = VoiceCatalog.from_engine(FakeEngine(ESPEAK_VOICES))
+    assert catalog.voice_for("ur") == "inc/ur"
+    assert catalog.voice_for("hi") == "inc/hi"
+    assert catalog.voice_for("fr") == "roa/fr"
+    print(f"espeak voices by language: {sorted(catalog.by_language)}")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "voices.json")
+        original_fingerprint = voice_catalog.installed_voices_fingerprint
+        try:
+            voice_catalog.installed_voices_fingerprint = lambda: "fingerprint-1"
+            engine = FakeEngine(WINDOWS_VOICES)
+            VoiceCatalog.load_or_scan(engine, path)
+            cached = VoiceCatalog.load_or_scan(engine, path)
+            assert engine.scans == 1
+            assert cached.voice_for("es").endswith("HELENA_11.0")
+            
+            # Installing or removing voices invalidates the cache
+            voice_catalog.installed_voices_fingerprint = lambda: "fingerprint-2"
+            engine.voices = ESPEAK_VOICES
+            rescanned = VoiceCatalog.load_or_scan(engine, path)
+            assert engine.scans == 2
+            assert rescanned.voice_for("ur") == "inc/ur"
+        finally:
+            voice_catalog.installed_voices_fingerprint = original_fingerprint
+    
+    print("\nTest completed!")
+
+if __name__ == "__main__":
+    test_voice_catalog()
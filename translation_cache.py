@@ -0,0 +1,219 @@
+"""
+Translation cache for Language Buddy
+Finished translations are kept in memory keyed by (target language, text),
+least recently used first out, so repeating a phrase or re-translating the
+unchanged sentences of a longer text never goes back to the network.
+Misses fall through to an optional SQLite cache in WAL mode that every app
+window and batch worker on the computer reads and writes at the same time
+"""
+
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+DEFAULT_CAPACITY = 5000  # translations kept in memory
+SHARED_CACHE_DB_FILE = "translation_cache.db"
+SHARED_CACHE_MAX_ENTRIES = 200000
+
+class _ThreadConnection:
+    """One thread's connection, closed as soon as the thread ends and its thread-local
+    storage is dropped. A bare connection would wait for the garbage collector, since
+    sqlite3 connections sit in a reference cycle with their statement cache"""
+    __slots__ = ("conn", "__weakref__")
+    
+    def __init__(self, conn):
+        self.conn = conn
+    
+    def close(self):
+        try:
+            self.conn.close()
+        except sqlite3.ProgrammingError:
+            pass  # opened by a thread that is still using it
+    
+    __del__ = close
+
+class SharedTranslationCache:
+    """Translations shared between processes through one SQLite file.
+    Each thread gets its own connection, and WAL mode lets readers run
+    alongside a writer, so lookups never wait on a Python lock"""
+    
+    def __init__(self, db_path=SHARED_CACHE_DB_FILE, max_entries=SHARED_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.local = threading.local()
+        # Weak, so a thread's connection goes away with the thread - the app starts
+        # short-lived worker threads all the time
+        self.connections = weakref.WeakSet()
+        self.connections_lock = threading.Lock()  # only taken when a thread opens its connection
+        self.puts = 0
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " target TEXT NOT NULL,"
+            " source_text TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (target, source_text))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_created ON translations (created_at)")
+        conn.commit()
+    
+    def _connection(self):
+        holder = getattr(self.local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            holder = self.local.holder = _ThreadConnection(conn)
+            with self.connections_lock:
+                self.connections.add(holder)
+        return holder.conn
+    
+    def get(self, text, target):
+        row = self._connection().execute(
+            "SELECT translation FROM translations WHERE target = ? AND source_text = ?",
+            TranslationCache.make_key(text, target)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, text, target, translation):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations (target, source_text, translation, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                TranslationCache.make_key(text, target) + (translation, time.time())
+            )
+        self.puts += 1
+        if self.puts % 1000 == 0:
+            self.prune()
+    
+    def prune(self):
+        """Drop the oldest translations once the file holds more than max_entries"""
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "DELETE FROM translations WHERE created_at <= (SELECT created_at FROM translations"
+                " ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    
+    def close(self):
+        """Close every thread's connection"""
+        with self.connections_lock:
+            for holder in list(self.connections):
+                holder.close()
+            self.connections.clear()
+        self.local = threading.local()
+
+class TranslationCache:
+    def __init__(self, capacity=DEFAULT_CAPACITY, shared=None, open_shared=None, version=None):
+        self.capacity = capacity
+        self.version = version        # setup the translations depend on (glossary, providers); None = unversioned
+        self.shared = shared          # SharedTranslationCache consulted on a miss, or None
+        self.open_shared = open_shared  # callable() -> SharedTranslationCache or None, called on first use
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (target, text) -> translation, least recently used first
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(text, target):
+        return (target, text.strip())
+    
+    def _scoped(self, target):
+        """Target code tagged with the version, so entries made under another setup never match"""
+        return f"{target}@{self.version}" if self.version else target
+    
+    def get(self, text, target, count=True):
+        """Cached translation of text into target (a language code), or None.
+        Background lookups pass count=False so they don't skew the hit rate"""
+        target = self._scoped(target)
+        key = self.make_key(text, target)
+        with self.lock:
+            translation = self.entries.get(key)
+            if translation is not None:
+                self.entries.move_to_end(key)
+                self.hits += count
+                return translation
+        
+        translation = self._shared_get(text, target)
+        with self.lock:
+            if translation is None:
+                self.misses += count
+                return None
+            self.shared_hits += count
+            self._remember(key, translation)
+            return translation
+    
+    def contains(self, text, target):
+        """True if a translation is cached (doesn't count as a lookup)"""
+        target = self._scoped(target)
+        with self.lock:
+            if self.make_key(text, target) in self.entries:
+                return True
+        return self._shared_get(text, target) is not None
+    
+    def put(self, text, target, translation):
+        """Remember a translation, evicting the least recently used ones past capacity"""
+        target = self._scoped(target)
+        with self.lock:
+            self._remember(self.make_key(text, target), translation)
+        shared = self._shared_cache()
+        if shared is not None:
+            try:
+                shared.put(text, target, translation)
+            except sqlite3.Error as e:
+                print(f"Shared translation cache write failed: {e}")
+    
+    def _remember(self, key, translation):
+        self.entries[key] = translation
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+    
+    def _shared_cache(self):
+        """The shared cache, opened the first time it's needed so importing never creates a file"""
+        if self.open_shared is not None:
+            with self.lock:
+                if self.open_shared is not None:
+                    self.shared = self.open_shared()
+                    self.open_shared = None
+        return self.shared
+    
+    def _shared_get(self, text, target):
+        shared = self._shared_cache()
+        if shared is None:
+            return None
+        try:
+            return shared.get(text, target)
+        except sqlite3.Error as e:
+            print(f"Shared translation cache read failed: {e}")
+            return None
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+    
+    def stats(self):
+        """Summary numbers for diagnostics"""
+        with self.lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,116 @@
+"""
+Translation history store for Language Buddy
+Keeps every translation in a small SQLite database so the history screen
+can page through it on demand instead of loading everything into memory
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+
+HISTORY_DB_FILE = "translation_history.db"
+
+class TranslationHistory:
+    def __init__(self, db_path=HISTORY_DB_FILE):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " created_at TEXT NOT NULL,"
+                " source_text TEXT NOT NULL,"
+                " translated_text TEXT NOT NULL,"
+                " target_language TEXT NOT NULL,"
+                " mode TEXT NOT NULL DEFAULT 'text')"
+            )
+            # Nothing filters by language; older databases drop the index instead of maintaining it
+            self.conn.execute("DROP INDEX IF EXISTS idx_history_language")
+            self.conn.commit()
+    
+    def add(self, source_text, translated_text, target_language, mode="text"):
+        """Record a finished translation and return its row id"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO history (created_at, source_text, translated_text, target_language, mode)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), source_text,
+                 translated_text, target_language, mode)
+            )
+            self.conn.commit()
+            return cursor.lastrowid
+    
+    def add_many(self, entries):
+        """Record several (source, translation, language, mode) tuples in one transaction"""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO history (created_at, source_text, translated_text, target_language, mode)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(now, source, translated, language, mode)
+                 for source, translated, language, mode in entries]
+            )
+            self.conn.commit()
+    
+    def _where(self, search, before_id=None):
+        """Build the WHERE clause for an optional substring search, below an optional row id"""
+        conditions = []
+        params = ()
+        search = (search or "").strip()
+        if search:
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            conditions.append("(source_text LIKE ? ESCAPE '\\' OR translated_text LIKE ? ESCAPE '\\')")
+            params += (pattern, pattern)
+        if before_id is not None:
+            conditions.append("id < ?")
+            params += (int(before_id),)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+    
+    def count(self, search=""):
+        """Number of entries matching the search (all entries when empty)"""
+        where, params = self._where(search)
+        with self.lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+    
+    def fetch(self, offset, limit, search="", before_id=None):
+        """Fetch one page of entries, newest first.
+        With before_id (the last id of the previous page) the page starts right after it through the
+        primary key, so scrolling on stays as fast at the end of the history as at the start;
+        offset is only used to jump straight into the middle"""
+        where, params = self._where(search, before_id)
+        if before_id is not None:
+            offset = 0
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, created_at, source_text, translated_text, target_language, mode"
+                f" FROM history{where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                params + (int(limit), int(offset))
+            ).fetchall()
+        return [
+            {"id": row[0], "created_at": row[1], "source_text": row[2],
+             "translated_text": row[3], "target_language": row[4], "mode": row[5]}
+            for row in rows
+        ]
+    
+    def frequent_sources(self, limit=50):
+        """The texts translated most often (in any language), most frequent first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT source_text FROM history GROUP BY source_text"
+                " ORDER BY COUNT(*) DESC, MAX(id) DESC LIMIT ?",
+                (int(limit),)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def clear(self):
+        """Delete every history entry"""
+        with self.lock:
+            self.conn.execute("DELETE FROM history")
+            self.conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection"""
+        with self.lock:
+            self.conn.close()
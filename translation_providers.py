@@ -0,0 +1,391 @@
+"""
+Translation providers for Language Buddy
+Each online translation service sits behind the same translate(text, source,
+target) call, and the chain tries them in priority order. The chain is
+configured per deployment with a JSON file - providers.json next to the app,
+or the file named by LANGUAGE_BUDDY_PROVIDERS - so a self-hosted
+LibreTranslate server or an in-house backend can be added, reordered or
+limited to some languages without touching the code:
+
+    {"providers": [
+        {"name": "office-libre", "type": "libretranslate",
+         "url": "http://10.0.0.5:5000/translate", "timeout": 2, "priority": 1},
+        {"name": "mymemory", "enabled": false},
+        {"name": "inhouse", "type": "module", "function": "our_mt:translate",
+         "languages": ["de", "fr"], "priority": 5}
+    ]}
+
+Entries named like a built-in provider change its settings; other entries
+add providers. "include_defaults": false drops the built-in ones
+
+A provider that keeps failing is skipped for a while (its circuit opens)
+instead of making every translation wait for its timeout again
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from perf_timing import LatencyStats
+
+try:
+    import requests
+    requests_available = True
+except ImportError:
+    requests = None
+    requests_available = False
+
+try:
+    from deep_translator import GoogleTranslator
+    deep_translator_available = True
+except ImportError:
+    deep_translator_available = False
+
+try:
+    from googletrans import Translator
+    googletrans_available = True
+except ImportError:
+    googletrans_available = False
+
+PROVIDERS_ENV_VAR = "LANGUAGE_BUDDY_PROVIDERS"
+PROVIDERS_FILE = "providers.json"
+DEFAULT_TIMEOUT = 10.0
+FAILURE_THRESHOLD = 3       # failures in a row that open a provider's circuit
+RESET_TIMEOUT = 60.0        # seconds an open circuit waits before letting one trial request through
+
+# deep-translator names some languages differently
+DEEP_TRANSLATOR_CODES = {"zh": "zh-CN"}
+
+class CircuitBreaker:
+    """Closed: requests go through. Open: requests are skipped until reset_timeout has passed.
+    Half-open: one trial request decides whether the circuit closes again or stays open"""
+    
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT, clock=time.monotonic):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.failures = 0           # in a row
+        self.opened_at = None
+        self.trial_running = False
+        self.times_opened = 0
+    
+    @property
+    def state(self):
+        with self.lock:
+            return self._state()
+    
+    def _state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+    
+    def allow(self):
+        """True if a request may be sent now; a half-open circuit lets only one through at a time"""
+        with self.lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+    
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                self.times_opened += 1
+            self.trial_running = False
+    
+    def retry_in(self):
+        """Seconds until an open circuit lets a trial request through (0 unless open)"""
+        with self.lock:
+            if self._state() != "open":
+                return 0.0
+            return self.reset_timeout - (self.clock() - self.opened_at)
+
+class TranslationProvider:
+    type = "base"
+    
+    def __init__(self, name=None, timeout=DEFAULT_TIMEOUT, priority=50, languages=None, enabled=True,
+                 failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.name = name or self.type
+        self.timeout = float(timeout)
+        self.priority = priority
+        self.languages = set(languages) if languages else None  # target codes served, None = all
+        self.enabled = enabled
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.lock = threading.Lock()
+        self.executor = None    # for call_with_timeout, made on first use
+    
+    def is_available(self):
+        return True
+    
+    def supports(self, target):
+        return self.enabled and (self.languages is None or target in self.languages)
+    
+    def translate(self, text, source, target):
+        """Translation of text from source (a code, or None for unknown) into target, or None"""
+        raise NotImplementedError
+    
+    def call_with_timeout(self, function, *args):
+        """function(*args), raising TimeoutError once self.timeout seconds pass - for client libraries
+        that take no timeout of their own. A call that times out can't be interrupted: it keeps one
+        of the helper threads until the library gives up"""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"{self.name}-call")
+        return self.executor.submit(function, *args).result(timeout=self.timeout)
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, priority={self.priority}, timeout={self.timeout:g}s)"
+
+class DeepTranslatorProvider(TranslationProvider):
+    """Google Translate through the deep-translator package"""
+    type = "deep_translator"
+    
+    def is_available(self):
+        return deep_translator_available
+    
+    def translate(self, text, source, target):
+        translator = GoogleTranslator(source=DEEP_TRANSLATOR_CODES.get(source, source or "auto"),
+                                      target=DEEP_TRANSLATOR_CODES.get(target, target))
+        return self.call_with_timeout(translator.translate, text)  # deep-translator has no timeout setting
+
+class GoogleTransProvider(TranslationProvider):
+    """Google Translate through the googletrans package"""
+    type = "googletrans"
+    
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.translator = None
+    
+    def is_available(self):
+        return googletrans_available
+    
+    def translate(self, text, source, target):
+        if self.translator is None:
+            self.translator = Translator(timeout=self.timeout)
+        translation = self.translator.translate(text, src=source or "auto", dest=target)
+        return translation.text if translation else None
+
+class MyMemoryProvider(TranslationProvider):
+    """MyMemory's free REST API"""
+    type = "mymemory"
+    
+    def __init__(self, url="https://api.mymemory.translated.net/get", email=None, **options):
+        super().__init__(**options)
+        self.url = url
+        self.email = email  # raises the free daily quota
+    
+    def is_available(self):
+        return requests_available
+    
+    def translate(self, text, source, target):
+        # An unknown source is left to MyMemory's own detection rather than assumed to be English
+        params = {"q": text, "langpair": f"{source or 'autodetect'}|{target}"}
+        if self.email:
+            params["de"] = self.email
+        response = requests.get(self.url, params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        if data.get("responseStatus") != 200:
+            return None
+        return data["responseData"]["translatedText"]
+
+class LibreTranslateProvider(TranslationProvider):
+    """A LibreTranslate server - the public one by default, or a self-hosted instance"""
+    type = "libretranslate"
+    
+    def __init__(self, url="https://libretranslate.de/translate", api_key=None, **options):
+        super().__init__(**options)
+        self.url = url
+        self.api_key = api_key
+        self.session = None  # keeps the connection to the server open between requests
+    
+    def is_available(self):
+        return requests_available
+    
+    def translate(self, text, source, target):
+        if self.session is None:
+            self.session = requests.Session()
+        data = {"q": text, "source": source or "auto", "target": target, "format": "text"}
+        if self.api_key:
+            data["api_key"] = self.api_key
+        response = self.session.post(self.url, data=data, timeout=self.timeout)
+        if response.status_code != 200:
+            return None
+        return response.json().get("translatedText")
+
+class ModuleProvider(TranslationProvider):
+    """Custom backend: a Python function "package.module:function" called as function(text, source, target)"""
+    type = "module"
+    
+    def __init__(self, function=None, **options):
+        super().__init__(**options)
+        if not function or ":" not in function:
+            raise ValueError(f"Provider '{self.name}' needs \"function\": \"module:function\"")
+        self.function_path = function
+        self.function = None
+    
+    def is_available(self):
+        module_name = self.function_path.split(":", 1)[0]
+        try:
+            return importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            return False
+    
+    def translate(self, text, source, target):
+        if self.function is None:
+            module_name, function_name = self.function_path.split(":", 1)
+            self.function = getattr(importlib.import_module(module_name), function_name)
+        return self.function(text, source, target)
+    
+    def __repr__(self):
+        return f"ModuleProvider({self.name!r}, {self.function_path!r}, priority={self.priority})"
+
+PROVIDER_TYPES = {
+    provider.type: provider
+    for provider in (DeepTranslatorProvider, GoogleTransProvider, MyMemoryProvider,
+                     LibreTranslateProvider, ModuleProvider)
+}
+
+# Built-in chain, in the order the app has always tried them
+DEFAULT_PROVIDERS = [
+    {"name": "deep_translator", "type": "deep_translator", "priority": 10},
+    {"name": "googletrans", "type": "googletrans", "priority": 20},
+    {"name": "mymemory", "type": "mymemory", "priority": 30},
+    {"name": "libretranslate", "type": "libretranslate", "priority": 40},
+]
+
+class ProviderChain:
+    """Tries the providers serving a language in priority order until one returns a real translation"""
+    
+    def __init__(self, providers, unavailable=()):
+        self.providers = sorted(providers, key=lambda provider: provider.priority)
+        self.unavailable = list(unavailable)    # names of configured providers that aren't installed
+        self.latency = LatencyStats()
+        self.lock = threading.Lock()
+        self.counts = {provider.name: {"calls": 0, "successes": 0, "failures": 0, "skipped": 0}
+                       for provider in self.providers}
+    
+    def for_language(self, target):
+        return [provider for provider in self.providers if provider.supports(target)]
+    
+    def _count(self, provider, outcome):
+        with self.lock:
+            self.counts[provider.name][outcome] += 1
+    
+    def translate(self, text, source, target):
+        """(translation, provider name), or (None, None) when every provider failed"""
+        for provider in self.for_language(target):
+            if not provider.breaker.allow():
+                self._count(provider, "skipped")
+                continue
+            self._count(provider, "calls")
+            start = time.perf_counter()
+            try:
+                translated_text = provider.translate(text, source, target)
+            except Exception as e:
+                translated_text = None
+                print(f"{provider.name} error: {e}")
+            self.latency.add(provider.name, time.perf_counter() - start)
+            
+            if translated_text is None:
+                # Errors and refusals (quota, bad status) count against the provider
+                provider.breaker.record_failure()
+                self._count(provider, "failures")
+                if provider.breaker.state == "open":
+                    print(f"{provider.name} keeps failing - skipping it for {provider.breaker.reset_timeout:g}s")
+                continue
+            provider.breaker.record_success()
+            if translated_text.strip() and translated_text.lower() != text.lower():
+                self._count(provider, "successes")
+                print(f"{provider.name} success: {translated_text}")
+                return translated_text, provider.name
+            print(f"{provider.name} returned same text or empty: {translated_text}")
+        return None, None
+    
+    def stats(self):
+        """Per provider: circuit state, call counts and latency percentiles, in the order they're tried"""
+        latency = self.latency.report()
+        with self.lock:
+            counts = {name: dict(row) for name, row in self.counts.items()}
+        return [
+            dict(counts[provider.name], name=provider.name, state=provider.breaker.state,
+                 retry_in=round(provider.breaker.retry_in(), 1),
+                 p50=latency.get(provider.name, {}).get("p50"), p95=latency.get(provider.name, {}).get("p95"))
+            for provider in self.providers
+        ]
+    
+    def __repr__(self):
+        names = ", ".join(provider.name for provider in self.providers) or "no providers available"
+        if self.unavailable:
+            names += f"; not installed: {', '.join(self.unavailable)}"
+        return f"ProviderChain({names})"
+
+def create_provider(entry):
+    """Build one provider from a config entry"""
+    options = dict(entry)
+    provider_type = options.pop("type", None)
+    if provider_type not in PROVIDER_TYPES:
+        raise ValueError(f"Unknown translation provider type '{provider_type}'. "
+                         f"Choose from: {', '.join(sorted(PROVIDER_TYPES))}")
+    return PROVIDER_TYPES[provider_type](**options)
+
+def merge_config(config):
+    """Built-in provider entries updated and extended by a config dict"""
+    entries = [dict(entry) for entry in DEFAULT_PROVIDERS] if config.get("include_defaults", True) else []
+    by_name = {entry["name"]: entry for entry in entries}
+    for entry in config.get("providers", []):
+        if not entry.get("name"):
+            raise ValueError(f"Translation provider entry without a name: {entry}")
+        if entry["name"] in by_name:
+            by_name[entry["name"]].update(entry)
+        else:
+            entry = dict(entry)
+            entries.append(entry)
+            by_name[entry["name"]] = entry
+    return entries
+
+def load_providers(path=None):
+    """The provider chain from path, $LANGUAGE_BUDDY_PROVIDERS or ./providers.json, skipping packages that
+    aren't installed. Without a config file the built-in chain is used"""
+    path = path or os.environ.get(PROVIDERS_ENV_VAR)
+    if not path and os.path.exists(PROVIDERS_FILE):
+        path = PROVIDERS_FILE
+    config = {}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    
+    return build_chain(merge_config(config))
+
+def build_chain(entries=DEFAULT_PROVIDERS):
+    """Provider chain for a list of config entries (the built-in ones by default)"""
+    providers = []
+    unavailable = []
+    for entry in entries:
+        provider = create_provider(entry)
+        if provider.is_available():
+            providers.append(provider)
+        else:
+            unavailable.append(provider.name)
+            print(f"Translation provider '{provider.name}' is not installed - skipping", file=sys.stderr)
+    return ProviderChain(providers, unavailable)
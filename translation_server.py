@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Headless translation service for Language Buddy
+Serves the app's translation chain (cache, providers and offline fallbacks)
+over local HTTP for backends that have no desktop. Translations run on a
+fixed pool of worker threads behind a bounded queue: once the queue is full
+new requests get 503 with Retry-After instead of piling up. Connections are
+kept alive between requests (HTTP/1.1)
+
+Endpoints:
+    POST /translate          {"text": "Good morning", "target": "fr"}
+    POST /translate/batch    {"texts": ["Hello", "Thank you"], "target": "Spanish"}
+    POST /translate/fanout   {"text": "Hello", "targets": ["es", "fr", "de"]}
+    GET  /health
+    GET  /metrics
+    GET  /diagnostics        cache, providers, threads, queues and (with --trace-memory) memory
+
+Usage:
+    python translation_server.py --port 8765 --workers 4 --queue 64
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from perf_timing import LatencyStats
+from diagnostics import collect
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_SIZE = 100
+REQUEST_TIMEOUT = 60.0  # seconds a request may wait for its translations
+
+class ServiceBusy(Exception):
+    """The worker queue is full; the client should retry later"""
+
+class TranslationService:
+    def __init__(self, translate, resolve_language, workers=4, queue_size=64, cache_stats=None, diagnostics=None):
+        self.translate = translate                  # callable(text, language_name) -> translation
+        self.resolve_language = resolve_language    # callable(name or code) -> language name or None
+        self.cache_stats = cache_stats              # callable() -> dict, reported under /metrics
+        self.diagnostics = diagnostics              # callable(queues) -> dict, reported under /diagnostics
+        self.workers = workers
+        self.capacity = workers + queue_size        # translations running plus waiting
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service-translate")
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.counts = {"requests": 0, "translations": 0, "failed": 0, "rejected": 0, "timeouts": 0}
+        self.latency = LatencyStats()
+        self.started_at = time.time()
+    
+    def _admit(self, count):
+        """Reserve queue room for count translations, all or nothing"""
+        with self.lock:
+            self.counts["requests"] += 1
+            if self.pending + count > self.capacity:
+                self.counts["rejected"] += 1
+                raise ServiceBusy(f"{self.pending} translations already queued")
+            self.pending += count
+    
+    def _run(self, text, target, queued_at):
+        with self.lock:
+            self.running += 1
+        start = time.perf_counter()
+        self.latency.add("queue wait", start - queued_at)
+        failed = True
+        result = {"text": text, "target": target}
+        try:
+            translation = self.translate(text, target)
+            failed = translation.startswith("⚠️")
+            result["error" if failed else "translation"] = translation
+        except Exception as e:
+            print(f"Service translation error: {e}", file=sys.stderr)
+            result["error"] = f"Translation failed: {e}"
+        finally:
+            self.latency.add("translation", time.perf_counter() - start)
+            with self.lock:
+                self.running -= 1
+                self.pending -= 1
+                self.counts["translations"] += 1
+                if failed:
+                    self.counts["failed"] += 1
+        return result
+    
+    def translate_many(self, jobs, timeout=REQUEST_TIMEOUT):
+        """Translate (text, language name) pairs on the pool; results in job order.
+        On timeout the jobs still waiting for a worker are cancelled; ones already running
+        can't be interrupted and finish in the background (their results still reach the cache)"""
+        self._admit(len(jobs))
+        queued_at = time.perf_counter()
+        futures = [self.executor.submit(self._run, text, target, queued_at) for text, target in jobs]
+        deadline = time.monotonic() + timeout
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(max(0.0, deadline - time.monotonic())))
+            except TimeoutError:
+                cancelled = sum(1 for waiting in futures if waiting.cancel())
+                with self.lock:
+                    self.counts["timeouts"] += 1
+                    self.pending -= cancelled  # _run never starts for these, so release their room here
+                raise
+        self.latency.add("request", time.perf_counter() - queued_at)
+        return results
+    
+    def health(self):
+        with self.lock:
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "running": self.running,
+                "queued": self.pending - self.running,
+                "capacity": self.capacity,
+                "uptime": round(time.time() - self.started_at, 1),
+            }
+    
+    def metrics(self):
+        with self.lock:
+            metrics = {"counts": dict(self.counts), "running": self.running,
+                       "queued": self.pending - self.running, "capacity": self.capacity}
+        metrics["latency"] = self.latency.report()
+        if self.cache_stats:
+            metrics["cache"] = self.cache_stats()
+        return metrics
+    
+    def diagnostics_report(self):
+        queues = {
+            "service waiting": lambda: self.health()["queued"],
+            "service running": lambda: self.health()["running"],
+        }
+        report = self.diagnostics(queues) if self.diagnostics else collect(queues=queues)
+        report["latency"] = self.latency.report()
+        return report
+    
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class BadRequest(Exception):
+    pass
+
+class TranslationRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep connections open between requests
+    server_version = "LanguageBuddy/1.0"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    
+    def do_GET(self):
+        service = self.server.service
+        try:
+            if self.path == "/health":
+                self._send_json(200, service.health())
+            elif self.path == "/metrics":
+                self._send_json(200, service.metrics())
+            elif self.path == "/diagnostics":
+                self._send_json(200, service.diagnostics_report())
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+        except Exception as e:
+            self._send_error(e)
+    
+    def do_POST(self):
+        routes = {
+            "/translate": self._translate,
+            "/translate/batch": self._translate_batch,
+            "/translate/fanout": self._translate_fanout,
+        }
+        route = routes.get(self.path)
+        try:
+            body = self._read_json()
+            if not route:
+                self._send_json(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+            route(body)
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except ServiceBusy as e:
+            self._send_json(503, {"error": f"Service busy: {e}"}, {"Retry-After": "1"})
+        except TimeoutError:
+            self._send_json(504, {"error": "Translation timed out"})
+        except Exception as e:
+            self._send_error(e)
+    
+    def _translate(self, body):
+        text = self._text(body.get("text"))
+        target = self._language(body.get("target"))
+        result = self.server.service.translate_many([(text, target)])[0]
+        self._send_json(502 if "error" in result else 200, result)
+    
+    def _translate_batch(self, body):
+        texts = body.get("texts")
+        if not isinstance(texts, list) or not texts:
+            raise BadRequest("'texts' must be a non-empty list")
+        if len(texts) > MAX_BATCH_SIZE:
+            raise BadRequest(f"At most {MAX_BATCH_SIZE} texts per batch")
+        target = self._language(body.get("target"))
+        jobs = [(self._text(text), target) for text in texts]
+        self._send_json(200, {"results": self.server.service.translate_many(jobs)})
+    
+    def _translate_fanout(self, body):
+        text = self._text(body.get("text"))
+        targets = body.get("targets")
+        if not isinstance(targets, list) or not targets:
+            raise BadRequest("'targets' must be a non-empty list")
+        jobs = [(text, target) for target in dict.fromkeys(self._language(value) for value in targets)]
+        self._send_json(200, {"results": self.server.service.translate_many(jobs)})
+    
+    def _text(self, value):
+        if not isinstance(value, str) or not value.strip():
+            raise BadRequest("'text' must be a non-empty string")
+        return value.strip()
+    
+    def _language(self, value):
+        name = self.server.service.resolve_language(value) if isinstance(value, str) else None
+        if not name:
+            raise BadRequest(f"Unknown target language {value!r}")
+        return name
+    
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True  # the rest of the body can't be skipped safely
+            raise BadRequest("Missing or too large request body")
+        raw = self.rfile.read(length)
+        try:
+            body = json.loads(raw.decode("utf-8")) if raw else {}
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise BadRequest(f"Body is not valid JSON: {e}")
+        if not isinstance(body, dict):
+            raise BadRequest("Body must be a JSON object")
+        return body
+    
+    def _send_error(self, error):
+        """500 with a JSON body for anything the handlers didn't expect, instead of a dropped connection"""
+        print(f"Service error on {self.command} {self.path}: {error!r}", file=sys.stderr)
+        self._send_json(500, {"error": f"Internal error: {error}"})
+    
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """HTTP server bound to host:port (port 0 picks a free one); call serve_forever() to run it"""
+    server = ThreadingHTTPServer((host, port), TranslationRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Language Buddy translations over local HTTP")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=4, help="translations run at the same time (default: 4)")
+    parser.add_argument("--queue", type=int, default=64,
+                        help="translations allowed to wait for a worker before requests get 503 (default: 64)")
+    parser.add_argument("--verbose", action="store_true", help="log every request to stderr")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="report the top memory allocations under /diagnostics (slower)")
+    args = parser.parse_args(argv)
+    
+    from language_buddy import translate_to_language, language_name, translation_cache, diagnostics_report, memory_tracker
+    if args.trace_memory:
+        memory_tracker.start()
+    service = TranslationService(translate_to_language, language_name, workers=max(1, args.workers),
+                                 queue_size=max(0, args.queue), cache_stats=translation_cache.stats,
+                                 diagnostics=diagnostics_report)
+    server = make_server(service, args.host, args.port, args.verbose)
+    print(f"Language Buddy translation service on http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
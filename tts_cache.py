@@ -0,0 +1,231 @@
+"""
+Synthesized speech cache for Language Buddy
+Text-to-speech output is rendered to audio files keyed by (text, voice, rate),
+so repeat playback skips synthesis. Least recently used files are evicted
+once the cache grows past its size limit
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import wave
+from collections import OrderedDict
+
+AUDIO_CACHE_DIR = "audio_cache"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024  # 50 MB of synthesized audio
+
+class AudioCache:
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> file size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+    
+    def _load_existing(self):
+        """Index files left over from previous sessions, oldest use first"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".wav"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith("tmp-"):
+                # Unfinished render from a session that was closed mid-synthesis
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+        self._evict()
+    
+    @staticmethod
+    def make_key(text, voice, rate):
+        """Stable file key for a piece of text spoken with the given settings"""
+        raw = f"{voice}\0{rate}\0{text}".encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+    
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav")
+    
+    def get(self, text, voice, rate):
+        """Return the cached audio file for these settings, or None"""
+        key = self.make_key(text, voice, rate)
+        path = self.path_for(key)
+        with self.lock:
+            if key in self.entries and os.path.exists(path):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    os.utime(path)  # keeps LRU order across restarts
+                except OSError:
+                    pass
+                return path
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            self.misses += 1
+        return None
+    
+    def contains(self, text, voice, rate):
+        """True if audio for these settings is cached (doesn't count as a lookup)"""
+        key = self.make_key(text, voice, rate)
+        with self.lock:
+            return key in self.entries and os.path.exists(self.path_for(key))
+    
+    def render(self, engine, text, voice, rate):
+        """Synthesize text to a cache file with a pyttsx3 engine and return its path"""
+        key = self.make_key(text, voice, rate)
+        path = self.path_for(key)
+        temp_path = os.path.join(self.cache_dir, f"tmp-{threading.get_ident()}-{key}.wav")
+        
+        original_rate = engine.getProperty('rate')
+        original_voice = engine.getProperty('voice')
+        try:
+            if voice:
+                engine.setProperty('voice', voice)
+            engine.setProperty('rate', rate)
+            engine.save_to_file(text, temp_path)
+            engine.runAndWait()
+        finally:
+            engine.setProperty('rate', original_rate)
+            if original_voice:
+                engine.setProperty('voice', original_voice)
+        
+        if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        
+        os.replace(temp_path, path)
+        self.add_file(key, path)
+        return path
+    
+    def add_file(self, key, path):
+        """Register a freshly written cache file and evict old ones if needed"""
+        size = os.path.getsize(path)
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            self.entries[key] = size
+            self.total_bytes += size
+            self._evict()
+    
+    def get_or_render(self, engine, text, voice, rate):
+        """Cached audio file for the text, synthesizing it only on a miss"""
+        path = self.get(text, voice, rate)
+        if path:
+            return path
+        return self.render(engine, text, voice, rate)
+    
+    def _evict(self):
+        """Drop least recently used files until the cache fits its size limit"""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+    
+    def stats(self):
+        """Summary numbers for diagnostics"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "files": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+class AudioPlayer:
+    """Plays cached audio files and lets another thread cut playback short"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.process = None
+        self.stopped = threading.Event()
+        self.command = self._find_player()
+    
+    @staticmethod
+    def _find_player():
+        """Command line of the first audio player found on this system"""
+        if sys.platform.startswith("win"):
+            return None  # winsound is used instead
+        if sys.platform == "darwin":
+            players = [["afplay"]]
+        else:
+            players = [["paplay"], ["aplay", "-q"], ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"]]
+        for player in players:
+            if shutil.which(player[0]):
+                return player
+        return None
+    
+    def available(self):
+        return sys.platform.startswith("win") or self.command is not None
+    
+    def reset(self):
+        """Let the next play() run. Called when an utterance is taken off the queue, so a stop() that
+        arrives any time after that - even before play() starts - still cancels it"""
+        self.stopped.clear()
+    
+    def play(self, path):
+        """Play a file, blocking until it ends or stop() is called. Returns False if it couldn't play"""
+        try:
+            if sys.platform.startswith("win"):
+                return self._play_windows(path)
+            if not self.command:
+                return False
+            with self.lock:
+                if self.stopped.is_set():
+                    return True
+                self.process = subprocess.Popen(self.command + [path],
+                                                stdout=subprocess.DEVNULL,
+                                                stderr=subprocess.DEVNULL)
+                process = self.process
+            returncode = process.wait()
+            with self.lock:
+                self.process = None
+            return returncode == 0 or self.stopped.is_set()
+        except Exception as e:
+            print(f"Audio playback error: {e}")
+            return False
+    
+    def _play_windows(self, path):
+        import winsound
+        if self.stopped.is_set():
+            return True
+        try:
+            with wave.open(path, "rb") as wav:
+                duration = wav.getnframes() / float(wav.getframerate())
+        except Exception:
+            # Unknown length - play synchronously (can't be interrupted)
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_NODEFAULT)
+            return True
+        
+        winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+        if self.stopped.wait(duration + 0.1):
+            winsound.PlaySound(None, winsound.SND_PURGE)
+        return True
+    
+    def stop(self):
+        """Stop the file that is currently playing, if any"""
+        self.stopped.set()
+        with self.lock:
+            if self.process and self.process.poll() is None:
+                self.process.terminate()
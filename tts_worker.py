@@ -0,0 +1,235 @@
+"""
+Dedicated text-to-speech worker for Language Buddy
+A single thread owns the pyttsx3 engine and works through a queue of
+utterances, each with its own voice and rate. New requests can replace
+whatever is playing, so rapid clicks never stack up or race on the engine.
+Low-priority prefetch jobs render audio into the cache while nothing else
+is waiting to be spoken
+"""
+
+import queue
+import sys
+import threading
+from collections import deque
+
+from tts_cache import AudioPlayer
+
+_WAKE = object()  # nudges the worker when prefetch jobs arrive
+
+class Utterance:
+    def __init__(self, text, rate=150, voice=None, volume=0.9, on_done=None, on_start=None):
+        self.text = text
+        self.rate = rate
+        self.voice = voice          # None means the worker's default voice
+        self.volume = volume
+        self.on_done = on_done      # called as on_done(utterance, completed)
+        self.on_start = on_start    # called as on_start(utterance) when audio starts playing
+    
+    def __repr__(self):
+        return f"Utterance({self.text!r}, rate={self.rate}, voice={self.voice!r})"
+
+class TTSWorker(threading.Thread):
+    def __init__(self, engine_factory, audio_cache=None, player=None):
+        super().__init__(name="tts-worker", daemon=True)
+        self.engine_factory = engine_factory  # called once, on the worker thread
+        self.audio_cache = audio_cache
+        self.player = player or AudioPlayer()
+        self.queue = queue.Queue()
+        self.lock = threading.RLock()
+        self.generation = 0         # bumped on every interrupt; older items are dropped
+        self.engine = None
+        self.default_voice = None
+        self.ready = threading.Event()
+        self.prefetch_jobs = deque()  # (utterance, cancel_event), rendered only when idle
+        self.spoken = 0
+        self.interrupted = 0
+        self.prefetched = 0
+    
+    def run(self):
+        if sys.platform.startswith("win"):
+            # SAPI is COM based and the engine lives on this thread
+            try:
+                import comtypes
+                comtypes.CoInitialize()
+            except Exception:
+                pass
+        
+        try:
+            self.engine = self.engine_factory()
+            if self.engine:
+                self.default_voice = self.engine.getProperty('voice')
+        except Exception as e:
+            print(f"TTS worker could not start the engine: {e}")
+            self.engine = None
+        self.ready.set()
+        
+        while True:
+            if self.prefetch_jobs:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    self._prefetch_next()
+                    continue
+            else:
+                item = self.queue.get()
+            if item is None:
+                break
+            if item is _WAKE:
+                continue
+            generation, utterance = item
+            with self.lock:
+                current = generation == self.generation
+                if current:
+                    # Re-arm the player here, not in play(): a stop() from now on must still cancel this one
+                    self.player.reset()
+            if not current:
+                self._finish(utterance, False)
+                continue
+            try:
+                completed = self._speak(utterance, generation)
+            except Exception as e:
+                print(f"Speech error: {e}")
+                completed = False
+            self._finish(utterance, completed)
+    
+    def speak(self, utterance, interrupt=True):
+        """Queue an utterance. With interrupt=True it replaces anything playing or waiting"""
+        with self.lock:
+            if interrupt:
+                self._interrupt_locked()
+            self.queue.put((self.generation, utterance))
+    
+    def prefetch(self, utterances, cancel_event=None):
+        """Render utterances into the audio cache in the background, behind any real speech"""
+        if not self.audio_cache:
+            return
+        with self.lock:
+            for utterance in utterances:
+                self.prefetch_jobs.append((utterance, cancel_event))
+            self.queue.put(_WAKE)
+    
+    def cancel_prefetch(self, cancel_event):
+        """Drop queued prefetch jobs that belong to a cancelled screen"""
+        cancel_event.set()
+        with self.lock:
+            self.prefetch_jobs = deque(job for job in self.prefetch_jobs if job[1] is not cancel_event)
+    
+    def stop(self):
+        """Stop the current utterance and drop everything that is waiting"""
+        with self.lock:
+            self._interrupt_locked()
+    
+    def shutdown(self):
+        """Stop speaking and let the worker thread exit"""
+        self.stop()
+        self.queue.put(None)
+    
+    def pending(self):
+        """Number of utterances waiting to be spoken"""
+        return self.queue.qsize()
+    
+    def pending_prefetch(self):
+        """Number of prefetch jobs waiting for the worker to be idle"""
+        return len(self.prefetch_jobs)
+    
+    def _interrupt_locked(self):
+        self.generation += 1
+        try:
+            while True:
+                item = self.queue.get_nowait()
+                if item is None:
+                    self.queue.put(None)
+                    break
+                if item is not _WAKE:
+                    self._finish(item[1], False)
+        except queue.Empty:
+            pass
+        if self.prefetch_jobs:
+            self.queue.put(_WAKE)
+        self.player.stop()
+    
+    def _finish(self, utterance, completed):
+        if not completed:
+            self.interrupted += 1
+        if utterance.on_done:
+            try:
+                utterance.on_done(utterance, completed)
+            except Exception as e:
+                print(f"Speech callback error: {e}")
+    
+    def _notify_start(self, utterance):
+        if utterance.on_start:
+            try:
+                utterance.on_start(utterance)
+            except Exception as e:
+                print(f"Speech callback error: {e}")
+    
+    def _prefetch_next(self):
+        """Render one prefetch job into the audio cache"""
+        with self.lock:
+            if not self.prefetch_jobs:
+                return
+            utterance, cancel_event = self.prefetch_jobs.popleft()
+        if not self.engine or (cancel_event is not None and cancel_event.is_set()):
+            return
+        
+        voice = utterance.voice or self.default_voice
+        if self.audio_cache.contains(utterance.text, voice, utterance.rate):
+            return
+        try:
+            if self.audio_cache.render(self.engine, utterance.text, voice, utterance.rate):
+                self.prefetched += 1
+        except Exception as e:
+            print(f"Audio prefetch error: {e}")
+    
+    def _is_current(self, generation):
+        return generation == self.generation
+    
+    def _speak(self, utterance, generation):
+        """Play one utterance on the worker thread. Returns True if it finished"""
+        if not self.engine:
+            return False
+        voice = utterance.voice or self.default_voice
+        started = False
+        
+        # Cached file first: playback can be cut short by the player
+        if self.audio_cache and self.player.available():
+            audio_path = None
+            try:
+                audio_path = self.audio_cache.get_or_render(self.engine, utterance.text, voice, utterance.rate)
+            except Exception as e:
+                print(f"Audio cache error: {e}")
+            if not self._is_current(generation):
+                return False
+            if audio_path:
+                self._notify_start(utterance)
+                started = True
+            if audio_path and self.player.play(audio_path):
+                if self._is_current(generation):
+                    self.spoken += 1
+                    return True
+                return False
+        
+        # Direct synthesis - stop from inside the engine loop if we get interrupted
+        self.engine.setProperty('rate', utterance.rate)
+        self.engine.setProperty('volume', utterance.volume)
+        if voice:
+            self.engine.setProperty('voice', voice)
+        
+        def check_interrupt(name, location, length):
+            if not self._is_current(generation):
+                self.engine.stop()
+        
+        token = self.engine.connect('started-word', check_interrupt)
+        if not started:
+            self._notify_start(utterance)
+        try:
+            self.engine.say(utterance.text)
+            self.engine.runAndWait()
+        finally:
+            self.engine.disconnect(token)
+        
+        if self._is_current(generation):
+            self.spoken += 1
+            return True
+        return False
@@ -0,0 +1,155 @@
+"""
+Virtualized list widget for Language Buddy
+Only the rows that fit on screen exist as widgets. Their contents are swapped
+as the user scrolls, and rows are fetched page by page from the data source
+"""
+
+import tkinter as tk
+from collections import OrderedDict
+
+class VirtualList(tk.Frame):
+    def __init__(self, parent, count_rows, fetch_rows, format_row, on_activate=None,
+                 row_height=52, page_size=100, max_cached_pages=8, **kwargs):
+        kwargs.setdefault("bg", "#ffffff")
+        super().__init__(parent, **kwargs)
+        self.count_rows = count_rows      # callable() -> total number of rows
+        self.fetch_rows = fetch_rows      # callable(offset, limit, previous_row) -> list of rows
+        self.format_row = format_row      # callable(row) -> (title, detail)
+        self.on_activate = on_activate    # callable(row) on double click
+        self.row_height = row_height
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        
+        self.total = 0
+        self.top_index = 0
+        self.pages = OrderedDict()
+        self.row_widgets = []
+        
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.body = tk.Frame(self, bg=kwargs["bg"])
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+    
+    def _bind_wheel(self, widget):
+        """Route mouse wheel events from a widget to the list"""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+    
+    def visible_count(self):
+        """Number of rows that fit in the current height"""
+        return max(1, self.body.winfo_height() // self.row_height)
+    
+    def refresh(self, total=None, first_page=None, keep_position=True):
+        """Re-read the row count and drop cached pages (e.g. after a new search).
+        total and first_page can be passed in when they were read off the Tk thread.
+        The scroll position is kept, clamped to the new row count, unless keep_position is False"""
+        self.total = self.count_rows() if total is None else total
+        self.pages.clear()
+        if first_page is not None:
+            self.pages[0] = first_page
+        if keep_position:
+            self.top_index = max(0, min(self.top_index, self.total - self.visible_count()))
+        else:
+            self.top_index = 0
+        self._render()
+    
+    def _on_resize(self, event):
+        """Grow or shrink the widget pool to match the visible height"""
+        needed = max(1, event.height // self.row_height + 1)
+        while len(self.row_widgets) < needed:
+            self.row_widgets.append(self._create_row())
+        while len(self.row_widgets) > needed:
+            self.row_widgets.pop()[0].destroy()
+        self._render()
+    
+    def _create_row(self):
+        """Create one reusable row widget"""
+        frame = tk.Frame(self.body, bg="#ffffff", height=self.row_height, relief="ridge", bd=1)
+        frame.pack_propagate(False)
+        frame.pack(fill="x")
+        
+        title = tk.Label(frame, font=("Arial", 10, "bold"), bg="#ffffff", fg="#2c3e50", anchor="w")
+        title.pack(fill="x", padx=10)
+        detail = tk.Label(frame, font=("Arial", 10), bg="#ffffff", fg="#e74c3c", anchor="w")
+        detail.pack(fill="x", padx=10)
+        
+        row_slot = len(self.row_widgets)
+        for widget in (frame, title, detail):
+            self._bind_wheel(widget)
+            widget.bind("<Double-Button-1>", lambda event, slot=row_slot: self._activate(slot))
+        return frame, title, detail
+    
+    def _get_row(self, index):
+        """Return the row at an absolute index, fetching its page if needed"""
+        page_number = index // self.page_size
+        page = self.pages.get(page_number)
+        if page is None:
+            # The last row of the page before lets the source continue from it (keyset paging)
+            # instead of counting past every earlier row
+            previous = self.pages.get(page_number - 1)
+            previous_row = previous[-1] if previous and len(previous) == self.page_size else None
+            page = self.fetch_rows(page_number * self.page_size, self.page_size, previous_row)
+            self.pages[page_number] = page
+            while len(self.pages) > self.max_cached_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_number)
+        offset = index % self.page_size
+        return page[offset] if offset < len(page) else None
+    
+    def _render(self):
+        """Fill the widget pool with the rows starting at top_index"""
+        for slot, (frame, title, detail) in enumerate(self.row_widgets):
+            row = None
+            index = self.top_index + slot
+            if index < self.total:
+                row = self._get_row(index)
+            if row is None:
+                title.config(text="")
+                detail.config(text="")
+                frame.config(bg="#f0f8ff")
+            else:
+                row_title, row_detail = self.format_row(row)
+                title.config(text=row_title)
+                detail.config(text=row_detail)
+                frame.config(bg="#ffffff")
+        
+        if self.total:
+            first = self.top_index / self.total
+            last = min(1.0, (self.top_index + self.visible_count()) / self.total)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
+    
+    def yview(self, *args):
+        """Scrollbar protocol: handles 'moveto' and 'scroll' commands"""
+        visible = self.visible_count()
+        if not args:
+            return
+        if args[0] == "moveto":
+            new_top = int(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            new_top = self.top_index + (step * visible if args[2] == "pages" else step)
+        else:
+            return
+        new_top = max(0, min(new_top, max(0, self.total - visible)))
+        if new_top != self.top_index:
+            self.top_index = new_top
+            self._render()
+    
+    def _on_mousewheel(self, event):
+        """Scroll three rows per wheel notch"""
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+    
+    def _activate(self, slot):
+        """Call on_activate with the row under a double-clicked slot"""
+        index = self.top_index + slot
+        if self.on_activate and index < self.total:
+            row = self._get_row(index)
+            if row is not None:
+                self.on_activate(row)
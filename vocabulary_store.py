@@ -0,0 +1,123 @@
+"""
+Vocabulary store for Language Buddy learning mode
+Each language has its own JSON file in vocabulary/ (vocabulary/es.json, ...)
+holding words with their English meaning, pronunciation, frequency rank,
+part of speech, topic and lesson. A language is only read from disk the first
+time it is used, and is then indexed for ranked, per-lesson and random access
+"""
+
+import datetime
+import json
+import os
+import random
+import threading
+
+VOCABULARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vocabulary")
+
+class VocabWord:
+    __slots__ = ("id", "english", "word", "pronunciation", "rank", "pos", "topic", "lesson")
+    
+    def __init__(self, id, english, word, pronunciation="", rank=0, pos="", topic="", lesson=1):
+        self.id = id
+        self.english = english
+        self.word = word
+        self.pronunciation = pronunciation
+        self.rank = rank            # 1 is the most frequent word
+        self.pos = pos              # part of speech
+        self.topic = topic
+        self.lesson = lesson
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data["english"], data["word"], data.get("pronunciation", ""),
+                   data.get("rank", 0), data.get("pos", ""), data.get("topic", ""), data.get("lesson", 1))
+    
+    def as_tuple(self):
+        """(english, word, pronunciation) as used by the learning screen"""
+        return self.english, self.word, self.pronunciation
+    
+    def __repr__(self):
+        return f"VocabWord({self.id!r}, {self.word!r})"
+
+class LanguageVocabulary:
+    def __init__(self, code, words, name=None):
+        self.code = code
+        self.name = name or code
+        self.words = sorted(words, key=lambda word: (word.rank or float("inf"), word.id))  # rank order
+        self.by_id = {}
+        self.by_lesson = {}
+        self.by_topic = {}
+        self.by_pos = {}
+        for word in self.words:
+            self.by_id[word.id] = word
+            self.by_lesson.setdefault(word.lesson, []).append(word)
+            self.by_topic.setdefault(word.topic, []).append(word)
+            self.by_pos.setdefault(word.pos, []).append(word)
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def get(self, word_id):
+        return self.by_id.get(word_id)
+    
+    def ranked(self, offset=0, limit=None):
+        """Words from most to least frequent"""
+        end = None if limit is None else offset + limit
+        return self.words[offset:end]
+    
+    def lessons(self):
+        """Sorted lesson numbers"""
+        return sorted(self.by_lesson)
+    
+    def lesson(self, number):
+        return list(self.by_lesson.get(number, []))
+    
+    def random(self, count, rng=random):
+        """count distinct random words"""
+        return rng.sample(self.words, min(count, len(self.words)))
+    
+    def daily_words(self, count=4, day=None):
+        """Today's practice words: a fixed slice of the ranked list that moves on every day"""
+        if not self.words:
+            return []
+        day = day or datetime.date.today()
+        start = (day.toordinal() * count) % len(self.words)
+        picked = self.words[start:start + count]
+        if len(picked) < count:
+            picked += self.words[:count - len(picked)]
+        return picked
+
+class VocabularyStore:
+    def __init__(self, directory=VOCABULARY_DIR):
+        self.directory = directory
+        self.loaded = {}    # language code -> LanguageVocabulary
+        self.lock = threading.Lock()
+    
+    def path_for(self, code):
+        return os.path.join(self.directory, f"{code}.json")
+    
+    def available_languages(self):
+        """Language codes that have a vocabulary file, without loading any of them"""
+        try:
+            return sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
+        except OSError:
+            return []
+    
+    def get(self, code):
+        """Vocabulary for a language, loaded on first use. Empty when there is no file"""
+        with self.lock:
+            vocabulary = self.loaded.get(code)
+            if vocabulary is None:
+                vocabulary = self._load(code)
+                self.loaded[code] = vocabulary
+            return vocabulary
+    
+    def _load(self, code):
+        try:
+            with open(self.path_for(code), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            words = [VocabWord.from_dict(entry) for entry in data.get("words", [])]
+            return LanguageVocabulary(code, words, data.get("name"))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"No vocabulary for '{code}': {e}")
+            return LanguageVocabulary(code, [])
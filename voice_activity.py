@@ -0,0 +1,167 @@
+"""
+Local voice-activity detection for Language Buddy
+Trims leading and trailing silence from captured audio and splits long
+recordings at pauses, so the recognizer only receives the parts where someone
+is talking. Uses webrtcvad when it is installed and a simple energy detector
+otherwise
+"""
+
+import math
+import sys
+import threading
+from array import array
+
+try:
+    import audioop
+except ImportError:
+    audioop = None
+
+try:
+    import webrtcvad
+    webrtcvad_available = True
+except ImportError:
+    webrtcvad_available = False
+
+FRAME_MS = 30
+WEBRTC_RATES = (8000, 16000, 32000, 48000)
+
+class VADStats:
+    def __init__(self, input_bytes=0, output_bytes=0, input_seconds=0.0, output_seconds=0.0, utterances=0):
+        self.input_bytes = input_bytes
+        self.output_bytes = output_bytes
+        self.input_seconds = input_seconds
+        self.output_seconds = output_seconds
+        self.utterances = utterances
+    
+    @property
+    def bytes_saved(self):
+        return self.input_bytes - self.output_bytes
+    
+    @property
+    def seconds_saved(self):
+        return self.input_seconds - self.output_seconds
+    
+    def add(self, other):
+        """Accumulate another recording's numbers (used for session totals)"""
+        self.input_bytes += other.input_bytes
+        self.output_bytes += other.output_bytes
+        self.input_seconds += other.input_seconds
+        self.output_seconds += other.output_seconds
+        self.utterances += other.utterances
+    
+    def as_dict(self):
+        return {
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "bytes_saved": self.bytes_saved,
+            "input_seconds": round(self.input_seconds, 3),
+            "output_seconds": round(self.output_seconds, 3),
+            "seconds_saved": round(self.seconds_saved, 3),
+            "utterances": self.utterances,
+        }
+    
+    def summary(self):
+        return (f"{self.utterances} utterance(s), trimmed {self.seconds_saved:.1f}s "
+                f"and {self.bytes_saved / 1024:.0f} KB of silence")
+
+class SessionVADStats(VADStats):
+    """Running totals shared by the recording threads"""
+    
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+    
+    def add(self, other):
+        with self.lock:
+            super().add(other)
+
+def _frame_rms(frame, sample_width):
+    if audioop:
+        return audioop.rms(frame, sample_width)
+    samples = array("h", frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    if not samples:
+        return 0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+def speech_frames(raw, sample_rate, energy_threshold=None, aggressiveness=2):
+    """Classify each FRAME_MS frame of 16-bit mono PCM as speech (True) or silence (False)"""
+    frame_bytes = int(sample_rate * FRAME_MS / 1000) * 2
+    frames = [raw[i:i + frame_bytes] for i in range(0, len(raw) - frame_bytes + 1, frame_bytes)]
+    if not frames:
+        return [], frame_bytes
+    
+    if webrtcvad_available and sample_rate in WEBRTC_RATES:
+        vad = webrtcvad.Vad(aggressiveness)
+        return [vad.is_speech(frame, sample_rate) for frame in frames], frame_bytes
+    
+    energies = [_frame_rms(frame, 2) for frame in frames]
+    if energy_threshold is None:
+        # No calibration available: treat the quietest frames as the noise floor,
+        # but never set the bar above half the peak (a clip may have no silence at all)
+        quiet = sorted(energies)[:max(1, len(energies) // 10)]
+        energy_threshold = max(300, min(3 * sum(quiet) / len(quiet), max(energies) / 2))
+    return [energy > energy_threshold for energy in energies], frame_bytes
+
+def find_speech_regions(flags, frame_ms=FRAME_MS, min_pause=0.6, min_speech=0.15, padding=0.2):
+    """Group speech frames into (first_frame, last_frame_exclusive) regions.
+    Pauses shorter than min_pause are kept inside a region; longer ones split it
+    (min_pause=None never splits)"""
+    pause_frames = None if min_pause is None else max(1, int(min_pause * 1000 / frame_ms))
+    min_frames = max(1, int(min_speech * 1000 / frame_ms))
+    pad_frames = int(padding * 1000 / frame_ms)
+    
+    regions = []
+    start = None
+    silent_run = 0
+    for index, is_speech in enumerate(flags):
+        if is_speech:
+            if start is None:
+                start = index
+            silent_run = 0
+        elif start is not None:
+            silent_run += 1
+            if pause_frames is not None and silent_run >= pause_frames:
+                regions.append((start, index - silent_run + 1))
+                start = None
+                silent_run = 0
+    if start is not None:
+        regions.append((start, len(flags) - silent_run))
+    
+    padded = []
+    for first, last in regions:
+        if last - first < min_frames:
+            continue
+        padded.append((max(0, first - pad_frames), min(len(flags), last + pad_frames)))
+    return padded
+
+def split_utterances(audio, energy_threshold=None, min_pause=0.6, padding=0.2):
+    """Split an sr.AudioData recording into speech-only utterances.
+    Returns (list of AudioData, VADStats); an empty list means no speech was found"""
+    sample_rate = audio.sample_rate
+    raw = audio.get_raw_data(convert_width=2)
+    flags, frame_bytes = speech_frames(raw, sample_rate, energy_threshold)
+    regions = find_speech_regions(flags, min_pause=min_pause, padding=padding)
+    
+    bytes_per_second = sample_rate * audio.sample_width
+    stats = VADStats(input_bytes=len(audio.frame_data),
+                     input_seconds=len(audio.frame_data) / float(bytes_per_second))
+    
+    utterances = []
+    for first, last in regions:
+        chunk = raw[first * frame_bytes:last * frame_bytes]
+        utterances.append(_make_audio(audio, chunk, sample_rate))
+        stats.output_bytes += len(chunk) * audio.sample_width // 2
+    stats.output_seconds = stats.output_bytes / float(bytes_per_second)
+    stats.utterances = len(utterances)
+    return utterances, stats
+
+def trim_silence(audio, energy_threshold=None, padding=0.2):
+    """Drop leading and trailing silence but keep every pause in between"""
+    utterances, stats = split_utterances(audio, energy_threshold, min_pause=None, padding=padding)
+    return (utterances[0] if utterances else None), stats
+
+def _make_audio(original, raw_16bit, sample_rate):
+    """New clip of the same type as the original (normally sr.AudioData)"""
+    return type(original)(raw_16bit, sample_rate, 2)
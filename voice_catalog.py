@@ -0,0 +1,218 @@
+"""
+Voice catalog for Language Buddy
+Installed text-to-speech voices are scanned once and cached on disk together
+with an index from language code to the best voice for it. The cache is
+rebuilt only when the set of installed voices changes
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+VOICE_CATALOG_FILE = "voice_catalog.json"
+CATALOG_VERSION = 1
+
+# Words in voice ids and names that identify a language
+LANGUAGE_KEYWORDS = {
+    "en": ["english", "zira", "david", "mark", "hazel", "susan", "george", "samantha", "alex", "karen"],
+    "es": ["spanish", "espanol", "helena", "sabina", "pablo", "laura", "raul", "monica", "jorge", "paulina"],
+    "fr": ["french", "francais", "hortense", "julie", "paul", "amelie", "thomas"],
+    "de": ["german", "deutsch", "hedda", "katja", "stefan", "anna", "markus"],
+    "it": ["italian", "italiano", "elsa", "cosimo", "alice", "luca"],
+    "pt": ["portuguese", "portugues", "maria", "helia", "luciana", "joana"],
+    "zh": ["chinese", "mandarin", "huihui", "kangkang", "yaoyao", "tingting", "meijia"],
+    "ja": ["japanese", "haruka", "ayumi", "ichiro", "sayaka", "kyoko", "otoya"],
+    "ko": ["korean", "heami", "yuna"],
+    "ar": ["arabic", "hoda", "naayf", "maged"],
+    "ru": ["russian", "irina", "pavel", "milena", "yuri"],
+    "hi": ["hindi", "kalpana", "hemant", "lekha"],
+    "ur": ["urdu"],
+}
+
+# Windows SAPI reports languages as hexadecimal LCIDs
+SAPI_LCIDS = {
+    "409": "en", "809": "en", "c09": "en", "1009": "en", "4009": "en",
+    "40a": "es", "c0a": "es", "80a": "es",
+    "40c": "fr", "c0c": "fr",
+    "407": "de", "c07": "de",
+    "410": "it",
+    "416": "pt", "816": "pt",
+    "804": "zh", "404": "zh", "c04": "zh",
+    "411": "ja",
+    "412": "ko",
+    "401": "ar", "c01": "ar",
+    "419": "ru",
+    "439": "hi",
+    "420": "ur",
+}
+
+QUALITY_INDICATORS = ['enhanced', 'premium', 'neural', 'natural']
+FEMALE_INDICATORS = ['female', 'woman', 'zira', 'eva', 'helena']
+MALE_INDICATORS = ['male', 'man', 'david', 'mark', 'ricardo']
+
+def _tokens(text):
+    return [token for token in re.split(r'[^a-z0-9]+', text.lower()) if token]
+
+def _declared_languages(voice_languages):
+    """Language codes from pyttsx3's voice.languages, whatever the driver format"""
+    codes = set()
+    for language in voice_languages or []:
+        if isinstance(language, bytes):
+            # espeak prefixes the tag with a priority byte
+            language = language[1:].decode("utf-8", "ignore") if language[:1] < b" " else language.decode("utf-8", "ignore")
+        language = str(language).strip().lower()
+        if language in SAPI_LCIDS:
+            codes.add(SAPI_LCIDS[language])
+            continue
+        for lcid in language.split(";"):
+            if lcid in SAPI_LCIDS:
+                codes.add(SAPI_LCIDS[lcid])
+        prefix = re.split(r'[-_]', language)[0]
+        if prefix in LANGUAGE_KEYWORDS:
+            codes.add(prefix)
+    return codes
+
+def detect_voice_languages(voice_id, voice_name, voice_languages=None):
+    """Best guess at which language codes a voice can speak"""
+    codes = _declared_languages(voice_languages)
+    tokens = set(_tokens(f"{voice_id} {voice_name}"))
+    for code, keywords in LANGUAGE_KEYWORDS.items():
+        if code in tokens or any(keyword in tokens for keyword in keywords):
+            codes.add(code)
+    return sorted(codes)
+
+def installed_voices_fingerprint():
+    """Cheap signature of the installed voices that avoids starting the engine"""
+    entries = []
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+            for key_path in (r"SOFTWARE\Microsoft\Speech\Voices\Tokens",
+                             r"SOFTWARE\Microsoft\Speech_OneCore\Voices\Tokens"):
+                try:
+                    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                        index = 0
+                        while True:
+                            try:
+                                entries.append(winreg.EnumKey(key, index))
+                            except OSError:
+                                break
+                            index += 1
+                except OSError:
+                    continue
+        except ImportError:
+            pass
+    else:
+        voice_dirs = [
+            "/System/Library/Speech/Voices",
+            "/Library/Speech/Voices",
+            os.path.expanduser("~/Library/Speech/Voices"),
+            "/usr/share/espeak-ng-data/voices",
+            "/usr/lib/x86_64-linux-gnu/espeak-ng-data/voices",
+            "/usr/share/espeak-data/voices",
+            "/usr/share/mbrola",
+        ]
+        for voice_dir in voice_dirs:
+            if os.path.isdir(voice_dir):
+                try:
+                    entries.append(f"{voice_dir}:{sorted(os.listdir(voice_dir))}")
+                except OSError:
+                    continue
+    if not entries:
+        return None
+    return hashlib.sha1("\n".join(sorted(entries)).encode("utf-8")).hexdigest()
+
+class VoiceCatalog:
+    def __init__(self, voices, fingerprint=None):
+        self.voices = voices            # list of {"id", "name", "languages", "gender"}
+        self.fingerprint = fingerprint
+        self.by_language = {}
+        self.default_voice = None
+        self._build_index()
+    
+    @classmethod
+    def from_engine(cls, engine, fingerprint=None):
+        """Scan the voices installed for a pyttsx3 engine"""
+        voices = []
+        for voice in engine.getProperty('voices') or []:
+            voice_id = str(voice.id)
+            voice_name = str(getattr(voice, 'name', '') or voice_id)
+            info = voice_id.lower() + " " + voice_name.lower()
+            gender = str(getattr(voice, 'gender', '') or '').lower()
+            if not gender or gender == "none":
+                if any(indicator in info for indicator in FEMALE_INDICATORS):
+                    gender = "female"
+                elif any(indicator in info for indicator in MALE_INDICATORS):
+                    gender = "male"
+            voices.append({
+                "id": voice_id,
+                "name": voice_name,
+                "languages": detect_voice_languages(voice_id, voice_name, getattr(voice, 'languages', None)),
+                "gender": gender,
+            })
+        return cls(voices, fingerprint)
+    
+    @classmethod
+    def load_or_scan(cls, engine, path=VOICE_CATALOG_FILE):
+        """Use the cached catalog if the installed voices haven't changed, otherwise rescan"""
+        fingerprint = installed_voices_fingerprint()
+        if fingerprint:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == CATALOG_VERSION and data.get("fingerprint") == fingerprint:
+                    return cls(data["voices"], fingerprint)
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        catalog = cls.from_engine(engine, fingerprint)
+        print(f"Scanned {len(catalog.voices)} voices")
+        if fingerprint:
+            catalog.save(path)
+        return catalog
+    
+    def save(self, path=VOICE_CATALOG_FILE):
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOG_VERSION, "fingerprint": self.fingerprint,
+                           "voices": self.voices}, f, ensure_ascii=False, indent=1)
+        except OSError as e:
+            print(f"Could not save voice catalog: {e}")
+    
+    @staticmethod
+    def _score(voice):
+        """Higher is better: quality voices first, then female voices (clearer for learners)"""
+        info = f"{voice['id']} {voice['name']}".lower()
+        score = 0
+        if any(indicator in info for indicator in QUALITY_INDICATORS):
+            score += 4
+        if voice.get("gender") == "female":
+            score += 2
+        elif voice.get("gender") == "male":
+            score += 1
+        return score
+    
+    def _build_index(self):
+        """Map each language code to its best voice"""
+        best = {}
+        for voice in self.voices:
+            score = self._score(voice)
+            for code in voice["languages"]:
+                if code not in best or score > best[code][0]:
+                    best[code] = (score, voice["id"])
+        self.by_language = {code: voice_id for code, (score, voice_id) in best.items()}
+        
+        if self.voices:
+            self.default_voice = self.by_language.get("en") or max(self.voices, key=self._score)["id"]
+    
+    def voice_for(self, language_code):
+        """Best voice id for a language code, or None if no installed voice speaks it"""
+        return self.by_language.get(language_code)
+    
+    def name_of(self, voice_id):
+        for voice in self.voices:
+            if voice["id"] == voice_id:
+                return voice["name"]
+        return voice_id